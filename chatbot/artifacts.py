@@ -0,0 +1,192 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference import IntentClassifier
+from inference.intent import MODEL_FILES
+
+from batcher import MicroBatcher
+from bow_encoder import BagOfWordsEncoder
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "model")
+ENGINE = os.environ.get("CHATBOT_ENGINE", "keras").lower()
+
+# 0 = watcher mati; reload hanya lewat POST /admin/reload
+RELOAD_POLL_INTERVAL = float(os.environ.get("CHATBOT_RELOAD_POLL", "0"))
+# Bundle lama tetap hidup sebentar agar request yang sedang jalan selesai
+RETIRE_GRACE = float(os.environ.get("CHATBOT_RETIRE_GRACE", "10"))
+
+
+def artifact_paths(engine, model_dir=MODEL_DIR):
+    return [
+        os.path.join(model_dir, MODEL_FILES[engine]),
+        os.path.join(model_dir, "words.pkl"),
+        os.path.join(model_dir, "classes.pkl"),
+    ]
+
+
+def bundle_version(paths):
+    # Versi = hash isi ketiga artefak, jadi sama persis -> versi sama
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class ModelBundle:
+    """
+    Satu set artefak (model + vocab + kelas) yang selalu dipakai bersama.
+
+    Setiap bundle punya MicroBatcher sendiri, sehingga request yang sudah
+    memegang bundle lama tetap diproses model lama walau bundle baru sudah
+    dipasang.
+    """
+
+    def __init__(self, version, engine, classifier, batcher_config=None):
+        self.version = version
+        self.engine = engine
+        self.classifier = classifier
+        self.encoder = classifier.encoder
+        self.classes = classifier.classes
+        self.loaded_at = time.time()
+        self.batcher = MicroBatcher(classifier.predict_encoded, **(batcher_config or {}))
+
+    def rank(self, probs):
+        return self.classifier.rank(probs)
+
+    def retire(self, grace=RETIRE_GRACE):
+        timer = threading.Timer(grace, self.batcher.close)
+        timer.daemon = True
+        timer.start()
+
+    def info(self):
+        return {
+            "version": self.version,
+            "engine": self.engine,
+            "loaded_at": self.loaded_at,
+            "words": len(self.encoder),
+            "classes": len(self.classes),
+        }
+
+
+def load_classifier(engine=ENGINE, model_dir=MODEL_DIR):
+    model_path, words_path, classes_path = artifact_paths(engine, model_dir)
+    encoder = BagOfWordsEncoder.from_pickle(words_path)
+    with open(classes_path, "rb") as f:
+        classes = pickle.load(f)
+    return IntentClassifier.load(model_path, encoder, classes, backend=engine)
+
+
+def load_bundle(engine, model_dir=MODEL_DIR, batcher_config=None):
+    version = bundle_version(artifact_paths(engine, model_dir))
+    classifier = load_classifier(engine, model_dir)
+    classifier.validate()
+    return ModelBundle(version, engine, classifier, batcher_config)
+
+
+class ArtifactManager:
+    """
+    Memegang bundle aktif dan menukarnya (hot reload) tanpa restart server.
+
+    Bundle baru dimuat dan divalidasi di luar jalur request; kalau lolos,
+    referensi `current` diganti sekaligus (atomic), bundle lama dipensiunkan
+    setelah masa tenggang. Kalau gagal, bundle lama tetap dipakai.
+    """
+
+    def __init__(self, engine, model_dir=MODEL_DIR, batcher_config=None, on_swap=None,
+                 poll_interval=RELOAD_POLL_INTERVAL, retire_grace=RETIRE_GRACE):
+        self.engine = engine
+        self.model_dir = model_dir
+        self.batcher_config = batcher_config
+        self.on_swap = on_swap
+        self.poll_interval = poll_interval
+        self.retire_grace = retire_grace
+        self.current = None
+        self.reload_count = 0
+        self.last_reload_ms = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def reload(self, force=False):
+        """Muat ulang artefak. Mengembalikan True kalau bundle diganti."""
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                paths = artifact_paths(self.engine, self.model_dir)
+                if not force and self.current is not None and bundle_version(paths) == self.current.version:
+                    return False
+                bundle = load_bundle(self.engine, self.model_dir, self.batcher_config)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Gagal reload artefak model: {self.last_error}")
+                raise
+
+            old, self.current = self.current, bundle
+            if self.on_swap is not None:
+                self.on_swap()
+            if old is not None:
+                old.retire(self.retire_grace)
+
+            self.last_reload_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.last_error = None
+            self.reload_count += 1
+            print(f"Artefak model versi {bundle.version} aktif ({self.last_reload_ms} ms)")
+            return True
+
+    # ---------------------
+    # File watcher (polling mtime)
+    # ---------------------
+    def _mtimes(self):
+        return tuple(os.path.getmtime(p) for p in artifact_paths(self.engine, self.model_dir))
+
+    def _watch(self):
+        # Thread ini tidak boleh mati: error dicatat lalu dicoba lagi interval berikutnya
+        seen = pending = error = None
+        while True:
+            try:
+                mtimes = self._mtimes()
+            except OSError as e:
+                # File hilang / sedang ditulis ulang oleh train.py
+                if str(e) != error:
+                    error = str(e)
+                    print(f"Watcher artefak: {error}")
+                mtimes = None
+            if mtimes is not None:
+                if seen is None:
+                    # Baseline; kalau sebelumnya sempat gagal baca, file mungkin
+                    # sudah berubah sejak load -> cek versi (reload no-op kalau sama)
+                    seen, pending = mtimes, mtimes if error else None
+                elif mtimes != seen:
+                    # Tunggu sampai stabil satu interval (train.py menulis file satu per satu)
+                    seen, pending = mtimes, mtimes
+                elif pending is not None:
+                    pending = None
+                    try:
+                        self.reload()
+                    except Exception:
+                        pass  # error sudah dicatat di last_error
+                error = None
+            time.sleep(self.poll_interval)
+
+    def start_watcher(self):
+        if self._watcher is None and self.poll_interval > 0:
+            self._watcher = threading.Thread(target=self._watch, name="artifact-watcher", daemon=True)
+            self._watcher.start()
+
+    def stats(self):
+        return {
+            "current": self.current.info() if self.current else None,
+            "reload_count": self.reload_count,
+            "last_reload_ms": self.last_reload_ms,
+            "last_error": self.last_error,
+            "watcher": self.poll_interval if self._watcher else None,
+        }
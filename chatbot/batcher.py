@@ -0,0 +1,119 @@
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class BatcherClosed(RuntimeError):
+    """submit() setelah close(): bundle sudah dipensiunkan, pakai bundle terbaru."""
+
+
+# Batcher yang masih hidup. Thread tidak ikut ter-fork: worker hasil fork
+# (inference.prefork) memulai ulang thread semua batcher di sini lewat SATU
+# hook register_at_fork (hook tidak bisa dilepas, jadi jangan per instance)
+_live = weakref.WeakSet()
+
+
+def _restart_after_fork():
+    for batcher in list(_live):
+        if not batcher._closed:
+            batcher._start()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+class MicroBatcher:
+    """
+    Penggabung request inferensi (micro-batching).
+
+    Request /chat yang datang bersamaan ditampung paling lama `max_wait_ms`
+    atau sampai `max_batch_size` item, lalu dijalankan dalam SATU forward
+    pass. Hasil tiap baris dikembalikan ke request yang menunggunya.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=3):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._batches = 0
+        self._items = 0
+        self._closed = False
+        self._start()
+        _live.add(self)
+
+    def _start(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, x):
+        future = Future()
+        # Cek + put di bawah lock yang sama dengan close(): item tidak pernah
+        # masuk antrean setelah sinyal berhenti (Future-nya tidak akan selesai)
+        with self._lock:
+            if self._closed:
+                raise BatcherClosed("MicroBatcher sudah ditutup")
+            self._queue.put((x, future))
+        return future
+
+    def predict(self, x, timeout=None):
+        return self.submit(x).result(timeout)
+
+    def stats(self):
+        with self._lock:
+            avg = self._items / self._batches if self._batches else 0.0
+            return {"batches": self._batches, "items": self._items, "avg_batch_size": round(avg, 2)}
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        _live.discard(self)
+        self._thread.join()
+
+    def _collect(self, first):
+        # Kumpulkan item sampai batas ukuran atau batas waktu tercapai
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Sinyal berhenti: proses batch ini dulu, lalu keluar
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            futures = [f for _, f in batch]
+            try:
+                outputs = self.predict_fn(np.stack([x for x, _ in batch]))
+            except Exception as e:
+                for f in futures:
+                    f.set_exception(e)
+                continue
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+            for f, out in zip(futures, outputs):
+                f.set_result(out)
@@ -0,0 +1,117 @@
+"""
+Benchmark IngredientIndex vs query EXISTS lama (cari_resep_dari_bahan)
+======================================================================
+Data sintetis dibuat di SQLite (lihat db.sqlite_pool) dengan ~5 bahan per
+resep, lalu query lama dan indeks in-memory dibandingkan untuk jumlah baris
+bahan_resep yang berbeda. Index pada bahan_resep(id_resep) ikut dibuat agar
+query lama tidak dirugikan (kondisi terbaik untuk SQL).
+
+Jalankan: python benchmark_ingredient_index.py [jumlah_baris ...]
+          (default: 10000 100000 1000000)
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import db
+from ingredient_index import IngredientIndex
+
+BAHAN_PER_RESEP = 5
+JUMLAH_QUERY = 20
+SEED = 42
+
+BAHAN_DASAR = [
+    "telur", "ayam", "bawang", "tahu", "tempe", "daging", "ikan", "cabai", "tomat", "wortel",
+    "kentang", "jahe", "kunyit", "santan", "kemiri", "serai", "lengkuas", "jagung", "bayam", "timun",
+]
+VARIAN = ["", " ayam", " merah", " putih", " segar", " bubuk", " kampung", " giling"]
+
+
+def legacy_query(bahan_list):
+    # Salinan query cari_resep_dari_bahan sebelum memakai IngredientIndex
+    exists_clauses, params = [], []
+    for bahan in bahan_list:
+        kata_utama = bahan.split()[0]
+        exists_clauses.append(
+            """
+            EXISTS (
+                SELECT 1 FROM bahan_resep br
+                WHERE br.id_resep = r.id_resep
+                AND (
+                    LOWER(br.nama_bahan) = %s
+                    OR LOWER(br.nama_bahan) LIKE %s
+                )
+            )
+            """
+        )
+        params += [kata_utama, f"{kata_utama} %"]
+    query = f"SELECT r.id_resep, r.judul FROM resep r WHERE {' AND '.join(exists_clauses)}"
+    return query, params
+
+
+def build_database(path, rows):
+    rng = random.Random(SEED)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE resep (id_resep INTEGER PRIMARY KEY, judul TEXT, wkt_masak TEXT, ktg_masak TEXT);
+        CREATE TABLE bahan_resep (id_bahan INTEGER PRIMARY KEY, id_resep INTEGER, nama_bahan TEXT);
+        CREATE INDEX bahan_resep_id_resep ON bahan_resep (id_resep);
+        """
+    )
+    jumlah_resep = max(1, rows // BAHAN_PER_RESEP)
+    conn.executemany(
+        "INSERT INTO resep VALUES (?, ?, ?, ?)",
+        ((i, f"Resep {i}", "15", "Makanan Berat") for i in range(1, jumlah_resep + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO bahan_resep (id_resep, nama_bahan) VALUES (?, ?)",
+        (
+            (i // BAHAN_PER_RESEP + 1, (rng.choice(BAHAN_DASAR) + rng.choice(VARIAN)).title())
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def bench(rows, tmpdir):
+    path = os.path.join(tmpdir, f"bahan_{rows}.db")
+    build_database(path, rows)
+    pool = db.sqlite_pool(path, size=1)
+
+    rng = random.Random(SEED)
+    queries = [rng.sample(BAHAN_DASAR, rng.randint(1, 3)) for _ in range(JUMLAH_QUERY)]
+
+    index = IngredientIndex(pool, refresh_interval=0)
+    start = time.perf_counter()
+    index.rebuild()
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sql_results = [pool.query(*legacy_query(q)) for q in queries]
+    sql_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    start = time.perf_counter()
+    index_results = [index.search(q) for q in queries]
+    index_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    for sql_rows, ids in zip(sql_results, index_results):
+        assert sorted(r["id_resep"] for r in sql_rows) == ids.tolist(), "Hasil indeks beda dengan SQL"
+
+    pool.close()
+    print(
+        f"{rows:>9} baris | SQL: {sql_ms:10.3f} ms/query | indeks: {index_ms:8.4f} ms/query "
+        f"| x{sql_ms / max(index_ms, 1e-9):,.0f} | build indeks: {build_s:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rows in sizes:
+            bench(rows, tmpdir)
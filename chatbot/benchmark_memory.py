@@ -0,0 +1,198 @@
+"""
+Benchmark memori multi-proses (RSS / PSS per worker)
+====================================================
+Server dijalankan dengan 1, 4 dan 8 worker (CHATBOT_WORKERS /
+VISION_WORKERS, lihat inference/prefork.py), ditunggu sampai semua worker
+siap, diberi sedikit traffic, lalu /proc/<pid>/smaps_rollup setiap proses
+dibaca:
+
+- RSS : halaman yang sedang dipakai proses (halaman bersama dihitung penuh)
+- PSS : halaman bersama dibagi rata ke proses yang memakainya
+- USS : halaman privat (yang benar-benar hilang kalau worker dimatikan)
+
+Total PSS dibandingkan dengan N x RSS server satu proses, yaitu kira-kira
+biaya N server yang dijalankan terpisah tanpa berbagi apa pun.
+
+Setiap engine diukur terpisah. Keras (dan TFLite dengan XNNPACK) memuat
+bobot ke memori privat setiap worker, jadi PSS/worker hampir tidak turun;
+bobot mmap (numpy, tflite tanpa XNNPACK) dibagi lewat page cache.
+
+Jalankan: python benchmark_memory.py [chatbot|vision] [jumlah_worker ...]
+                                     [--engine NAMA]
+          (default: chatbot 1 4 8, semua engine di ENGINES)
+"""
+
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SERVERS = {
+    # nama: (folder, script, env jumlah worker, port)
+    "chatbot": ("chatbot", "chatbot_server.py", "CHATBOT_WORKERS", 5000),
+    "vision": ("vision_model", "predict_image.py", "VISION_WORKERS", 5001),
+}
+# Engine yang dibandingkan: nama -> env (set eksplisit, jadi default
+# multi-worker di server tidak ikut berpengaruh)
+ENGINES = {
+    "chatbot": {
+        "keras": {"CHATBOT_ENGINE": "keras"},
+        "numpy-mmap": {"CHATBOT_ENGINE": "numpy"},
+    },
+    "vision": {
+        "keras": {"VISION_ENGINE": "keras"},
+        "tflite+xnnpack": {"VISION_ENGINE": "tflite-dynamic", "VISION_TFLITE_XNNPACK": "1"},
+        "tflite-mmap": {"VISION_ENGINE": "tflite-dynamic", "VISION_TFLITE_XNNPACK": "0"},
+    },
+}
+WORKER_COUNTS = [1, 4, 8]
+READY_TIMEOUT = 300  # detik
+TRAFFIC_PER_WORKER = 20
+MESSAGES = ["halo", "rekomendasi resep sarapan pagi", "resep dengan telur dan bawang", "terima kasih"]
+
+
+def memory(pid):
+    """smaps_rollup -> {"rss", "pss", "uss"} dalam MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def get(url, timeout=5):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as res:
+            return res.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def wait_ready(proc, port, workers):
+    # /ready dijawab worker acak: tunggu sampai 3N jawaban 200 berturut-turut
+    deadline = time.monotonic() + READY_TIMEOUT
+    streak = 0
+    while streak < 3 * workers:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server keluar dengan kode {proc.returncode}")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"belum siap setelah {READY_TIMEOUT}s")
+        if get(f"http://127.0.0.1:{port}/ready") == 200:
+            streak += 1
+        else:
+            streak = 0
+            time.sleep(0.5)
+
+
+def post(url, body, content_type):
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as res:
+            res.read()
+    except urllib.error.HTTPError:
+        pass
+
+
+def traffic(target, port, n):
+    if target == "chatbot":
+        for i in range(n):
+            body = json.dumps({"message": MESSAGES[i % len(MESSAGES)]}).encode()
+            post(f"http://127.0.0.1:{port}/chat", body, "application/json")
+        return
+
+    sys.path.append(ROOT)
+    from inference.image_preprocessing import dummy_jpeg
+
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.jpg"\r\n'
+               f"Content-Type: image/jpeg\r\n\r\n".encode())
+    body.write(dummy_jpeg())
+    body.write(f"\r\n--{boundary}--\r\n".encode())
+    for _ in range(n):
+        post(f"http://127.0.0.1:{port}/predict_image", body.getvalue(), f"multipart/form-data; boundary={boundary}")
+
+
+def run(target, workers, engine_env):
+    folder, script, workers_env, port = SERVERS[target]
+    env = {**os.environ, **engine_env, workers_env: str(workers)}
+    proc = subprocess.Popen(
+        [sys.executable, script], cwd=os.path.join(ROOT, folder), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(proc, port, workers)
+        traffic(target, port, TRAFFIC_PER_WORKER * workers)
+        time.sleep(1)
+        # Satu worker: proses server itu sendiri; multi: parent + anak hasil fork
+        pids = [proc.pid] if workers == 1 else children(proc.pid)
+        parent = None if workers == 1 else memory(proc.pid)
+        return parent, [memory(pid) for pid in pids]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def avg(rows, key):
+    return sum(r[key] for r in rows) / len(rows)
+
+
+def benchmark(target, engine, engine_env, counts):
+    print(f"\n=== {target} / {engine} ===")
+    print(f"{'worker':>6}{'RSS/wkr':>10}{'PSS/wkr':>10}{'USS/wkr':>10}{'PSS parent':>12}{'total PSS':>11}{'N x RSS(1)':>12}")
+    single_rss = None
+    for n in counts:
+        try:
+            parent, rows = run(target, n, engine_env)
+        except RuntimeError as e:
+            print(f"{n:>6}  gagal: {e}")
+            continue
+        total = sum(r["pss"] for r in rows) + (parent["pss"] if parent else 0)
+        if n == 1:
+            single_rss = rows[0]["rss"]
+        naive = f"{n * single_rss:>12.1f}" if single_rss else f"{'-':>12}"
+        parent_pss = f"{parent['pss']:>12.1f}" if parent else f"{'-':>12}"
+        print(f"{n:>6}{avg(rows, 'rss'):>10.1f}{avg(rows, 'pss'):>10.1f}{avg(rows, 'uss'):>10.1f}"
+              f"{parent_pss}{total:>11.1f}{naive}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    only = None
+    if "--engine" in args:
+        i = args.index("--engine")
+        only = args.pop(i + 1)
+        args.pop(i)
+    target = args[0] if args else "chatbot"
+    counts = [int(n) for n in args[1:]] or WORKER_COUNTS
+    engines = {name: env for name, env in ENGINES[target].items() if only in (None, name)}
+    if not engines:
+        sys.exit(f"engine {only!r} tidak dikenal, pilih: {', '.join(ENGINES[target])}")
+
+    print(f"{target}: worker {counts}, engine {list(engines)}")
+    for engine, engine_env in engines.items():
+        benchmark(target, engine, engine_env, counts)
+    print("\n(MB; total PSS = memori fisik yang dipakai semua proses server)")
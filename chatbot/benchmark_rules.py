@@ -0,0 +1,368 @@
+"""
+Benchmark throughput routing get_response: cascade lama vs rules.py
+====================================================================
+Mengukur pesan/detik untuk pesan-pesan di dataset/rules_golden.json
+(tanpa model NLP dan tanpa DB; cabang rekomendasi memakai id tetap):
+
+- lama  : salinan get_response sebelum rules.py (cascade if/elif dengan
+          re.search / any(...) per aturan, regex tidak dikompilasi)
+- aturan: rules.get_response (tabel aturan yang dikompilasi)
+
+Respon keduanya dicek sama sebelum diukur.
+
+Jalankan: python benchmark_rules.py [jumlah_putaran]
+"""
+
+import datetime
+import json
+import random
+import re
+import sys
+import time
+
+import rules
+
+GOLDEN_PATH = "dataset/rules_golden.json"
+
+
+def recommend(waktu, easy=False):
+    return [1, 2, 3]
+
+
+# =====================================================================
+# Salinan get_response lama (chatbot_server.py sebelum rules.py)
+# =====================================================================
+def legacy_extract_ingredients(msg):
+    # Contoh input: "aku punya telur, bawang putih dan ayam"
+    msg = msg.lower()
+
+    # Pisah dulu berdasarkan koma
+    parts = re.split(r"[,\n]", msg)
+
+    bahan_list = []
+    stopwords = [
+        "aku",
+        "saya",
+        "punya",
+        "bahan",
+        "ada",
+        "pakai",
+        "gunakan",
+        "menggunakan",
+        "dan",
+        "dengan",
+        "yang",
+        "nih",
+        "ini",
+    ]
+
+    for part in parts:
+        words = re.findall(r"[a-zA-Z0-9]+", part)
+        words = [w for w in words if w not in stopwords]
+
+        if len(words) > 0:
+            bahan_list.append(" ".join(words))  # contoh: "bawang putih"
+
+    return bahan_list
+
+
+# ---------------------
+# Cari resep dari bahan (lebih akurat + partial)
+
+
+def legacy_parse_combination_filters(msg):
+    """
+    Mengembalikan dict dengan kunci opsional:
+      - users: list of usernames (strings)
+      - bahan: list of bahan (strings)
+      - min_rating: int
+      - max_rating: int
+      - sort: 'rating_desc' atau lainnya
+    """
+    out = {
+        "users": [],
+        "bahan": [],
+        "min_rating": None,
+        "max_rating": None,
+        "sort": None,
+    }
+
+    text = msg.lower()
+
+    # 1) Cari frasa user: "dari fikri dan athar", "dari fikri, athar"
+    user_match = re.search(r"(?:dari|oleh|milik)\s+([a-z0-9_\-\s, dan&]+)", text)
+    if user_match:
+        raw = user_match.group(1)
+        # split by 'dan', ',', '&'
+        users = re.split(r"\s*(?:dan|,|&)\s*", raw)
+        users = [u.strip() for u in users if u.strip()]
+        out["users"] = users
+
+    # 2) Cari bahan: patterns after 'yang bahannya', 'yang bahannya ayam', 'pakai', 'punya'
+    bahan_match = re.search(
+        r"(?:yang\s+bahannya|yang\s+pakai|yang\s+menggunakan|pakai|punya|dengan)\s+([a-z0-9_\-\s, dan&]+)",
+        text,
+    )
+    if bahan_match:
+        raw_bahan = bahan_match.group(1)
+        bahan_list = re.split(r"\s*(?:dan|,|&)\s*", raw_bahan)
+        bahan_list = [b.strip() for b in bahan_list if b.strip()]
+        out["bahan"] = bahan_list
+    else:
+        # fallback: cek ada kata 'ayam', 'telur' langsung disebutkan tanpa kata kunci
+        # gunakan extract_ingredients_from_message sebagai fallback
+        if any(
+            k in text
+            for k in ["ayam", "telur", "bawang", "tahu", "tempe", "daging", "ikan"]
+        ):
+            ext = legacy_extract_ingredients(text)
+            if ext:
+                out["bahan"] = ext
+
+    # 3) Rating: "rating 4 ke atas", "rating minimal 3", "rating 3-5", "rating 4+"
+    # pola range
+    range_match = re.search(r"rating\s*(\d+)\s*[-–]\s*(\d+)", text)
+    if range_match:
+        out["min_rating"] = int(range_match.group(1))
+        out["max_rating"] = int(range_match.group(2))
+    else:
+        # pola 'rating X ke atas' / 'rating minimal X' / 'rating X+'
+        up_match = re.search(
+            r"rating\s*(\d+)\s*(?:ke\s*atas|keatas|minimal|minimalnya|lebih\s*dari|>)|\brating\s*(\d+)\s*\+",
+            text,
+        )
+        if up_match:
+            # group may have None
+            val = up_match.group(1) or up_match.group(2)
+            if val:
+                out["min_rating"] = int(val)
+                out["max_rating"] = 5
+
+        # pola 'rating di atas X' (strict greater than)
+        above_match = re.search(r"rating\s*di\s*atas\s*(\d+)", text)
+        if above_match:
+            out["min_rating"] = int(above_match.group(1)) + 1
+            out["max_rating"] = 5
+
+    # 4) Kata kunci 'terenak' atau 'terbaik' -> prioritaskan rating tinggi
+    if "terenak" in text or "terbaik" in text or "paling enak" in text:
+        # set minimal rating 4 sebagai default jika belum ada rating
+        if not out["min_rating"]:
+            out["min_rating"] = 4
+        out["sort"] = "rating_desc"
+
+    return out
+
+
+def legacy_get_response(ints, intents_json, user_message, recommend):
+    msg_lower = user_message.lower()
+
+    # -----------------------------
+    # 1) Cek kombinasi kompleks dulu (users, bahan, rating, sort)
+    # -----------------------------
+    combo = legacy_parse_combination_filters(msg_lower)
+    if combo["users"] or combo["bahan"] or combo["min_rating"] or combo["max_rating"]:
+        params = []
+
+        # Users
+        if combo["users"]:
+            for u in combo["users"]:
+                params.append(("user_resep[]", u))
+
+        # Bahan (bersihkan kata 'rating' & angka)
+        if combo["bahan"]:
+    # Bersihkan kata-kata umum & ekstrak bahan utama
+            cleaned_bahan = []
+            for b in combo["bahan"]:
+                extracted = legacy_extract_ingredients(b)
+                if extracted:
+                    cleaned_bahan.extend(extracted)
+            if cleaned_bahan:
+                params.append(("cari_bahan", ",".join(cleaned_bahan)))
+
+        # Rating
+        if combo["min_rating"] is not None:
+            params.append(("min_rating", str(combo["min_rating"])))
+        if combo["max_rating"] is not None:
+            params.append(("max_rating", str(combo["max_rating"])))
+
+        # Sort
+        if combo["sort"]:
+            params.append(("sort", combo["sort"]))
+
+        # Build query
+        query_parts = []
+        for k, v in params:
+            encoded_value = v.replace(" ", "%20")
+            query_parts.append(f"{k}={encoded_value}")
+        query = "&".join(query_parts)
+
+        if not query:
+            return {"type": "text", "message": "Maaf, saya tidak menemukan filter yang valid."}
+
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep sesuai kombinasi filter kamu... 🍽️",
+            "url": f"http://localhost:8000/resepcari?{query}",
+        }
+
+    # -----------------------------
+    # 2) Cek rating range spesifik: "rating 2-4"
+    # -----------------------------
+    rating_range_match = re.search(r"rating\s*(\d+)\s*-\s*(\d+)", msg_lower)
+    if rating_range_match:
+        start, end = int(rating_range_match.group(1)), int(rating_range_match.group(2))
+        rating_query = "&".join([f"rating[]={r}" for r in range(start, end + 1)])
+        return {
+            "type": "redirect",
+            "message": f"Menampilkan resep dengan rating {start}-{end} ⭐",
+            "url": f"http://localhost:8000/resepcari?{rating_query}",
+        }
+
+    # -----------------------------
+    # 3) Cek rating tinggi / terendah
+    # -----------------------------
+    if any(kw in msg_lower for kw in ["rating tinggi", "terbaik", "bintang tinggi", "terfavorit"]):
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan rating tinggi (3-5) 🌟",
+            "url": "http://localhost:8000/resepcari?sort=rating_desc&min_rating=3&max_rating=5",
+        }
+
+    if "rating terendah" in msg_lower:
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan rating terendah (0-2) 🌟",
+            "url": "http://localhost:8000/resepcari?rating_lowest=1",
+        }
+
+    # -----------------------------
+    # 4) Cek bahan yang disebut (pastikan bukan rating)
+    # -----------------------------
+    if any(kw in msg_lower for kw in ["punya", "bahan", "ada", "pakai", "menggunakan"]) and "rating" not in msg_lower:
+        bahan = legacy_extract_ingredients(msg_lower)
+        if bahan:
+            query_bahan = ",".join(bahan)
+            return {
+                "type": "redirect",
+                "message": f"Mencarikan resep dengan bahan: {', '.join(bahan)}...",
+                "url": f"http://localhost:8000/resepcari?cari_bahan={query_bahan}",
+            }
+
+    # -----------------------------
+    # 5) Cek kategori (minuman, snack, dessert, dll)
+    # -----------------------------
+    kategori_keywords = {
+        "makanan ringan": "Makanan Ringan",
+        "makanan berat": "Makanan Berat",
+        "minuman": "Minuman",
+        "snack": "Snack",
+        "dessert": "Dessert",
+    }
+    for kw, ktg in kategori_keywords.items():
+        if kw in msg_lower:
+            return {
+                "type": "redirect",
+                "message": f"Menampilkan resep kategori {ktg} 🍽️",
+                "url": f"http://localhost:8000/resepcari?ktg_masak[]={ktg}",
+            }
+
+    # -----------------------------
+    # 6) Cek waktu memasak tercepat / terlama
+    # -----------------------------
+    if any(kw in msg_lower for kw in ["tercepat", "waktu cepat", "masak cepat", "cepat"]):
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan waktu memasak tercepat (0-15 menit) ⏱️",
+            "url": "http://localhost:8000/resepcari?tgl_masak[]=cepat",
+        }
+
+    if any(kw in msg_lower for kw in ["terlama", "lama", "waktu lama", "masak lama"]):
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan waktu memasak terlama (>15 menit) ⏳",
+            "url": "http://localhost:8000/resepcari?tgl_masak[]=lama",
+        }
+
+    # -----------------------------
+    # 7) Cek rekomendasi (pagi, malam, mudah, random)
+    # -----------------------------
+    if any(kw in msg_lower for kw in ["rekomendasi", "saran", "makan apa", "dimakan", "siang", "malam", "pagi"]):
+        current_hour = datetime.datetime.now().hour
+        if "pagi" in msg_lower:
+            waktu = "pagi"
+        elif "siang" in msg_lower:
+            waktu = "siang"
+        elif "sore" in msg_lower:
+            waktu = "sore"
+        elif "malam" in msg_lower:
+            waktu = "malam"
+        else:
+            if 5 <= current_hour < 7:
+                waktu = "pagi"
+            elif 11 <= current_hour < 15:
+                waktu = "siang"
+            elif 15 <= current_hour < 18:
+                waktu = "sore"
+            else:
+                waktu = "malam"
+
+        # Query DB lama diganti `recommend` (sama dengan rules.get_response)
+        easy = "mudah" in msg_lower or "gampang" in msg_lower
+        resep_ids = ",".join([str(i) for i in recommend(waktu, easy=easy)])
+
+        return {
+            "type": "redirect",
+            "message": f"Berikut rekomendasi resep {waktu} 🍳",
+            "url": f"http://localhost:8000/resepcari?ids={resep_ids}",
+        }
+
+    # -----------------------------
+    # 8) Nama resep spesifik
+    # -----------------------------
+    resep_match = re.search(r"(?:aku mau resep|resep|punya resep|resep buatan)\s+(.+)", msg_lower)
+    if resep_match:
+        nama_resep = resep_match.group(1).strip()
+        return {
+            "type": "redirect",
+            "message": f"Menampilkan resep '{nama_resep}'...",
+            "url": f"http://localhost:8000/resepcari?cari_resep={nama_resep}",
+        }
+
+    # -----------------------------
+    # 9) NLP fallback
+    # -----------------------------
+    if ints:
+        tag = ints[0]["intent"]
+        for i in intents_json["intents"]:
+            if i["tag"] == tag:
+                return {"type": "text", "message": random.choice(i["responses"])}
+
+    # Default
+    return {"type": "text", "message": "Maaf, saya tidak mengerti maksud Anda."}
+
+
+def throughput(get_response, messages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            get_response([], empty_intents, message, recommend)
+    elapsed = time.perf_counter() - start
+    return rounds * len(messages) / elapsed, elapsed
+
+
+rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+messages = [case["message"] for case in json.loads(open(GOLDEN_PATH, encoding="utf-8").read())]
+empty_intents = {"intents": []}
+
+for message in messages:
+    expected = legacy_get_response([], empty_intents, message, recommend)
+    assert rules.get_response([], empty_intents, message, recommend) == expected, f"Respon beda: {message}"
+
+total = rounds * len(messages)
+print(f"[OK] {len(messages)} pesan x {rounds} putaran = {total} pesan, respon lama == rules.py")
+rates = {}
+for name, fn in [("lama", legacy_get_response), ("aturan", rules.get_response)]:
+    rates[name], elapsed = throughput(fn, messages, rounds)
+    print(f"[OK] {name:<7}: {rates[name]:>10,.0f} pesan/detik ({elapsed / total * 1e6:.1f} us/pesan)")
+print(f"[OK] rules.py x{rates['aturan'] / rates['lama']:.1f} lebih cepat")
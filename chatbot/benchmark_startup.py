@@ -0,0 +1,109 @@
+"""
+Benchmark cold start chatbot_server (python -X importtime)
+==========================================================
+Setiap modul diimport di proses Python baru dengan -X importtime, lalu
+stderr-nya diurai: total waktu import dan modul dengan waktu kumulatif
+terbesar (yang pantas dibuat lazy). Untuk chatbot_server sendiri, import
+diukur per mode CHATBOT_VISION (eager / lazy / off) dengan warmup mati,
+supaya terlihat berapa yang dibayar worker teks untuk model gambar.
+
+Import chatbot_server ikut memuat model intent dan mencoba konek DB; kalau
+DB tidak ada, refresher hanya mencatat error dan import tetap selesai.
+
+Jalankan: python benchmark_startup.py [jumlah_ulang] [top_n]
+          (default: 3 kali per modul, 10 modul terberat)
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+MODULES = ["preprocessing", "artifacts", "db", "rules", "recommendation_index", "ingredient_index", "predict_image"]
+VISION_MODES = ["eager", "lazy", "off"]
+# Modul berat yang seharusnya tidak dimuat worker teks
+HEAVY = ["tensorflow", "PIL", "asyncio", "mysql", "nltk"]
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PYTHONPATH = os.pathsep.join([ROOT, os.path.join(ROOT, "vision_model")])
+
+
+def parse_importtime(stderr):
+    """Baris 'import time: self | cumulative | nama' -> {nama: (self_us, cumulative_us)}."""
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # baris header
+        result.setdefault(name.strip(), (int(self_us), int(cumulative_us)))
+    return result
+
+
+def import_once(module, env=None):
+    code = f"import time, sys; t = time.perf_counter(); import {module}; " \
+           f"print(round((time.perf_counter() - t) * 1000, 1), ' '.join(sorted(sys.modules)))"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env={**os.environ, "PYTHONPATH": PYTHONPATH, **(env or {})},
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        # Baris terakhir traceback, tanpa output importtime
+        lines = [l for l in proc.stderr.splitlines() if l and not l.startswith((" ", "*", "import time:"))]
+        raise RuntimeError(lines[-1] if lines else f"exit {proc.returncode}")
+    import_ms, loaded = proc.stdout.strip().splitlines()[-1].split(" ", 1)
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": float(import_ms),
+        "times": parse_importtime(proc.stderr),
+        "loaded": set(loaded.split()),
+    }
+
+
+def measure(module, repeat, env=None):
+    # Ambil run tercepat (cache file system sudah hangat)
+    runs = [import_once(module, env) for _ in range(repeat)]
+    return min(runs, key=lambda r: r["import_ms"])
+
+
+def heavy_loaded(run):
+    return ",".join(h for h in HEAVY if h in run["loaded"]) or "-"
+
+
+def top_imports(run, n):
+    top = sorted(run["times"].items(), key=lambda kv: kv[1][1], reverse=True)
+    return top[:n]
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    top_n = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"{'modul':<22}{'import ms':>11}{'proses ms':>11}  modul berat")
+    for module in MODULES:
+        try:
+            run = measure(module, repeat)
+        except RuntimeError as e:
+            print(f"{module:<22}  gagal: {e}")
+            continue
+        print(f"{module:<22}{run['import_ms']:>11.1f}{run['wall_ms']:>11.1f}  {heavy_loaded(run)}")
+
+    print(f"\nchatbot_server (CHATBOT_WARMUP=off, engine: {os.environ.get('CHATBOT_ENGINE', 'keras')})")
+    runs = {}
+    for mode in VISION_MODES:
+        env = {"CHATBOT_VISION": mode, "CHATBOT_WARMUP": "off"}
+        try:
+            runs[mode] = measure("chatbot_server", repeat, env)
+        except RuntimeError as e:
+            print(f"  CHATBOT_VISION={mode:<6} gagal: {e}")
+            continue
+        run = runs[mode]
+        print(f"  CHATBOT_VISION={mode:<6}{run['import_ms']:>9.1f} ms  modul: {len(run['loaded']):>5}  berat: {heavy_loaded(run)}")
+
+    for mode, run in runs.items():
+        print(f"\nTop {top_n} import kumulatif (CHATBOT_VISION={mode}):")
+        for name, (self_us, cumulative_us) in top_imports(run, top_n):
+            print(f"  {cumulative_us / 1000:>9.1f} ms  {name}")
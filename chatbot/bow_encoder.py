@@ -0,0 +1,54 @@
+import os
+import pickle
+import numpy as np
+
+from preprocessing import clean_up_sentence
+
+WORDS_PATH = os.path.join(os.path.dirname(__file__), "model", "words.pkl")
+
+
+class BagOfWordsEncoder:
+    """
+    Encoder bag-of-words berbasis indeks.
+
+    Vocab dari words.pkl diubah sekali jadi dict token -> indeks, sehingga
+    encode satu kalimat cukup O(jumlah token), bukan O(token x vocab).
+    """
+
+    def __init__(self, words, tokenizer=clean_up_sentence, dtype=np.float32):
+        self.words = list(words)
+        self.index = {w: i for i, w in enumerate(self.words)}
+        self.tokenizer = tokenizer
+        self.dtype = dtype
+
+    @classmethod
+    def from_pickle(cls, path=WORDS_PATH, **kwargs):
+        with open(path, "rb") as f:
+            words = pickle.load(f)
+        return cls(words, **kwargs)
+
+    def __len__(self):
+        return len(self.words)
+
+    def indices(self, tokens):
+        index = self.index
+        return [index[t] for t in tokens if t in index]
+
+    def encode_tokens(self, tokens, out=None):
+        # Token yang sudah dibersihkan -> vektor 0/1
+        if out is None:
+            out = np.zeros(len(self.words), dtype=self.dtype)
+        else:
+            out.fill(0)
+        out[self.indices(tokens)] = 1
+        return out
+
+    def encode(self, sentence, out=None):
+        return self.encode_tokens(self.tokenizer(sentence), out=out)
+
+    def encode_many(self, sentences):
+        # Matriks 2-D (jumlah kalimat x vocab), dialokasikan sekali
+        matrix = np.zeros((len(sentences), len(self.words)), dtype=self.dtype)
+        for row, sentence in enumerate(sentences):
+            matrix[row, self.indices(self.tokenizer(sentence))] = 1
+        return matrix
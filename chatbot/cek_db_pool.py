@@ -0,0 +1,111 @@
+"""
+Cek pool koneksi DB (db.py) dengan SQLite sebagai pengganti MySQL
+=================================================================
+Database SQLite sementara berisi tabel resep kecil, pool berukuran 2:
+
+- checkout/release : query jalan, koneksi kembali ke pool dan dipakai ulang
+- paralel          : 8 thread x 25 query, koneksi yang dibuat <= ukuran pool
+- timeout          : semua koneksi dipinjam -> PoolTimeout
+- coba ulang       : koneksi idle ditutup paksa (seperti koneksi putus) ->
+                     query berikutnya berhasil dengan koneksi baru
+- error SQL        : tabel tidak ada -> error langsung diteruskan, tidak
+                     dicoba ulang dan koneksi tidak dibuang
+
+Jalankan: python cek_db_pool.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+from db import PoolTimeout, sqlite_pool
+
+gagal = []
+
+
+def cek(nama, ok, detail=""):
+    print(f"[{'OK' if ok else '!'}] {nama}" + (f" ({detail})" if detail else ""))
+    if not ok:
+        gagal.append(nama)
+
+
+tmp_dir = tempfile.mkdtemp(prefix="cek_db_pool_")
+path = os.path.join(tmp_dir, "resep.db")
+conn = sqlite3.connect(path)
+conn.execute("CREATE TABLE resep (id INTEGER PRIMARY KEY, nama TEXT, waktu TEXT)")
+conn.executemany("INSERT INTO resep (nama, waktu) VALUES (?, ?)",
+                 [(f"resep {i}", ["pagi", "siang", "malam"][i % 3]) for i in range(30)])
+conn.commit()
+conn.close()
+
+pool = sqlite_pool(path, size=2, timeout=0.2)
+
+# === CHECKOUT / RELEASE ===
+rows = pool.query("SELECT id, nama FROM resep WHERE waktu = %s ORDER BY id", ("pagi",))
+rows_again = pool.query("SELECT COUNT(*) AS n FROM resep")
+stats = pool.stats()
+cek("checkout/release", len(rows) == 10 and rows_again == [{"n": 30}] and stats["created"] == 1
+    and stats["idle"] == 1 and stats["checkouts"] == 2, f"created={stats['created']}, idle={stats['idle']}")
+
+# === PARALEL ===
+errors = []
+
+
+def worker():
+    try:
+        for _ in range(25):
+            pool.query("SELECT id FROM resep ORDER BY RAND() LIMIT 3")
+    except Exception as e:
+        errors.append(e)
+
+
+threads = [threading.Thread(target=worker) for _ in range(8)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+stats = pool.stats()
+cek("paralel", not errors and stats["created"] <= 2,
+    f"{stats['checkouts']} checkout, created={stats['created']}, wait_max={stats['wait_max_ms']} ms"
+    + (f", error: {errors[0]!r}" if errors else ""))
+
+# === TIMEOUT ===
+timeouts_before = stats["timeouts"]
+with pool.connection(), pool.connection():
+    try:
+        pool.query("SELECT 1")
+        habis = False
+    except PoolTimeout:
+        habis = True
+cek("timeout", habis and pool.stats()["timeouts"] == timeouts_before + 1)
+
+# === COBA ULANG (koneksi putus) ===
+with pool.connection() as c:
+    c.raw.close()  # koneksi ini kembali ke pool dalam keadaan tertutup
+before = pool.stats()
+rows = pool.query("SELECT COUNT(*) AS n FROM resep")
+after = pool.stats()
+cek("coba ulang", rows == [{"n": 30}] and after["reconnects"] == before["reconnects"] + 1,
+    f"reconnects={after['reconnects']}")
+
+# === ERROR SQL (tidak dicoba ulang) ===
+before = pool.stats()
+try:
+    pool.query("SELECT * FROM tidak_ada")
+    diteruskan = False
+except sqlite3.OperationalError:
+    diteruskan = True
+after = pool.stats()
+cek("error SQL tidak dicoba ulang", diteruskan and after["reconnects"] == before["reconnects"]
+    and after["created"] == before["created"] and after["checkouts"] == before["checkouts"] + 1)
+
+pool.close()
+os.remove(path)
+os.rmdir(tmp_dir)
+
+if gagal:
+    print(f"\n[!] {len(gagal)} cek gagal: {', '.join(gagal)}")
+    sys.exit(1)
+print("\n[OK] Pool koneksi berjalan sesuai harapan")
@@ -0,0 +1,43 @@
+"""
+Cek kesamaan hasil NumpyBackend vs model.predict (Keras)
+========================================================
+Semua pola di dataset/intents.json diprediksi dengan kedua engine lalu
+dibandingkan: selisih probabilitas maksimum dan kecocokan kelas teratas.
+
+Jalankan: python cek_parity_numpy.py
+"""
+
+import json
+import sys
+import numpy as np
+from tensorflow.keras.models import load_model
+
+from bow_encoder import BagOfWordsEncoder
+from export_numpy import MODEL_PATH, NPZ_PATH
+from inference import NumpyBackend
+
+TOLERANCE = 1e-5
+
+intents = json.loads(open("dataset/intents.json", encoding="utf-8").read())
+patterns = [p for intent in intents["intents"] for p in intent["patterns"]]
+
+encoder = BagOfWordsEncoder.from_pickle()
+X = encoder.encode_many(patterns)
+
+keras_probs = load_model(MODEL_PATH).predict(X, verbose=0)
+numpy_probs = NumpyBackend.load(NPZ_PATH).predict_on_batch(X)
+
+max_diff = float(np.max(np.abs(keras_probs - numpy_probs)))
+same_top = np.argmax(keras_probs, axis=1) == np.argmax(numpy_probs, axis=1)
+
+print(f"[OK] Jumlah pola       : {len(patterns)}")
+print(f"[OK] Selisih maksimum  : {max_diff:.2e} (toleransi {TOLERANCE:.0e})")
+print(f"[OK] Kelas teratas sama: {int(same_top.sum())}/{len(patterns)}")
+
+if max_diff > TOLERANCE or not same_top.all():
+    for pattern, ok in zip(patterns, same_top):
+        if not ok:
+            print(f"  [!] Beda prediksi: {pattern}")
+    sys.exit(1)
+
+print("[OK] NumpyBackend identik dengan model.predict")
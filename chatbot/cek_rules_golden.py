@@ -0,0 +1,44 @@
+"""
+Golden test routing get_response (rules.py)
+============================================
+dataset/rules_golden.json berisi pesan representatif beserta respon yang
+dihasilkan get_response versi lama (cascade re.search / any(...)). Mesin
+aturan yang sudah dikompilasi harus menghasilkan respon yang PERSIS sama.
+
+Cabang rekomendasi memakai id tetap [1, 2, 3] dan pesan uji selalu
+menyebut waktu (pagi/siang/sore/malam) agar tidak bergantung jam.
+
+Jalankan: python cek_rules_golden.py
+"""
+
+import json
+import sys
+
+import rules
+
+GOLDEN_PATH = "dataset/rules_golden.json"
+
+
+def recommend(waktu, easy=False):
+    return [1, 2, 3]
+
+
+golden = json.loads(open(GOLDEN_PATH, encoding="utf-8").read())
+empty_intents = {"intents": []}
+
+beda = []
+for case in golden:
+    actual = rules.get_response([], empty_intents, case["message"], recommend)
+    if actual != case["response"]:
+        beda.append((case["message"], case["response"], actual))
+
+print(f"[OK] Jumlah kasus golden: {len(golden)}")
+if beda:
+    print(f"[!] {len(beda)} respon berbeda:")
+    for message, expected, actual in beda:
+        print(f"  Pesan    : {message!r}")
+        print(f"  Expected : {expected}")
+        print(f"  Actual   : {actual}")
+    sys.exit(1)
+
+print("[OK] Semua respon identik dengan golden")
@@ -0,0 +1,55 @@
+"""
+Cek tokenizer regex vs nltk.word_tokenize
+==========================================
+Tokenizer regex (CHATBOT_TOKENIZER=regex) hanya boleh dipakai kalau token
+yang masuk vocab (words.pkl) SAMA PERSIS dengan tokenizer NLTK untuk semua
+pola di dataset/intents.json. Script ini juga mengukur kecepatannya.
+
+Jalankan: python cek_tokenizer.py
+"""
+
+import json
+import sys
+import time
+
+import preprocessing
+from bow_encoder import BagOfWordsEncoder
+
+intents = json.loads(open("dataset/intents.json", encoding="utf-8").read())
+patterns = [p for intent in intents["intents"] for p in intent["patterns"]]
+
+encoder = BagOfWordsEncoder.from_pickle()
+print(f"[OK] Warmup korpus NLTK: {preprocessing.warmup():.2f}s")
+
+
+def vocab_hits(sentence, mode):
+    return sorted(set(encoder.indices(preprocessing.clean_up_sentence(sentence, mode=mode))))
+
+
+def timing(mode, rounds=50):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for p in patterns:
+            preprocessing.TOKENIZERS[mode](p)
+    return (time.perf_counter() - start) / (rounds * len(patterns)) * 1e6
+
+
+beda = []
+for p in patterns:
+    hits_nltk = vocab_hits(p, "nltk")
+    hits_regex = vocab_hits(p, "regex")
+    if hits_nltk != hits_regex:
+        beda.append((p, hits_nltk, hits_regex))
+
+print(f"[OK] Jumlah pola      : {len(patterns)}")
+print(f"[OK] nltk.word_tokenize: {timing('nltk'):.1f} us/kalimat")
+print(f"[OK] regex tokenizer   : {timing('regex'):.1f} us/kalimat")
+print(f"[OK] Cache lemmatize   : {preprocessing.lemmatize.cache_info()}")
+
+if beda:
+    print(f"\n[!] {len(beda)} pola dengan vocab hit berbeda:")
+    for p, a, b in beda:
+        print(f"  {p!r}: nltk={[encoder.words[i] for i in a]} regex={[encoder.words[i] for i in b]}")
+    sys.exit(1)
+
+print("[OK] Vocab hit tokenizer regex identik dengan NLTK")
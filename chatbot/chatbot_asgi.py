@@ -0,0 +1,340 @@
+"""
+Server chatbot versi ASGI (pengganti chatbot_server.py + app.run)
+=================================================================
+URL sama dengan chatbot_server.py (/chat, /predict_image, /stats,
+/admin/reload, /admin/version) sehingga ChatbotController di WebAPI tidak
+perlu diubah. Bedanya:
+
+- event loop tidak pernah menjalankan kerja CPU: tokenisasi/rules dan
+  prediksi gambar dilempar ke ThreadPoolExecutor yang ukurannya dibatasi,
+  forward pass intent tetap lewat MicroBatcher milik bundle aktif;
+- refresh indeks resep/bahan memakai aiomysql (db.aiomysql_pool) sebagai
+  task asyncio, bukan thread + mysql.connector;
+- backpressure: jumlah request yang sedang diproses dibatasi, kelebihannya
+  langsung dijawab 503 + Retry-After alih-alih menumpuk di antrean.
+
+Jalankan (dari folder chatbot/):
+    hypercorn chatbot_asgi:app --bind 127.0.0.1:5000
+    uvicorn chatbot_asgi:app --port 5000
+"""
+
+import time
+STARTED = time.perf_counter()
+
+import asyncio
+import hmac
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from quart import Quart, Request, request, jsonify
+from quart.formparser import FormDataParser
+
+# lazy | eager | off, sama dengan chatbot_server.py
+VISION_MODE = os.environ.get("CHATBOT_VISION", "lazy").lower()
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+if VISION_MODE != "off":
+    # Tambahkan path vision_model supaya bisa diimport
+    sys.path.append(os.path.join(os.path.dirname(__file__), "../vision_model"))
+    import predict_image
+
+import preprocessing
+from artifacts import ArtifactManager
+from batcher import BatcherClosed
+from inference import StartupTimeline, TimingStats, add_timing_hook
+from cache import LRUCache, MISSING
+from recommendation_index import RecommendationIndex
+from ingredient_index import IngredientIndex
+import db
+import rules
+
+timeline = StartupTimeline("chatbot-asgi", started=STARTED)
+timeline.record("import", time.perf_counter() - STARTED)
+
+
+class InMemoryFormDataParser(FormDataParser):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("stream_factory", predict_image.memory_stream_factory)
+        super().__init__(*args, **kwargs)
+
+
+class InMemoryRequest(Request):
+    # Sama dengan predict_image.InMemoryRequest: upload tidak pernah ke disk
+    form_data_parser_class = InMemoryFormDataParser
+
+
+app = Quart(__name__)
+if VISION_MODE != "off":
+    app.request_class = InMemoryRequest
+
+ENGINE = os.environ.get("CHATBOT_ENGINE", "keras").lower()
+PREDICT_CACHE_SIZE = int(os.environ.get("CHATBOT_PREDICT_CACHE_SIZE", "4096"))
+PREDICT_CACHE_TTL = os.environ.get("CHATBOT_PREDICT_CACHE_TTL")
+BATCH_MAX_SIZE = int(os.environ.get("CHATBOT_BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.environ.get("CHATBOT_BATCH_MAX_WAIT_MS", "3"))
+
+# --- Executor & backpressure ---
+CPU_WORKERS = int(os.environ.get("CHATBOT_ASGI_WORKERS", str(min(4, os.cpu_count() or 1))))
+IMAGE_WORKERS = int(os.environ.get("CHATBOT_ASGI_IMAGE_WORKERS", "1"))
+MAX_INFLIGHT_CHAT = int(os.environ.get("CHATBOT_ASGI_MAX_INFLIGHT", "64"))
+MAX_INFLIGHT_IMAGE = int(os.environ.get("CHATBOT_ASGI_MAX_INFLIGHT_IMAGE", "4"))
+RETRY_AFTER = os.environ.get("CHATBOT_ASGI_RETRY_AFTER", "1")
+
+cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="chat-cpu")
+image_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="chat-image")
+
+
+class InflightLimit:
+    """
+    Batas jumlah request yang sedang diproses satu endpoint.
+
+    Hanya diakses dari event loop, jadi tidak perlu lock. Karena request
+    di atas batas langsung ditolak, antrean executor tidak pernah lebih
+    panjang dari `limit`.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.inflight = 0
+        self.peak = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def enter(self):
+        if self.inflight >= self.limit:
+            self.rejected += 1
+            return False
+        self.inflight += 1
+        self.admitted += 1
+        self.peak = max(self.peak, self.inflight)
+        return True
+
+    def leave(self):
+        self.inflight -= 1
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "inflight": self.inflight,
+            "peak": self.peak,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+chat_limit = InflightLimit(MAX_INFLIGHT_CHAT)
+image_limit = InflightLimit(MAX_INFLIGHT_IMAGE)
+
+
+def overloaded():
+    response = jsonify({"status": "error", "message": "Server sedang sibuk, coba lagi sebentar"})
+    return response, 503, {"Retry-After": RETRY_AFTER}
+
+
+async def run_in(executor, fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+# --- Model, cache & data NLP (sama dengan chatbot_server.py) ---
+prediction_cache = LRUCache(
+    maxsize=PREDICT_CACHE_SIZE,
+    ttl=float(PREDICT_CACHE_TTL) if PREDICT_CACHE_TTL else None,
+)
+# Waktu setiap forward pass (intent & gambar), dilaporkan di /stats
+inference_timing = add_timing_hook(TimingStats())
+
+artifacts = ArtifactManager(
+    ENGINE,
+    batcher_config={"max_batch_size": BATCH_MAX_SIZE, "max_wait_ms": BATCH_MAX_WAIT_MS},
+    on_swap=prediction_cache.clear,
+)
+with timeline.phase("model_load"):
+    try:
+        artifacts.reload()
+        print(f"Model berhasil dimuat! (engine: {ENGINE})")
+    except Exception as e:
+        print(f"Error saat load model: {e}")
+artifacts.start_watcher()
+
+with timeline.phase("nltk"):
+    print(f"Korpus NLTK siap dalam {preprocessing.warmup():.2f}s (tokenizer: {preprocessing.TOKENIZER_MODE})")
+intents = json.loads(open("dataset/intents.json", encoding="utf-8").read())
+
+# --- Indeks in-memory, diisi lewat aiomysql saat server mulai ---
+db_pool = db.aiomysql_pool()
+recommendation_index = RecommendationIndex(None)
+ingredient_index = IngredientIndex(None)
+
+
+WARMUP_MODE = os.environ.get("CHATBOT_WARMUP", "background").lower()
+WARMUP_MESSAGES = ["halo", "rekomendasi resep sarapan pagi", "resep dengan telur dan bawang"]
+
+
+def warmup():
+    bundle = artifacts.current
+    if bundle is None:
+        raise RuntimeError("Model intent belum dimuat")
+    bundle.classifier.warmup(range(1, BATCH_MAX_SIZE + 1))
+    for message in WARMUP_MESSAGES:
+        bundle.batcher.predict(bundle.encoder.encode(message))
+    if VISION_MODE == "eager":
+        predict_image.warmup()
+
+
+@app.before_serving
+async def startup():
+    start = time.perf_counter()
+    await recommendation_index.start_async(db_pool)
+    await ingredient_index.start_async(db_pool)
+    timeline.record("db_index", time.perf_counter() - start)
+
+    if WARMUP_MODE == "off":
+        timeline.mark_ready()
+    elif WARMUP_MODE == "sync":
+        await run_in(cpu_executor, timeline.run_warmup, warmup, False)
+    else:
+        timeline.run_warmup(warmup)  # thread latar; /ready 503 sampai selesai
+
+
+@app.after_serving
+async def shutdown():
+    recommendation_index.refresher.stop()
+    ingredient_index.refresher.stop()
+    await db_pool.close()
+    cpu_executor.shutdown(wait=False)
+    image_executor.shutdown(wait=False)
+
+
+# ---------------------
+# Fungsi Bantu NLP
+# ---------------------
+def encode_sentence(bundle, sentence):
+    tokens = bundle.encoder.tokenizer(sentence)
+    return tokens, bundle.encoder.encode_tokens(tokens)
+
+
+async def predict_class(sentence):
+    try:
+        return await predict_with(artifacts.current, sentence)
+    except BatcherClosed:
+        # Bundle lama dipensiunkan di tengah request: ulangi dengan bundle terbaru
+        return await predict_with(artifacts.current, sentence)
+
+
+async def predict_with(bundle, sentence):
+    tokens, x = await run_in(cpu_executor, encode_sentence, bundle, sentence)
+    key = (bundle.version, tuple(tokens))
+    cached = prediction_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    # Tunggu hasil MicroBatcher tanpa memblok thread mana pun
+    res = await asyncio.wrap_future(bundle.batcher.submit(x))
+    results = bundle.rank(res)
+    prediction_cache.put(key, results)
+    return results
+
+
+def get_response(ints, intents_json, user_message):
+    return rules.get_response(ints, intents_json, user_message, recommend=recommendation_index.pick)
+
+
+# ---------------------
+# Endpoint utama
+# ---------------------
+@app.route("/chat", methods=["POST"])
+async def chat():
+    if not chat_limit.enter():
+        return overloaded()
+    try:
+        user_message = (await request.get_json()).get("message", "")
+        intents_pred = await predict_class(user_message)
+        response_data = await run_in(cpu_executor, get_response, intents_pred, intents, user_message)
+        return jsonify(response_data)
+    finally:
+        chat_limit.leave()
+
+
+@app.route("/ready", methods=["GET"])
+async def ready():
+    return jsonify(timeline.as_dict()), 200 if timeline.ready else 503
+
+
+@app.route("/stats", methods=["GET"])
+async def stats():
+    return jsonify({
+        "startup": timeline.as_dict(),
+        "prediction_cache": prediction_cache.stats(),
+        "batcher": artifacts.current.batcher.stats() if artifacts.current else None,
+        "inference": inference_timing.stats(),
+        "db_pool": db_pool.stats(),
+        "recommendation_index": recommendation_index.stats(),
+        "ingredient_index": ingredient_index.stats(),
+        "chat_limit": chat_limit.stats(),
+        "image_limit": image_limit.stats(),
+        "executor": {"cpu_workers": CPU_WORKERS, "image_workers": IMAGE_WORKERS},
+    })
+
+
+# -------------------
+# Endpoint admin: hot reload artefak model
+# -------------------
+def admin_authorized():
+    # Tanpa CHATBOT_ADMIN_TOKEN endpoint admin selalu ditolak
+    token = os.environ.get("CHATBOT_ADMIN_TOKEN")
+    if not token:
+        return False
+    return hmac.compare_digest(request.headers.get("X-Admin-Token", "").encode(), token.encode())
+
+
+@app.route("/admin/reload", methods=["POST"])
+async def admin_reload():
+    if not admin_authorized():
+        return jsonify({"status": "error", "message": "Tidak diizinkan"}), 403
+    force = request.args.get("force") == "1"
+    try:
+        swapped = await run_in(cpu_executor, artifacts.reload, force)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e), "artifacts": artifacts.stats()}), 500
+    return jsonify({"status": "success", "reloaded": swapped, "artifacts": artifacts.stats()})
+
+
+@app.route("/admin/version", methods=["GET"])
+async def admin_version():
+    return jsonify(artifacts.stats())
+
+
+# -------------------
+# Endpoint prediksi gambar
+# -------------------
+@app.route("/predict_image", methods=["POST"])
+async def predict_image_endpoint():
+    if VISION_MODE == "off":
+        return jsonify({"status": "error", "message": "Prediksi gambar dinonaktifkan di server ini"}), 503
+    # Slot dicek sebelum body dibaca: saat penuh, upload tidak ikut
+    # diterima + di-parse hanya untuk dijawab 503
+    if not image_limit.enter():
+        return overloaded()
+    try:
+        files = await request.files
+        if 'file' not in files:
+            return jsonify({"status": "error", "message": "Tidak ada file yang dikirim"}), 400
+        file = files['file']
+        if file.filename == '':
+            return jsonify({"status": "error", "message": "Nama file kosong"}), 400
+
+        options = predict_image.prediction_options(await request.values)
+        result = await run_in(
+            image_executor, predict_image.predict_food, file.stream, options["top_k"], options["threshold"]
+        )
+    finally:
+        image_limit.leave()
+
+    if "error" in result:
+        return jsonify({"status": "error", "message": result["error"]}), 500
+
+    return jsonify({"status": "success", "data": result})
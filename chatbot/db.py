@@ -0,0 +1,337 @@
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Nama variabel env sama dengan .env Laravel (ResepinAja-WebAPI)
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "localhost"),
+    "port": int(os.environ.get("DB_PORT", "3306")),
+    "user": os.environ.get("DB_USERNAME", "root"),
+    "password": os.environ.get("DB_PASSWORD", ""),
+    "database": os.environ.get("DB_DATABASE", "resepin_aja"),
+}
+POOL_SIZE = int(os.environ.get("CHATBOT_DB_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.environ.get("CHATBOT_DB_POOL_TIMEOUT", "5"))
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection:
+    """
+    Satu koneksi DB-API di dalam pool.
+
+    Query ditulis dengan placeholder %s (gaya MySQL); untuk driver qmark
+    (SQLite) placeholder diubah otomatis. Kalau `prepared=True`, cursor
+    prepared disimpan per teks SQL sehingga statement cukup di-prepare
+    sekali per koneksi.
+    """
+
+    def __init__(self, raw, prepared=False, paramstyle="format"):
+        self.raw = raw
+        self.prepared = prepared
+        self.paramstyle = paramstyle
+        self.broken = False
+        self._statements = {}
+
+    def _cursor(self, sql):
+        if not self.prepared:
+            return self.raw.cursor()
+        cursor = self._statements.get(sql)
+        if cursor is None:
+            cursor = self._statements[sql] = self.raw.cursor(prepared=True)
+        return cursor
+
+    def query(self, sql, params=()):
+        if self.paramstyle == "qmark":
+            sql = sql.replace("%s", "?")
+        cursor = self._cursor(sql)
+        try:
+            cursor.execute(sql, tuple(params))
+            columns = [d[0] for d in cursor.description or ()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            if not self.prepared:
+                cursor.close()
+
+    def close(self):
+        for cursor in self._statements.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._statements.clear()
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Pool koneksi kecil yang aman untuk banyak thread.
+
+    Setiap request meminjam koneksinya sendiri (checkout), koneksi yang
+    putus dibuang lalu dibuat ulang, dan waktu tunggu checkout dicatat.
+
+    Hanya error bertipe `retry_errors` yang lolos `retryable(exc)` (default:
+    semua) yang dianggap koneksi putus/terkunci; error SQL biasa langsung
+    diteruskan tanpa membuang koneksi.
+    """
+
+    def __init__(self, connect, size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 ping=None, retry_errors=(), prepared=False, paramstyle="format", retryable=None):
+        self._connect = connect
+        self._ping = ping
+        self.retry_errors = tuple(retry_errors)
+        self._retryable = retryable
+        self.prepared = prepared
+        self.paramstyle = paramstyle
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reconnects = 0
+        self._timeouts = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _should_retry(self, exc):
+        return isinstance(exc, self.retry_errors) and (self._retryable is None or self._retryable(exc))
+
+    def _new_connection(self):
+        conn = PooledConnection(self._connect(), prepared=self.prepared, paramstyle=self.paramstyle)
+        with self._lock:
+            self._created += 1
+        return conn
+
+    def _checkout(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeout(f"Tidak ada koneksi DB bebas dalam {self.timeout}s")
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+        if self._ping is not None:
+            try:
+                self._ping(conn.raw)
+            except Exception:
+                conn.close()
+                with self._lock:
+                    self._reconnects += 1
+                return self._new_connection()
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._checkout()
+        except PoolTimeout:
+            raise
+        except Exception:
+            self._slots.release()
+            raise
+        try:
+            yield conn
+        except self.retry_errors as e:
+            if self._should_retry(e):
+                conn.broken = True
+            raise
+        finally:
+            if conn.broken:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            self._slots.release()
+
+    def query(self, sql, params=()):
+        # Satu kali coba ulang dengan koneksi baru kalau koneksi lama putus
+        for attempt in (1, 2):
+            try:
+                with self.connection() as conn:
+                    return conn.query(sql, params)
+            except self.retry_errors as e:
+                if attempt == 2 or not self._should_retry(e):
+                    raise
+                with self._lock:
+                    self._reconnects += 1
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "created": self._created,
+                "checkouts": self._checkouts,
+                "reconnects": self._reconnects,
+                "timeouts": self._timeouts,
+                "wait_avg_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+class AsyncConnectionPool:
+    """
+    Pool koneksi untuk server ASGI (chatbot_asgi.py).
+
+    Membungkus pool driver async (aiomysql) dengan antarmuka yang sama
+    dengan ConnectionPool: `await pool.query(sql, params)` mengembalikan
+    list of dict, satu kali coba ulang kalau koneksi putus, plus stats().
+    """
+
+    def __init__(self, create, size=POOL_SIZE, timeout=POOL_TIMEOUT, cursor_class=None, retry_errors=()):
+        self._create = create
+        self.size = size
+        self.timeout = timeout
+        self.cursor_class = cursor_class
+        self.retry_errors = tuple(retry_errors)
+        self._pool = None
+        self._reconnects = 0
+        self._timeouts = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def open(self):
+        if self._pool is None:
+            self._pool = await self._create()
+        return self
+
+    async def _acquire(self):
+        # asyncio diimport di sini: chatbot_server (Flask) tidak memakainya
+        import asyncio
+
+        start = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(self._pool.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeout(f"Tidak ada koneksi DB bebas dalam {self.timeout}s") from None
+        waited = time.perf_counter() - start
+        self._checkouts += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    async def query(self, sql, params=()):
+        await self.open()
+        for attempt in (1, 2):
+            conn = await self._acquire()
+            try:
+                async with conn.cursor(self.cursor_class) as cursor:
+                    await cursor.execute(sql, tuple(params))
+                    return list(await cursor.fetchall())
+            except self.retry_errors:
+                # Koneksi putus: tutup supaya tidak dikembalikan ke pool
+                conn.close()
+                if attempt == 2:
+                    raise
+                self._reconnects += 1
+            finally:
+                self._pool.release(conn)
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "idle": self._pool.freesize if self._pool is not None else 0,
+            "checkouts": self._checkouts,
+            "reconnects": self._reconnects,
+            "timeouts": self._timeouts,
+            "wait_avg_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+            "wait_max_ms": round(self._wait_max * 1000, 3),
+        }
+
+
+def mysql_pool(size=POOL_SIZE, timeout=POOL_TIMEOUT, **config):
+    import mysql.connector
+    from mysql.connector import errors
+
+    config = {**DB_CONFIG, **config}
+    return ConnectionPool(
+        lambda: mysql.connector.connect(autocommit=True, **config),
+        size=size,
+        timeout=timeout,
+        ping=lambda raw: raw.ping(reconnect=False),
+        retry_errors=(errors.OperationalError, errors.InterfaceError),
+        prepared=True,
+    )
+
+
+# Pesan sqlite3 yang berarti koneksi/file bermasalah atau terkunci; error lain
+# dengan tipe yang sama (no such table, syntax error, ...) adalah salah SQL
+SQLITE_RETRY_MESSAGES = (
+    "database is locked",
+    "database table is locked",
+    "unable to open database file",
+    "disk i/o error",
+    "closed database",
+)
+
+
+def sqlite_retryable(exc):
+    message = str(exc).lower()
+    return any(m in message for m in SQLITE_RETRY_MESSAGES)
+
+
+def sqlite_pool(path, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+    # Pengganti MySQL untuk uji lokal; path harus file (bukan ":memory:")
+    import sqlite3
+
+    def connect():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.create_function("RAND", 0, random.random)
+        return conn
+
+    return ConnectionPool(
+        connect,
+        size=size,
+        timeout=timeout,
+        # ProgrammingError: "Cannot operate on a closed database" (koneksi putus)
+        retry_errors=(sqlite3.OperationalError, sqlite3.InterfaceError, sqlite3.ProgrammingError),
+        retryable=sqlite_retryable,
+        paramstyle="qmark",
+    )
+
+
+def aiomysql_pool(size=POOL_SIZE, timeout=POOL_TIMEOUT, **config):
+    import aiomysql
+
+    config = {**DB_CONFIG, **config}
+    config["db"] = config.pop("database")
+    return AsyncConnectionPool(
+        lambda: aiomysql.create_pool(minsize=1, maxsize=size, autocommit=True, pool_recycle=3600, **config),
+        size=size,
+        timeout=timeout,
+        cursor_class=aiomysql.DictCursor,
+        retry_errors=(aiomysql.OperationalError, aiomysql.InterfaceError),
+    )
@@ -9,7 +9,6 @@ Output  : confusion_matrix.png + laporan di terminal
 """
 
 import json
-import pickle
 import random
 import numpy as np
 import matplotlib
@@ -21,60 +20,36 @@ import os
 
 warnings.filterwarnings("ignore")
 
-from nltk.stem import WordNetLemmatizer
-from tensorflow.keras.models import load_model
 from sklearn.metrics import (
     confusion_matrix,
     classification_report,
     accuracy_score,
 )
-import nltk
+from artifacts import ENGINE, load_classifier
 
 # ─────────────────────────────────────────────
 # 1. Load model & artefak
 # ─────────────────────────────────────────────
-lemmatizer = WordNetLemmatizer()
-
-MODEL_PATH   = "model/model.h5"
 INTENTS_PATH = "dataset/intents.json"
-WORDS_PATH   = "model/words.pkl"
-CLASSES_PATH = "model/classes.pkl"
 
-model   = load_model(MODEL_PATH)
+classifier = load_classifier()
 intents = json.loads(open(INTENTS_PATH, encoding="utf-8").read())
-words   = pickle.load(open(WORDS_PATH, "rb"))
-classes = pickle.load(open(CLASSES_PATH, "rb"))
+encoder = classifier.encoder
+words   = encoder.words
+classes = classifier.classes
 
-print(f"[OK] Model dimuat  : {MODEL_PATH}")
+print(f"[OK] Model dimuat  : {classifier.backend.path} (engine: {ENGINE})")
 print(f"[OK] Jumlah kelas  : {len(classes)}")
 print(f"[OK] Jumlah kata   : {len(words)}")
 
 # ─────────────────────────────────────────────
 # 2. Fungsi NLP (sama persis dengan chatbot)
 # ─────────────────────────────────────────────
-def clean_up_sentence(sentence):
-    tokens = nltk.word_tokenize(sentence)
-    return [lemmatizer.lemmatize(w.lower()) for w in tokens]
-
-def bag_of_words(sentence):
-    sentence_words = clean_up_sentence(sentence)
-    bag = [0] * len(words)
-    for s in sentence_words:
-        for i, w in enumerate(words):
-            if w == s:
-                bag[i] = 1
-    return np.array(bag)
-
-def predict_class(sentence):
-    bow = bag_of_words(sentence)
-    res = model.predict(np.array([bow]), verbose=0)[0]
-    ERROR_THRESHOLD = 0.25
-    results = [[i, r] for i, r in enumerate(res) if r > ERROR_THRESHOLD]
-    results.sort(key=lambda x: x[1], reverse=True)
-    if not results:
-        top_i = int(np.argmax(res))
-        return classes[top_i]
-    return classes[results[0][0]]
+def predict_classes(sentences):
+    # Satu forward pass untuk semua kalimat (matriks BoW 2-D)
+    res = classifier.predict_batch(sentences)
+    # Kelas teratas selalu dipakai, baik di atas threshold maupun tidak
+    return [classes[int(i)] for i in np.argmax(res, axis=1)]
 
 # ─────────────────────────────────────────────
 # 3. Dataset uji BARU (kalimat yang TIDAK ADA di intents.json)
@@ -237,7 +212,7 @@ print(f"[OK] Data uji baru (unseen)    : {len(X_unseen)} sampel")
 # ─────────────────────────────────────────────
 def run_predictions(X):
     print(f"[..] Prediksi {len(X)} sampel...", end="", flush=True)
-    preds = [predict_class(s) for s in X]
+    preds = predict_classes(X)
     print(" selesai.")
     return preds
 
@@ -0,0 +1,61 @@
+"""
+Ekspor bobot model intent (model.h5) ke model.npz
+==================================================
+Hasilnya dipakai inference.NumpyBackend (CHATBOT_ENGINE=numpy) sehingga server
+chatbot tidak perlu TensorFlow saat serving.
+
+Jalankan: python export_numpy.py [model.h5] [model.npz]
+"""
+
+import os
+import sys
+import numpy as np
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference.backends import ACTIVATIONS
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "model.h5")
+NPZ_PATH = os.path.join(os.path.dirname(__file__), "model", "model.npz")
+
+
+def export_numpy(model, out_path=NPZ_PATH):
+    kernels, biases, activations = [], [], []
+    for layer in model.layers:
+        if layer.__class__.__name__ == "Dropout":
+            continue  # tidak aktif saat inferensi
+        if layer.__class__.__name__ != "Dense":
+            raise ValueError(f"Layer {layer.name} ({layer.__class__.__name__}) tidak didukung")
+
+        activation = layer.activation.__name__
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Aktivasi '{activation}' pada layer {layer.name} tidak didukung")
+
+        kernel, bias = layer.get_weights()
+        kernels.append(kernel.astype(np.float32))
+        biases.append(bias.astype(np.float32))
+        activations.append(activation)
+
+    arrays = {"activations": np.array(activations)}
+    for i, (kernel, bias) in enumerate(zip(kernels, biases)):
+        arrays[f"kernel_{i}"] = kernel
+        arrays[f"bias_{i}"] = bias
+
+    # Tanpa kompresi (bisa di-mmap NumpyBackend) dan diganti lewat rename:
+    # worker yang masih me-map file lama tetap membaca inode lama
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    from tensorflow.keras.models import load_model
+
+    src = sys.argv[1] if len(sys.argv) > 1 else MODEL_PATH
+    dst = sys.argv[2] if len(sys.argv) > 2 else NPZ_PATH
+
+    out = export_numpy(load_model(src), dst)
+    print(f"[OK] Bobot diekspor --> {os.path.abspath(out)}")
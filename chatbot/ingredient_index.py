@@ -0,0 +1,182 @@
+import bisect
+import os
+from collections import defaultdict, namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+from refresher import AsyncPeriodicRefresher, PeriodicRefresher
+
+REFRESH_INTERVAL = float(os.environ.get("CHATBOT_INGREDIENT_REFRESH", "60"))
+# Setiap N refresh inkremental dilakukan rebuild penuh (menangkap update/delete)
+FULL_REBUILD_EVERY = int(os.environ.get("CHATBOT_INGREDIENT_FULL_REBUILD_EVERY", "10"))
+
+BAHAN_QUERY = """
+    SELECT br.id_bahan, br.id_resep, br.nama_bahan
+    FROM bahan_resep br
+    JOIN resep r ON r.id_resep = br.id_resep
+    WHERE br.id_bahan > %s
+"""
+
+EMPTY = np.empty(0, dtype=np.int64)
+
+Snapshot = namedtuple("Snapshot", ["by_name", "by_head", "names", "max_id_bahan", "rows"])
+EMPTY_SNAPSHOT = Snapshot(MappingProxyType({}), MappingProxyType({}), (), 0, 0)
+
+
+def head_word(nama_bahan):
+    # "telur ayam" -> "telur"; sama dengan `= 'telur' OR LIKE 'telur %'`
+    return nama_bahan.split(" ", 1)[0]
+
+
+def to_postings(ids):
+    return np.unique(np.fromiter(ids, dtype=np.int64))
+
+
+class IngredientIndex:
+    """
+    Inverted index bahan -> id_resep (posting list berupa array int terurut).
+
+    Dua kunci disimpan: nama bahan lengkap (lowercase) dan kata pertamanya,
+    sehingga "telur" cocok dengan "telur" maupun "telur ayam" tanpa LIKE.
+    Pencarian banyak bahan = irisan (AND) atau gabungan (OR) posting list.
+    """
+
+    def __init__(self, pool, refresh_interval=REFRESH_INTERVAL, full_rebuild_every=FULL_REBUILD_EVERY):
+        self.pool = pool
+        self.full_rebuild_every = full_rebuild_every
+        self.snapshot = EMPTY_SNAPSHOT
+        self._refreshes = 0
+        self.refresher = PeriodicRefresher(self.refresh, refresh_interval, name="ingredient-index")
+
+    # ---------------------
+    # Build & refresh
+    # ---------------------
+    def _fetch(self, after_id):
+        return self.pool.query(BAHAN_QUERY, (after_id,))
+
+    @staticmethod
+    def _group(rows):
+        by_name, by_head = defaultdict(list), defaultdict(list)
+        for r in rows:
+            name = (r["nama_bahan"] or "").strip().lower()
+            by_name[name].append(r["id_resep"])
+            by_head[head_word(name)].append(r["id_resep"])
+        return by_name, by_head
+
+    def _swap(self, by_name, by_head, max_id, rows):
+        # Satu assignment: pembaca melihat snapshot lama atau baru, tidak pernah campuran
+        self.snapshot = Snapshot(
+            MappingProxyType(by_name), MappingProxyType(by_head), tuple(sorted(by_name)), max_id, rows
+        )
+
+    def rebuild(self):
+        self.apply(self._fetch(0), full=True)
+
+    def _next_is_full(self):
+        self._refreshes += 1
+        return not self.snapshot.by_name or self._refreshes % self.full_rebuild_every == 0
+
+    def refresh(self):
+        full = self._next_is_full()
+        self.apply(self._fetch(0 if full else self.snapshot.max_id_bahan), full)
+
+    async def refresh_async(self, apool):
+        full = self._next_is_full()
+        self.apply(await apool.query(BAHAN_QUERY, (0 if full else self.snapshot.max_id_bahan,)), full)
+
+    def apply(self, rows, full):
+        if full:
+            by_name, by_head = self._group(rows)
+            self._swap(
+                {k: to_postings(v) for k, v in by_name.items()},
+                {k: to_postings(v) for k, v in by_head.items()},
+                max((r["id_bahan"] for r in rows), default=0),
+                len(rows),
+            )
+            return
+
+        # Inkremental: hanya baris baru (id_bahan > watermark)
+        if not rows:
+            return
+        new_name, new_head = self._group(rows)
+        old = self.snapshot
+        by_name, by_head = dict(old.by_name), dict(old.by_head)
+        for target, new in ((by_name, new_name), (by_head, new_head)):
+            for key, ids in new.items():
+                target[key] = np.union1d(target.get(key, EMPTY), to_postings(ids))
+        self._swap(
+            by_name,
+            by_head,
+            max(old.max_id_bahan, max(r["id_bahan"] for r in rows)),
+            old.rows + len(rows),
+        )
+
+    def start(self):
+        self.refresher.refresh()
+        self.refresher.start()
+
+    async def start_async(self, apool):
+        # Dipakai chatbot_asgi.py; apool = db.aiomysql_pool()
+        self.refresher = AsyncPeriodicRefresher(
+            lambda: self.refresh_async(apool), self.refresher.interval, name=self.refresher.name
+        )
+        await self.refresher.refresh()
+        self.refresher.start()
+
+    # ---------------------
+    # Lookup
+    # ---------------------
+    # `snapshot`: search() meneruskan satu snapshot ke semua lookup-nya,
+    # jadi satu pencarian tidak pernah mencampur index lama dan baru
+    def lookup(self, bahan, snapshot=None):
+        # Perilaku lama cari_resep_dari_bahan: kata pertama, exact atau "kata %"
+        snapshot = self.snapshot if snapshot is None else snapshot
+        words = bahan.strip().lower().split()
+        if not words:
+            return EMPTY
+        return snapshot.by_head.get(words[0], EMPTY)
+
+    def lookup_prefix(self, prefix, snapshot=None):
+        # "tel" -> semua nama bahan yang diawali "tel" (telur, telur ayam, ...)
+        snapshot = self.snapshot if snapshot is None else snapshot
+        prefix = prefix.strip().lower()
+        names = snapshot.names
+        start = bisect.bisect_left(names, prefix)
+        postings = []
+        for name in names[start:]:
+            if not name.startswith(prefix):
+                break
+            postings.append(snapshot.by_name[name])
+        if not postings:
+            return EMPTY
+        return np.unique(np.concatenate(postings))
+
+    def search(self, bahan_list, mode="and", prefix=False):
+        snapshot = self.snapshot  # baca sekali per request
+        lookup = self.lookup_prefix if prefix else self.lookup
+        postings = [lookup(b, snapshot) for b in bahan_list if b.strip()]
+        if not postings:
+            return EMPTY
+
+        if mode == "or":
+            return np.unique(np.concatenate(postings))
+
+        # AND: mulai dari posting list terpendek supaya irisan cepat mengecil
+        postings.sort(key=len)
+        result = postings[0]
+        for p in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, p, assume_unique=True)
+        return result
+
+    def stats(self):
+        snapshot = self.snapshot
+        return {
+            "rows": snapshot.rows,
+            "names": len(snapshot.by_name),
+            "heads": len(snapshot.by_head),
+            "max_id_bahan": snapshot.max_id_bahan,
+            **self.refresher.stats(),
+        }
@@ -0,0 +1,48 @@
+import os
+import re
+import time
+from functools import lru_cache
+
+import nltk
+from nltk.stem import WordNetLemmatizer
+
+# CHATBOT_TOKENIZER=regex -> tokenizer regex cepat (lihat cek_tokenizer.py)
+TOKENIZER_MODE = os.environ.get("CHATBOT_TOKENIZER", "nltk").lower()
+LEMMA_CACHE_SIZE = int(os.environ.get("CHATBOT_LEMMA_CACHE_SIZE", "8192"))
+
+# Kata (boleh bersambung '-' atau '\'', mis. "anak-anak") atau satu tanda baca
+TOKEN_RE = re.compile(r"\w+(?:[-']\w+)*|[^\w\s]")
+
+lemmatizer = WordNetLemmatizer()
+
+
+def warmup():
+    """
+    Muat korpus NLTK (Punkt + WordNet) di awal, bukan saat request pertama.
+    Mengembalikan lama warmup dalam detik.
+    """
+    start = time.perf_counter()
+    nltk.word_tokenize("warmup korpus")
+    lemmatizer.lemmatize("warmup")
+    return time.perf_counter() - start
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(word):
+    return lemmatizer.lemmatize(word.lower())
+
+
+def nltk_tokenize(sentence):
+    return nltk.word_tokenize(sentence)
+
+
+def regex_tokenize(sentence):
+    return TOKEN_RE.findall(sentence)
+
+
+TOKENIZERS = {"nltk": nltk_tokenize, "regex": regex_tokenize}
+
+
+def clean_up_sentence(sentence, mode=None):
+    tokenize = TOKENIZERS[mode or TOKENIZER_MODE]
+    return [lemmatize(word) for word in tokenize(sentence)]
@@ -0,0 +1,100 @@
+import os
+import random
+import re
+from collections import namedtuple
+from types import MappingProxyType
+
+from refresher import AsyncPeriodicRefresher, PeriodicRefresher
+
+WAKTU = ("pagi", "siang", "sore", "malam")
+EASY_MAX_WKT_MASAK = 15
+EASY_MAX_BAHAN = 4
+REFRESH_INTERVAL = float(os.environ.get("CHATBOT_RECOMMENDATION_REFRESH", "300"))
+
+RESEP_QUERY = """
+    SELECT r.id_resep, r.wkt_masak, r.ktg_masak, COUNT(br.id_bahan) AS jumlah_bahan
+    FROM resep r
+    LEFT JOIN bahan_resep br ON r.id_resep = br.id_resep
+    GROUP BY r.id_resep, r.wkt_masak, r.ktg_masak
+"""
+
+
+# Isi indeks yang dibaca request: tuple + mapping read-only, diganti utuh saat reload
+Snapshot = namedtuple("Snapshot", ["all_ids", "easy_ids"])
+EMPTY = Snapshot((), MappingProxyType({w: () for w in WAKTU}))
+
+LEADING_NUMBER_RE = re.compile(r"\s*[-+]?\d+(?:\.\d+)?")
+
+
+def as_number(value):
+    # wkt_masak bertipe string; tiru konversi MySQL ("10 menit" -> 10, "abc" -> 0)
+    if isinstance(value, (int, float)):
+        return value
+    match = LEADING_NUMBER_RE.match(str(value or ""))
+    return float(match.group()) if match else 0
+
+
+def is_easy(row, waktu):
+    # Sama dengan query lama: wkt_masak <= 15, ktg_masak LIKE %waktu%,
+    # minimal 1 dan maksimal 4 bahan (JOIN + HAVING COUNT <= 4)
+    return (
+        row["wkt_masak"] is not None
+        and as_number(row["wkt_masak"]) <= EASY_MAX_WKT_MASAK
+        and waktu in (row["ktg_masak"] or "").lower()
+        and 1 <= row["jumlah_bahan"] <= EASY_MAX_BAHAN
+    )
+
+
+class RecommendationIndex:
+    """
+    Indeks rekomendasi in-memory per waktu makan (pagi/siang/sore/malam).
+
+    Menggantikan `ORDER BY RAND() LIMIT 3` yang full scan + sort di setiap
+    pesan "rekomendasi". Data resep dimuat sekali dari DB dan di-refresh
+    berkala; pemilihan acak cukup random.sample pada list id.
+    """
+
+    def __init__(self, pool, refresh_interval=REFRESH_INTERVAL):
+        self.pool = pool
+        self.snapshot = EMPTY
+        self.refresher = PeriodicRefresher(self.reload, refresh_interval, name="recommendation-index")
+
+    def reload(self):
+        self.load(self.pool.query(RESEP_QUERY))
+
+    async def reload_async(self, apool):
+        # Varian untuk server ASGI (pool aiomysql, lihat db.aiomysql_pool)
+        self.load(await apool.query(RESEP_QUERY))
+
+    def load(self, rows):
+        all_ids = tuple(r["id_resep"] for r in rows)
+        easy_ids = {w: tuple(r["id_resep"] for r in rows if is_easy(r, w)) for w in WAKTU}
+        # Satu assignment: pembaca melihat snapshot lama atau baru, tidak pernah campuran
+        self.snapshot = Snapshot(all_ids, MappingProxyType(easy_ids))
+
+    def start(self):
+        self.refresher.refresh()
+        self.refresher.start()
+
+    async def start_async(self, apool):
+        # Server ASGI: refresh lewat aiomysql sebagai task di event loop
+        self.refresher = AsyncPeriodicRefresher(
+            lambda: self.reload_async(apool), self.refresher.interval, name=self.refresher.name
+        )
+        await self.refresher.refresh()
+        self.refresher.start()
+
+    def pick(self, waktu, easy=False, k=3):
+        snapshot = self.snapshot  # baca sekali per request
+        ids = snapshot.easy_ids.get(waktu, ()) if easy else snapshot.all_ids
+        if not ids:
+            ids = snapshot.all_ids  # fallback: acak dari semua resep
+        return random.sample(ids, min(k, len(ids)))
+
+    def stats(self):
+        snapshot = self.snapshot
+        return {
+            "total": len(snapshot.all_ids),
+            "easy": {w: len(ids) for w, ids in snapshot.easy_ids.items()},
+            **self.refresher.stats(),
+        }
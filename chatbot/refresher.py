@@ -0,0 +1,103 @@
+import threading
+import time
+
+
+class PeriodicRefresher:
+    """
+    Thread latar yang memanggil `refresh_fn` setiap `interval` detik.
+
+    Dipakai indeks in-memory yang datanya diambil dari DB. Error refresh
+    dicatat, bukan dilempar, supaya indeks lama tetap melayani request.
+    """
+
+    def __init__(self, refresh_fn, interval, name="refresher"):
+        self.refresh_fn = refresh_fn
+        self.interval = interval
+        self.name = name
+        self.refresh_count = 0
+        self.last_refresh = None
+        self.last_duration = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        start = time.perf_counter()
+        try:
+            self.refresh_fn()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"[{self.name}] Gagal refresh: {self.last_error}")
+            return False
+        self.last_duration = time.perf_counter() - start
+        self.last_refresh = time.time()
+        self.last_error = None
+        self.refresh_count += 1
+        return True
+
+    def start(self):
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "refresh_count": self.refresh_count,
+            "last_refresh": self.last_refresh,
+            "last_duration_ms": round(self.last_duration * 1000, 3) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+class AsyncPeriodicRefresher(PeriodicRefresher):
+    """
+    Versi asyncio dari PeriodicRefresher untuk server ASGI.
+
+    `refresh_fn` berupa coroutine function (mis. query lewat aiomysql),
+    dijalankan sebagai task di event loop, bukan di thread terpisah.
+    """
+
+    def __init__(self, refresh_fn, interval, name="refresher"):
+        super().__init__(refresh_fn, interval, name)
+        self._task = None
+
+    async def refresh(self):
+        start = time.perf_counter()
+        try:
+            await self.refresh_fn()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"[{self.name}] Gagal refresh: {self.last_error}")
+            return False
+        self.last_duration = time.perf_counter() - start
+        self.last_refresh = time.time()
+        self.last_error = None
+        self.refresh_count += 1
+        return True
+
+    def start(self):
+        # asyncio diimport di sini: chatbot_server (Flask) tidak memakainya
+        import asyncio
+
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name=self.name)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        import asyncio
+
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
@@ -0,0 +1,354 @@
+import re
+import random
+import datetime
+
+# =====================================================================
+# Tabel aturan routing get_response
+# Semua regex dan daftar kata kunci dikompilasi SEKALI saat import; setiap
+# pesan cukup dipindai satu kali untuk mengetahui semua aturan yang terpicu.
+# =====================================================================
+STOPWORDS = frozenset([
+    "aku", "saya", "punya", "bahan", "ada", "pakai", "gunakan",
+    "menggunakan", "dan", "dengan", "yang", "nih", "ini",
+])
+
+PARTS_RE = re.compile(r"[,\n]")
+WORD_RE = re.compile(r"[a-zA-Z0-9]+")
+LIST_SPLIT_RE = re.compile(r"\s*(?:dan|,|&)\s*")
+USER_RE = re.compile(r"(?:dari|oleh|milik)\s+([a-z0-9_\-\s, dan&]+)")
+BAHAN_RE = re.compile(
+    r"(?:yang\s+bahannya|yang\s+pakai|yang\s+menggunakan|pakai|punya|dengan)\s+([a-z0-9_\-\s, dan&]+)"
+)
+COMBO_RANGE_RE = re.compile(r"rating\s*(\d+)\s*[-–]\s*(\d+)")
+RATING_UP_RE = re.compile(
+    r"rating\s*(\d+)\s*(?:ke\s*atas|keatas|minimal|minimalnya|lebih\s*dari|>)|\brating\s*(\d+)\s*\+"
+)
+RATING_ABOVE_RE = re.compile(r"rating\s*di\s*atas\s*(\d+)")
+RATING_RANGE_RE = re.compile(r"rating\s*(\d+)\s*-\s*(\d+)")
+RESEP_RE = re.compile(r"(?:aku mau resep|resep|punya resep|resep buatan)\s+(.+)")
+
+KATEGORI = {
+    "makanan ringan": "Makanan Ringan",
+    "makanan berat": "Makanan Berat",
+    "minuman": "Minuman",
+    "snack": "Snack",
+    "dessert": "Dessert",
+}
+WAKTU = ("pagi", "siang", "sore", "malam")
+
+# nama aturan -> kata kunci (cocok kalau salah satu muncul sebagai substring).
+# Aturan "user", "frasa_bahan", "rating" dan "resep" adalah syarat perlu
+# regex di atas: regex hanya dijalankan kalau kata kuncinya ada di pesan.
+KEYWORD_RULES = {
+    "user": ("dari", "oleh", "milik"),
+    "frasa_bahan": ("bahan", "pakai", "punya", "dengan", "menggunakan"),
+    "resep": ("resep",),
+    "bahan_langsung": ("ayam", "telur", "bawang", "tahu", "tempe", "daging", "ikan"),
+    "terenak": ("terenak", "terbaik", "paling enak"),
+    "rating_tinggi": ("rating tinggi", "terbaik", "bintang tinggi", "terfavorit"),
+    "rating_terendah": ("rating terendah",),
+    "sebut_bahan": ("punya", "bahan", "ada", "pakai", "menggunakan"),
+    "rating": ("rating",),
+    "kategori": tuple(KATEGORI),
+    "cepat": ("tercepat", "waktu cepat", "masak cepat", "cepat"),
+    "lama": ("terlama", "lama", "waktu lama", "masak lama"),
+    "rekomendasi": ("rekomendasi", "saran", "makan apa", "dimakan", "siang", "malam", "pagi"),
+    "waktu": WAKTU,
+    "mudah": ("mudah", "gampang"),
+}
+
+
+def trie_pattern(keywords):
+    # Regex berbentuk trie: "rating(?:\ t(?:erendah|inggi))?" dst. Cabang di
+    # setiap simpul beda huruf pertama dan bagian opsional bersifat greedy,
+    # jadi yang tertangkap selalu kata kunci TERPANJANG di posisi itu.
+    trie = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Pencocok banyak kata kunci sekaligus dengan satu regex (trie alternation).
+
+    Di setiap posisi regex mengambil kata kunci TERPANJANG yang cocok; kata
+    kunci lain yang mulai di posisi yang sama pasti prefiksnya, jadi ikut
+    ditambahkan dari tabel prefiks. Hasilnya sama dengan `kw in text` untuk
+    setiap kata kunci, tapi teks hanya dipindai sekali.
+    """
+
+    def __init__(self, rules):
+        rules_of = {}
+        for rule, keywords in rules.items():
+            for kw in keywords:
+                rules_of.setdefault(kw, set()).add(rule)
+
+        self.pattern = re.compile("(?=(" + trie_pattern(rules_of) + "))")
+        # kata kunci terpanjang -> (semua kata kunci prefiksnya, semua aturannya)
+        self.closure = {}
+        for kw in rules_of:
+            prefixes = frozenset(k for k in rules_of if kw.startswith(k))
+            self.closure[kw] = (prefixes, frozenset().union(*(rules_of[k] for k in prefixes)))
+
+    def scan(self, text):
+        keywords, rules = set(), set()
+        for kw in set(self.pattern.findall(text)):
+            prefixes, kw_rules = self.closure[kw]
+            keywords |= prefixes
+            rules |= kw_rules
+        return RuleHits(keywords, rules)
+
+
+class RuleHits:
+    def __init__(self, keywords, rules):
+        self.keywords = keywords
+        self.rules = rules
+
+    def __contains__(self, rule):
+        return rule in self.rules
+
+
+keyword_matcher = KeywordMatcher(KEYWORD_RULES)
+
+
+def match_rules(text):
+    return keyword_matcher.scan(text)
+
+
+# ---------------------
+# Ekstraksi bahan dari kalimat
+# ---------------------
+def extract_ingredients_from_message(msg):
+    # Contoh input: "aku punya telur, bawang putih dan ayam"
+    bahan_list = []
+    for part in PARTS_RE.split(msg.lower()):
+        words = [w for w in WORD_RE.findall(part) if w not in STOPWORDS]
+        if words:
+            bahan_list.append(" ".join(words))  # contoh: "bawang putih"
+    return bahan_list
+
+
+# ---------------------
+# Parser kombinasi kompleks: users, bahan, rating, kata khusus (terenak)
+# ---------------------
+def parse_combination_filters(msg, hits=None):
+    """
+    Mengembalikan dict dengan kunci opsional:
+      - users: list of usernames (strings)
+      - bahan: list of bahan (strings)
+      - min_rating: int
+      - max_rating: int
+      - sort: 'rating_desc' atau lainnya
+    """
+    out = {
+        "users": [],
+        "bahan": [],
+        "min_rating": None,
+        "max_rating": None,
+        "sort": None,
+    }
+
+    text = msg.lower()
+    if hits is None:
+        hits = match_rules(text)
+
+    # 1) Cari frasa user: "dari fikri dan athar", "dari fikri, athar"
+    user_match = "user" in hits and USER_RE.search(text)
+    if user_match:
+        users = LIST_SPLIT_RE.split(user_match.group(1))
+        out["users"] = [u.strip() for u in users if u.strip()]
+
+    # 2) Cari bahan: patterns after 'yang bahannya', 'yang bahannya ayam', 'pakai', 'punya'
+    bahan_match = "frasa_bahan" in hits and BAHAN_RE.search(text)
+    if bahan_match:
+        bahan_list = LIST_SPLIT_RE.split(bahan_match.group(1))
+        out["bahan"] = [b.strip() for b in bahan_list if b.strip()]
+    elif "bahan_langsung" in hits:
+        # fallback: kata 'ayam', 'telur' disebut langsung tanpa kata kunci
+        ext = extract_ingredients_from_message(text)
+        if ext:
+            out["bahan"] = ext
+
+    # 3) Rating: "rating 4 ke atas", "rating minimal 3", "rating 3-5", "rating 4+"
+    range_match = "rating" in hits and COMBO_RANGE_RE.search(text)
+    if range_match:
+        out["min_rating"] = int(range_match.group(1))
+        out["max_rating"] = int(range_match.group(2))
+    elif "rating" in hits:
+        up_match = RATING_UP_RE.search(text)
+        if up_match:
+            # group may have None
+            val = up_match.group(1) or up_match.group(2)
+            if val:
+                out["min_rating"] = int(val)
+                out["max_rating"] = 5
+
+        # pola 'rating di atas X' (strict greater than)
+        above_match = RATING_ABOVE_RE.search(text)
+        if above_match:
+            out["min_rating"] = int(above_match.group(1)) + 1
+            out["max_rating"] = 5
+
+    # 4) Kata kunci 'terenak' atau 'terbaik' -> prioritaskan rating tinggi
+    if "terenak" in hits:
+        # set minimal rating 4 sebagai default jika belum ada rating
+        if not out["min_rating"]:
+            out["min_rating"] = 4
+        out["sort"] = "rating_desc"
+
+    return out
+
+
+# ---------------------
+# Respon utama chatbot
+# ---------------------
+def get_response(ints, intents_json, user_message, recommend):
+    """
+    `recommend(waktu, easy=...)` mengembalikan list id_resep untuk cabang
+    rekomendasi (lihat RecommendationIndex.pick).
+    """
+    msg_lower = user_message.lower()
+    hits = match_rules(msg_lower)
+
+    # 1) Cek kombinasi kompleks dulu (users, bahan, rating, sort)
+    combo = parse_combination_filters(msg_lower, hits)
+    if combo["users"] or combo["bahan"] or combo["min_rating"] or combo["max_rating"]:
+        params = [("user_resep[]", u) for u in combo["users"]]
+
+        # Bersihkan kata-kata umum & ekstrak bahan utama
+        cleaned_bahan = []
+        for b in combo["bahan"]:
+            cleaned_bahan.extend(extract_ingredients_from_message(b))
+        if cleaned_bahan:
+            params.append(("cari_bahan", ",".join(cleaned_bahan)))
+
+        if combo["min_rating"] is not None:
+            params.append(("min_rating", str(combo["min_rating"])))
+        if combo["max_rating"] is not None:
+            params.append(("max_rating", str(combo["max_rating"])))
+        if combo["sort"]:
+            params.append(("sort", combo["sort"]))
+
+        query = "&".join(f"{k}={v.replace(' ', '%20')}" for k, v in params)
+        if not query:
+            return {"type": "text", "message": "Maaf, saya tidak menemukan filter yang valid."}
+
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep sesuai kombinasi filter kamu... 🍽️",
+            "url": f"http://localhost:8000/resepcari?{query}",
+        }
+
+    # 2) Cek rating range spesifik: "rating 2-4"
+    rating_range_match = "rating" in hits and RATING_RANGE_RE.search(msg_lower)
+    if rating_range_match:
+        start, end = int(rating_range_match.group(1)), int(rating_range_match.group(2))
+        rating_query = "&".join([f"rating[]={r}" for r in range(start, end + 1)])
+        return {
+            "type": "redirect",
+            "message": f"Menampilkan resep dengan rating {start}-{end} ⭐",
+            "url": f"http://localhost:8000/resepcari?{rating_query}",
+        }
+
+    # 3) Cek rating tinggi / terendah
+    if "rating_tinggi" in hits:
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan rating tinggi (3-5) 🌟",
+            "url": "http://localhost:8000/resepcari?sort=rating_desc&min_rating=3&max_rating=5",
+        }
+
+    if "rating_terendah" in hits:
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan rating terendah (0-2) 🌟",
+            "url": "http://localhost:8000/resepcari?rating_lowest=1",
+        }
+
+    # 4) Cek bahan yang disebut (pastikan bukan rating)
+    if "sebut_bahan" in hits and "rating" not in hits:
+        bahan = extract_ingredients_from_message(msg_lower)
+        if bahan:
+            return {
+                "type": "redirect",
+                "message": f"Mencarikan resep dengan bahan: {', '.join(bahan)}...",
+                "url": f"http://localhost:8000/resepcari?cari_bahan={','.join(bahan)}",
+            }
+
+    # 5) Cek kategori (minuman, snack, dessert, dll) -- urutan KATEGORI dipertahankan
+    if "kategori" in hits:
+        for kw, ktg in KATEGORI.items():
+            if kw in hits.keywords:
+                return {
+                    "type": "redirect",
+                    "message": f"Menampilkan resep kategori {ktg} 🍽️",
+                    "url": f"http://localhost:8000/resepcari?ktg_masak[]={ktg}",
+                }
+
+    # 6) Cek waktu memasak tercepat / terlama
+    if "cepat" in hits:
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan waktu memasak tercepat (0-15 menit) ⏱️",
+            "url": "http://localhost:8000/resepcari?tgl_masak[]=cepat",
+        }
+
+    if "lama" in hits:
+        return {
+            "type": "redirect",
+            "message": "Menampilkan resep dengan waktu memasak terlama (>15 menit) ⏳",
+            "url": "http://localhost:8000/resepcari?tgl_masak[]=lama",
+        }
+
+    # 7) Cek rekomendasi (pagi, malam, mudah, random)
+    if "rekomendasi" in hits:
+        waktu = next((w for w in WAKTU if w in hits.keywords), None)
+        if waktu is None:
+            current_hour = datetime.datetime.now().hour
+            if 5 <= current_hour < 7:
+                waktu = "pagi"
+            elif 11 <= current_hour < 15:
+                waktu = "siang"
+            elif 15 <= current_hour < 18:
+                waktu = "sore"
+            else:
+                waktu = "malam"
+
+        resep_ids = ",".join(str(i) for i in recommend(waktu, easy="mudah" in hits))
+        return {
+            "type": "redirect",
+            "message": f"Berikut rekomendasi resep {waktu} 🍳",
+            "url": f"http://localhost:8000/resepcari?ids={resep_ids}",
+        }
+
+    # 8) Nama resep spesifik
+    resep_match = "resep" in hits and RESEP_RE.search(msg_lower)
+    if resep_match:
+        nama_resep = resep_match.group(1).strip()
+        return {
+            "type": "redirect",
+            "message": f"Menampilkan resep '{nama_resep}'...",
+            "url": f"http://localhost:8000/resepcari?cari_resep={nama_resep}",
+        }
+
+    # 9) NLP fallback
+    if ints:
+        tag = ints[0]["intent"]
+        for i in intents_json["intents"]:
+            if i["tag"] == tag:
+                return {"type": "text", "message": random.choice(i["responses"])}
+
+    # Default
+    return {"type": "text", "message": "Maaf, saya tidak mengerti maksud Anda."}
@@ -1,23 +1,16 @@
 import json
 import numpy as np
-import pickle
-from nltk.stem import WordNetLemmatizer
-from tensorflow.keras.models import load_model
 from sklearn.metrics import accuracy_score, precision_score, classification_report
+from artifacts import load_classifier
+from preprocessing import lemmatize
 
 # --- Load data dan model ---
 with open('dataset/intents.json', 'r', encoding='utf-8') as f:
     intents = json.load(f)
 
-with open('model/words.pkl', 'rb') as f:
-    words = pickle.load(f)
-
-with open('model/classes.pkl', 'rb') as f:
-    classes = pickle.load(f)
-
-model = load_model('model/model.h5')
-
-lemmatizer = WordNetLemmatizer()
+classifier = load_classifier()
+encoder = classifier.encoder
+classes = classifier.classes
 
 # --- Siapkan data evaluasi ---
 documents = []
@@ -27,23 +20,16 @@ for intent in intents['intents']:
         documents.append((tokenized, intent['tag']))
 
 # membuat bag of words
-X = []
+X = np.zeros((len(documents), len(encoder)), dtype=np.float32)
 y_true = []
 
-for (pattern_words, tag) in documents:
-    bag = []
-    word_patterns = [lemmatizer.lemmatize(w.lower()) for w in pattern_words]
-
-    for w in words:
-        bag.append(1 if w in word_patterns else 0)
-
-    X.append(bag)
+for row, (pattern_words, tag) in enumerate(documents):
+    word_patterns = [lemmatize(w) for w in pattern_words]
+    encoder.encode_tokens(word_patterns, out=X[row])
     y_true.append(classes.index(tag))
 
-X = np.array(X)
-
 # --- Prediksi menggunakan model ---
-pred = model.predict(X)
+pred = classifier.predict_encoded(X)
 y_pred = np.argmax(pred, axis=1)
 
 # --- Hitung Accuracy & Precision ---
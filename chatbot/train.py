@@ -8,6 +8,7 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Dropout
 from tensorflow.keras.layers import Input
 from tensorflow.keras.optimizers import SGD  # gunakan legacy SGD
+from export_numpy import export_numpy
 
 nltk.download('punkt')  # pastikan tokenizer NLTK tersedia
 
@@ -73,6 +74,7 @@ hist = model.fit(train_x, train_y, epochs=200, batch_size=5, verbose=1)
 
 # --- Simpan model dan data ---
 model.save('model/model.h5')
+export_numpy(model, 'model/model.npz')  # untuk CHATBOT_ENGINE=numpy
 
 with open('model/words.pkl', 'wb') as f:
     pickle.dump(words, f)
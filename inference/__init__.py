@@ -0,0 +1,36 @@
+"""
+Lapisan inferensi bersama untuk server chatbot dan server vision.
+
+Backend (Keras, NumPy, TFLite) bisa ditukar tanpa mengubah pemanggil;
+setiap forward pass memanggil timing hook yang terdaftar.
+
+IngredientClassifier diimport saat pertama diakses: worker chatbot yang
+hanya melayani teks tidak ikut memuat PIL dan decoder gambar.
+"""
+
+from .backends import BACKENDS, KerasBackend, NumpyBackend, TFLiteBackend, load_backend
+from .intent import IntentClassifier
+from .startup import StartupTimeline
+from .timing import Timing, TimingStats, add_timing_hook, remove_timing_hook
+
+__all__ = [
+    "BACKENDS",
+    "IngredientClassifier",
+    "IntentClassifier",
+    "KerasBackend",
+    "NumpyBackend",
+    "StartupTimeline",
+    "TFLiteBackend",
+    "Timing",
+    "TimingStats",
+    "add_timing_hook",
+    "load_backend",
+    "remove_timing_hook",
+]
+
+
+def __getattr__(name):
+    if name == "IngredientClassifier":
+        from .ingredient import IngredientClassifier
+        return IngredientClassifier
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
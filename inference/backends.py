@@ -0,0 +1,202 @@
+import struct
+import threading
+import zipfile
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+
+# ---------------------
+# Keras
+# ---------------------
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, path):
+        from tensorflow.keras.models import load_model
+
+        self.path = path
+        self.model = load_model(path)
+
+    def predict_on_batch(self, x):
+        return np.asarray(self.model.predict_on_batch(x))
+
+
+# ---------------------
+# NumPy (MLP intent tanpa TensorFlow)
+# ---------------------
+def relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def softmax(x):
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def linear(x):
+    return x
+
+
+ACTIVATIONS = {"relu": relu, "softmax": softmax, "linear": linear}
+
+
+def mmap_npz(path):
+    """
+    Array di .npz tanpa kompresi (np.savez) sebagai np.memmap read-only.
+
+    Halaman bobot diambil dari page cache, jadi beberapa worker yang memuat
+    file yang sama berbagi satu salinan fisik. File harus diganti dengan
+    rename (lihat export_numpy.py), bukan ditimpa, selama masih di-map.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} di {path} terkompresi, tidak bisa di-mmap")
+            # Header lokal zip: 30 byte tetap + nama file + extra field
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = npy_format.read_magic(f)
+            read_header = npy_format.read_array_header_1_0 if version == (1, 0) else npy_format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(f)
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename} berisi objek Python")
+            arrays[info.filename.removesuffix(".npy")] = np.memmap(
+                path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order="F" if fortran_order else "C"
+            )
+    return arrays
+
+
+class NumpyBackend:
+    """
+    Forward pass MLP (Dense-Dense-Dense) hanya dengan NumPy.
+
+    Bobot dibaca dari .npz hasil chatbot/export_numpy.py, jadi server tidak
+    perlu memuat TensorFlow untuk tiga perkalian matriks. Dropout tidak
+    ikut diekspor karena tidak aktif saat inferensi.
+    """
+
+    name = "numpy"
+
+    def __init__(self, layers, path=None):
+        # layers: list of (kernel, bias, nama_aktivasi)
+        self.path = path
+        self.layers = [
+            (np.ascontiguousarray(w, dtype=np.float32), np.asarray(b, dtype=np.float32), ACTIVATIONS[act])
+            for w, b, act in layers
+        ]
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        if mmap:
+            data = mmap_npz(path)
+        else:
+            with np.load(path, allow_pickle=False) as npz:
+                data = {k: npz[k] for k in npz.files}
+        activations = [str(a) for a in data["activations"]]
+        layers = [
+            (data[f"kernel_{i}"], data[f"bias_{i}"], act)
+            for i, act in enumerate(activations)
+        ]
+        return cls(layers, path)
+
+    @property
+    def input_dim(self):
+        return self.layers[0][0].shape[0]
+
+    def predict_on_batch(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[np.newaxis, :]
+        for w, b, act in self.layers:
+            x = act(x @ w + b)
+        return x
+
+
+# ---------------------
+# TFLite
+# ---------------------
+def make_interpreter(model_path, num_threads=None, xnnpack=True):
+    # tflite_runtime (paket kecil, tanpa TensorFlow) kalau ada, kalau tidak tf.lite
+    try:
+        from tflite_runtime.interpreter import Interpreter, OpResolverType
+    except ImportError:
+        from tensorflow.lite import Interpreter
+        from tensorflow.lite.experimental import OpResolverType
+    # model_path (bukan model_content): flatbuffer di-mmap, bukan disalin ke heap.
+    # XNNPACK menyusun ulang bobot ke memori privat tiap proses; tanpa XNNPACK
+    # kernel bawaan membaca bobot langsung dari file yang di-mmap.
+    resolver = OpResolverType.AUTO if xnnpack else OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+    return Interpreter(model_path=model_path, num_threads=num_threads, experimental_op_resolver_type=resolver)
+
+
+class TFLiteBackend:
+    """
+    Interpreter TFLite dengan antarmuka `predict_on_batch`.
+
+    Interpreter berbentuk tetap dan tidak thread-safe, jadi dibuat satu
+    interpreter (dengan lock) per ukuran batch yang pernah dipakai.
+    Input/output terkuantisasi (int8/uint8) dikonversi otomatis.
+    """
+
+    name = "tflite"
+
+    def __init__(self, path, num_threads=None, xnnpack=True):
+        self.path = path
+        self.num_threads = num_threads
+        self.xnnpack = xnnpack
+        self._interpreters = {}
+        self._lock = threading.Lock()
+        self._interpreter(1)  # gagal lebih awal kalau file tidak valid
+
+    def _interpreter(self, batch_size):
+        with self._lock:
+            entry = self._interpreters.get(batch_size)
+            if entry is None:
+                interpreter = make_interpreter(self.path, self.num_threads, self.xnnpack)
+                detail = interpreter.get_input_details()[0]
+                interpreter.resize_tensor_input(detail["index"], [batch_size, *detail["shape"][1:]])
+                interpreter.allocate_tensors()
+                entry = self._interpreters[batch_size] = (interpreter, threading.Lock())
+            return entry
+
+    @staticmethod
+    def _quantize(x, detail):
+        scale, zero_point = detail["quantization"]
+        if not scale:
+            return x.astype(detail["dtype"], copy=False)
+        info = np.iinfo(detail["dtype"])
+        return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(detail["dtype"])
+
+    @staticmethod
+    def _dequantize(y, detail):
+        scale, zero_point = detail["quantization"]
+        if not scale:
+            return y.astype(np.float32, copy=False)
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def predict_on_batch(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        interpreter, lock = self._interpreter(len(x))
+        input_detail = interpreter.get_input_details()[0]
+        output_detail = interpreter.get_output_details()[0]
+        with lock:
+            interpreter.set_tensor(input_detail["index"], self._quantize(x, input_detail))
+            interpreter.invoke()
+            y = interpreter.get_tensor(output_detail["index"])
+        return self._dequantize(y, output_detail)
+
+
+BACKENDS = {"keras": KerasBackend, "numpy": NumpyBackend.load, "tflite": TFLiteBackend}
+
+
+def load_backend(kind, path, **options):
+    """kind: keras | numpy | tflite (varian seperti "tflite-int8" ikut "tflite")."""
+    kind = kind.split("-", 1)[0]
+    if kind not in BACKENDS:
+        raise ValueError(f"Backend '{kind}' tidak dikenal (pilihan: {', '.join(BACKENDS)})")
+    return BACKENDS[kind](path, **options)
@@ -0,0 +1,161 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import Image
+
+IMG_SIZE = (224, 224)
+# load_img Keras memakai "nearest"; setelah draft gambar tinggal <= 2x target,
+# bilinear di sini lebih halus dan hampir sama murahnya
+RESAMPLE = Image.BILINEAR
+
+
+def open_image(source):
+    # source: path, bytes, atau file-like
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return Image.open(source)
+
+
+def dummy_jpeg(size=(640, 480)):
+    # Gambar kecil untuk warmup decoder (plugin JPEG PIL dimuat saat pertama dipakai)
+    buf = io.BytesIO()
+    Image.new("RGB", size, (128, 128, 128)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def decode_pixels(source, size=IMG_SIZE):
+    """
+    Decode gambar ke array uint8 (H, W, 3) berukuran `size`.
+
+    Untuk JPEG dipakai draft mode: libjpeg langsung men-decode pada skala
+    1/2, 1/4 atau 1/8 (DCT scaling) sehingga foto 12 MP tidak pernah
+    di-decode penuh. Skala yang dipilih adalah yang terkecil tapi masih
+    >= `size`, baru setelah itu di-resize ke ukuran akhir.
+    """
+    img = open_image(source)
+    if img.format == "JPEG":
+        img.draft("RGB", size)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    if img.size != size:
+        img = img.resize(size, RESAMPLE)
+    return np.asarray(img)
+
+
+def decode_image(source, size=IMG_SIZE, out=None):
+    """
+    Decode gambar (decode_pixels) ke array float32 (H, W, 3) skala 0..1.
+    Kalau `out` diberikan (mis. satu baris BatchBuffer), hasil ditulis ke sana.
+    """
+    pixels = decode_pixels(source, size)
+    if out is None:
+        out = np.empty(pixels.shape, dtype=np.float32)
+    np.divide(pixels, np.float32(255.0), out=out)
+    return out
+
+
+class BatchBuffer:
+    """
+    Buffer batch float32 (N, H, W, 3) yang dipakai ulang antar request.
+
+    Gambar di-decode langsung ke barisnya masing-masing, jadi tidak ada
+    array per gambar + np.stack. Kapasitas tumbuh (pangkat dua) kalau
+    batch lebih besar dari yang pernah dilihat, tapi tidak pernah melebihi
+    `max_capacity` (kalau diberikan).
+    """
+
+    def __init__(self, capacity=1, size=IMG_SIZE, max_capacity=None):
+        self.size = size
+        self.max_capacity = max_capacity
+        self.array = np.zeros((capacity, size[1], size[0], 3), dtype=np.float32)
+
+    def ensure(self, n):
+        if self.max_capacity is not None and n > self.max_capacity:
+            raise ValueError(f"Batch {n} gambar melebihi kapasitas buffer {self.max_capacity}")
+        if n > len(self.array):
+            capacity = 1 << (n - 1).bit_length()
+            if self.max_capacity is not None:
+                capacity = min(capacity, self.max_capacity)
+            self.array = np.zeros((capacity,) + self.array.shape[1:], dtype=np.float32)
+        return self.array
+
+    def decode(self, sources, decode_fn=decode_image):
+        """
+        Decode `sources` ke baris 0..k-1 (k = jumlah gambar yang berhasil).
+        `decode_fn(source, size, out=...)` bisa diganti, mis. decoder Keras.
+
+        Mengembalikan (batch, posisi, errors): `batch` adalah view
+        self.array[:k], `posisi[j]` = indeks input untuk baris j, dan
+        `errors` = {indeks input: pesan} untuk gambar yang gagal dibaca.
+        """
+        array = self.ensure(len(sources))
+        positions, errors = [], {}
+        for i, source in enumerate(sources):
+            row = len(positions)
+            try:
+                decode_fn(source, self.size, out=array[row])
+            except Exception as e:
+                errors[i] = f"Gagal membaca gambar: {e}"
+                continue
+            positions.append(i)
+        return array[:len(positions)], positions, errors
+
+
+# Jumlah buffer menganggur yang disimpan per pool
+BUFFER_POOL_SIZE = int(os.environ.get("VISION_BUFFER_POOL", "4"))
+
+
+class BufferPool:
+    """
+    Pool kecil BatchBuffer yang dipinjam per request.
+
+    Server Flask threaded membuat thread baru per request, jadi buffer
+    per thread tidak pernah dipakai ulang; di sini buffer dikembalikan ke
+    pool setelah request selesai. Kapasitas tiap buffer dibatasi
+    `max_capacity` (ukuran batch forward pass) dan paling banyak `size`
+    buffer menganggur yang disimpan, jadi memori tetap terbatas berapa pun
+    jumlah gambar per upload.
+    """
+
+    def __init__(self, max_capacity, size=BUFFER_POOL_SIZE, img_size=IMG_SIZE):
+        self.max_capacity = max_capacity
+        self.size = size
+        self.img_size = img_size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def borrow(self):
+        with self._lock:
+            buffer = self._idle.pop() if self._idle else None
+        if buffer is None:
+            buffer = BatchBuffer(size=self.img_size, max_capacity=self.max_capacity)
+        try:
+            yield buffer
+        finally:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append(buffer)
+
+
+def decode_keras(source, size=IMG_SIZE, out=None):
+    # Jalur lama: decode resolusi penuh lalu resize (nearest) oleh load_img
+    from tensorflow.keras.preprocessing import image
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    elif hasattr(source, "read") and not isinstance(source, io.BytesIO):
+        source = io.BytesIO(source.read())  # load_img hanya menerima path / BytesIO
+    img = image.load_img(source, target_size=size)
+    arr = image.img_to_array(img) / 255.0
+    if out is None:
+        return arr
+    out[...] = arr
+    return out
+
+
+# fast = draft mode JPEG + buffer batch, keras = load_img penuh (pembanding)
+DECODERS = {"fast": decode_image, "keras": decode_keras}
@@ -0,0 +1,146 @@
+import os
+import time
+
+import numpy as np
+
+from .backends import load_backend
+from .image_preprocessing import DECODERS, BufferPool, dummy_jpeg
+from .timing import timed
+
+# Nama file model per engine di vision_model/model/
+MODEL_FILES = {
+    "keras": "efficientnetb0_final.keras",
+    "tflite-dynamic": "efficientnetb0_dynamic.tflite",
+    "tflite-int8": "efficientnetb0_int8.tflite",
+}
+CLASS_NAMES = ['Bawang_bombai', 'alpukat', 'ayam', 'bawang_merah', 'bawang_putih',
+               'bayam', 'cabai', 'daun_bawang', 'daun_jeruk', 'jagung', 'jahe',
+               'kacang_hitam', 'keluwak', 'kembang_turi', 'kemiri', 'kentang', 'kunyit',
+               'lemon', 'lengkuas', 'madu', 'mentega', 'paprika', 'santan', 'serai',
+               'telur', 'terong', 'timun', 'tomat', 'wortel']
+BATCH_SIZE = 16
+
+
+def bucket_size(n, max_size=BATCH_SIZE):
+    size = 1
+    while size < n and size < max_size:
+        size *= 2
+    return min(size, max_size)
+
+
+def top_k_classes(probs, k):
+    """
+    probs (N, kelas) -> (indeks, probabilitas) k kelas teratas per baris,
+    urut menurun. argpartition sekaligus untuk seluruh batch (O(N x kelas)),
+    yang diurutkan hanya k kolom hasilnya.
+    """
+    probs = np.asarray(probs)
+    k = max(1, min(k, probs.shape[1]))
+    if k < probs.shape[1]:
+        idx = np.argpartition(probs, -k, axis=1)[:, -k:]
+    else:
+        idx = np.tile(np.arange(probs.shape[1]), (len(probs), 1))
+    top = np.take_along_axis(probs, idx, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class IngredientClassifier:
+    """
+    Klasifikasi bahan makanan dari foto (EfficientNetB0).
+
+    Gambar di-decode per potongan `batch_size` langsung ke buffer batch
+    pinjaman dari pool, lalu diprediksi; potongan terakhir di-pad ke
+    pangkat dua supaya bentuk tensor yang di-trace tetap sedikit.
+    """
+
+    name = "ingredient"
+
+    def __init__(self, backend, class_names=CLASS_NAMES, decoder="fast", batch_size=BATCH_SIZE):
+        self.backend = backend
+        self.class_names = class_names
+        self.decode_fn = DECODERS[decoder]
+        self.batch_size = batch_size
+        self.buffers = BufferPool(batch_size)
+
+    @classmethod
+    def load(cls, model_dir, engine="keras", num_threads=None, xnnpack=True, **kwargs):
+        path = os.path.join(model_dir, MODEL_FILES[engine])
+        options = {"num_threads": num_threads, "xnnpack": xnnpack} if engine.startswith("tflite") else {}
+        return cls(load_backend(engine, path, **options), **kwargs)
+
+    def predict_arrays(self, x):
+        """x: (N, 224, 224, 3) float32 skala 0..1 -> probabilitas (N, jumlah_kelas)."""
+        x = np.asarray(x, dtype=np.float32)
+        outputs = []
+        for start in range(0, len(x), self.batch_size):
+            chunk = x[start:start + self.batch_size]
+            n = len(chunk)
+            size = bucket_size(n, self.batch_size)
+            if size > n:
+                pad = np.zeros((size - n,) + chunk.shape[1:], dtype=chunk.dtype)
+                chunk = np.concatenate([chunk, pad])
+            with timed(self.name, self.backend.name, n):
+                outputs.append(np.asarray(self.backend.predict_on_batch(chunk))[:n])
+        if not outputs:
+            return np.empty((0, len(self.class_names)), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def predict_batch(self, sources):
+        """
+        sources: list path / bytes / file-like.
+
+        Mengembalikan (probs, posisi, errors): baris `probs[j]` milik input
+        `posisi[j]`; gambar yang gagal di-decode ada di `errors` {indeks: pesan}.
+        """
+        outputs, positions, errors = [], [], {}
+        with self.buffers.borrow() as buffer:
+            # Buffer dipakai ulang tiap potongan: prediksi sebelum potongan berikutnya di-decode
+            for start in range(0, len(sources), self.batch_size):
+                batch, pos, errs = buffer.decode(sources[start:start + self.batch_size], self.decode_fn)
+                outputs.append(self.predict_arrays(batch))
+                positions.extend(start + p for p in pos)
+                errors.update({start + i: message for i, message in errs.items()})
+        if not outputs:
+            return np.empty((0, len(self.class_names)), dtype=np.float32), positions, errors
+        return np.concatenate(outputs), positions, errors
+
+    def format_batch(self, probs, top_k=1, threshold=0.0):
+        """
+        probs (N, kelas) -> list hasil per baris, dengan `top_k` alternatif.
+
+        Baris yang confidence-nya di bawah `threshold` (persen) ditolak
+        sebagai bukan bahan yang dikenal: `unknown` True dan
+        `predicted_label` None, top_k tetap diisi.
+        """
+        idx, conf = top_k_classes(probs, top_k)
+        conf = np.round(conf.astype(np.float64) * 100, 2)
+
+        results = []
+        for row_idx, row_conf in zip(idx.tolist(), conf.tolist()):
+            unknown = row_conf[0] < threshold
+            results.append({
+                "predicted_label": None if unknown else self.class_names[row_idx[0]],
+                "confidence": row_conf[0],
+                "index": row_idx[0],
+                "unknown": unknown,
+                "top_k": [{"label": self.class_names[i], "confidence": c} for i, c in zip(row_idx, row_conf)],
+            })
+        return results
+
+    def format(self, probs, top_k=1, threshold=0.0):
+        return self.format_batch(np.asarray(probs)[np.newaxis], top_k, threshold)[0]
+
+    def warmup(self, batch_sizes=None):
+        """
+        Jalankan input nol untuk setiap ukuran batch (default: semua ukuran
+        bucket yang bisa muncul), plus satu JPEG lewat decoder; kembalikan
+        durasi (detik).
+        """
+        if batch_sizes is None:
+            batch_sizes = sorted({bucket_size(n, self.batch_size) for n in range(1, self.batch_size + 1)})
+        start = time.perf_counter()
+        for size in batch_sizes:
+            self.predict_arrays(np.zeros((size, 224, 224, 3), dtype=np.float32))
+        self.predict_batch([dummy_jpeg()])
+        return time.perf_counter() - start
@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+
+from .backends import load_backend
+from .timing import timed
+
+# Nama file model per backend di chatbot/model/
+MODEL_FILES = {"keras": "model.h5", "numpy": "model.npz"}
+ERROR_THRESHOLD = 0.25
+
+
+class IntentClassifier:
+    """
+    Klasifikasi intent chatbot: kalimat -> bag of words -> MLP -> probabilitas.
+
+    `encoder` adalah BagOfWordsEncoder milik chatbot (tokenisasi NLTK ada di
+    sana), `backend` salah satu dari inference.backends. Semua forward pass
+    lewat predict_encoded supaya timing hook tercatat di satu tempat.
+    """
+
+    name = "intent"
+
+    def __init__(self, backend, encoder, classes, threshold=ERROR_THRESHOLD):
+        self.backend = backend
+        self.encoder = encoder
+        self.classes = classes
+        self.threshold = threshold
+
+    @classmethod
+    def load(cls, model_path, encoder, classes, backend="keras", **options):
+        return cls(load_backend(backend, model_path, **options), encoder, classes)
+
+    @property
+    def input_dim(self):
+        return len(self.encoder)
+
+    def predict_encoded(self, x):
+        """x: matriks bag of words (N, jumlah_kata) -> probabilitas (N, jumlah_kelas)."""
+        with timed(self.name, self.backend.name, len(x)):
+            return self.backend.predict_on_batch(x)
+
+    def predict_batch(self, sentences):
+        return self.predict_encoded(self.encoder.encode_many(sentences))
+
+    def rank(self, probs, threshold=None):
+        # Format hasil predict_class: intent di atas ambang, urut probabilitas
+        threshold = self.threshold if threshold is None else threshold
+        results = [[i, r] for i, r in enumerate(probs) if r > threshold]
+        results.sort(key=lambda x: x[1], reverse=True)
+        return [{"intent": self.classes[r[0]], "probability": str(r[1])} for r in results]
+
+    def classify(self, sentence):
+        return self.rank(self.predict_batch([sentence])[0])
+
+    def validate(self):
+        probe = np.zeros((1, self.input_dim), dtype=np.float32)
+        out = np.asarray(self.predict_encoded(probe))
+        if out.shape != (1, len(self.classes)):
+            raise ValueError(
+                f"Output model {out.shape} tidak cocok dengan {len(self.classes)} kelas / {self.input_dim} kata"
+            )
+        if not np.all(np.isfinite(out)) or not np.isclose(out.sum(), 1.0, atol=1e-3):
+            raise ValueError("Output model bukan distribusi probabilitas yang valid")
+
+    def warmup(self, batch_sizes=(1,)):
+        """Jalankan input nol untuk setiap ukuran batch; kembalikan durasi (detik)."""
+        start = time.perf_counter()
+        for size in batch_sizes:
+            self.predict_encoded(np.zeros((size, self.input_dim), dtype=np.float32))
+        return time.perf_counter() - start
@@ -0,0 +1,77 @@
+import gc
+import os
+import signal
+import time
+
+RESPAWN_DELAY = 1.0  # detik, supaya worker yang crash terus tidak jadi loop ketat
+
+
+def serve(app, host, port, workers, post_fork=None, name="server"):
+    """
+    Jalankan `app` (WSGI) di `workers` proses hasil fork dari proses ini.
+
+    Semua yang sudah dimuat sebelum serve() dipanggil (modul, korpus NLTK,
+    vocab, bobot yang aman di-fork) dipakai bersama lewat copy-on-write;
+    socket listen juga dibuat sekali di parent dan di-accept semua worker.
+    `post_fork` dijalankan di setiap worker sebelum mulai melayani request
+    (thread latar, warmup, model yang tidak aman di-fork). Parent hanya
+    mengawasi: worker yang mati dijalankan ulang, SIGTERM/SIGINT
+    diteruskan ke semua worker.
+    """
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, app, threaded=True)
+    # Objek yang sudah ada tidak lagi disentuh GC, jadi halaman memorinya
+    # tidak ikut tersalin di worker hanya karena siklus GC
+    gc.freeze()
+
+    children = {}
+    stopping = False
+
+    def spawn(slot):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                if post_fork is not None:
+                    post_fork()
+                server.serve_forever()
+            except BaseException as e:
+                print(f"[{name}] worker {os.getpid()} berhenti: {type(e).__name__}: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = (slot, time.monotonic())
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for slot in range(workers):
+        spawn(slot)
+    print(f"[{name}] {workers} worker di http://{host}:{port} (parent pid {os.getpid()})")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot, started = children.pop(pid, (None, None))
+        if stopping or slot is None:
+            continue
+        print(f"[{name}] worker {pid} keluar (status {status}), dijalankan ulang")
+        if time.monotonic() - started < RESPAWN_DELAY:
+            time.sleep(RESPAWN_DELAY)
+        spawn(slot)
+
+    server.server_close()
@@ -0,0 +1,72 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    """
+    Catatan fase startup server (import, load model, warmup, ...).
+
+    Setiap fase dicetak ke log saat selesai; `ready` baru True setelah
+    mark_ready() (biasanya di akhir warmup) dan dipakai endpoint /ready
+    supaya load balancer tidak mengirim traffic ke worker yang masih dingin.
+    """
+
+    def __init__(self, name, started=None):
+        self.name = name
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = []
+        self.error = None
+        self._ready = threading.Event()
+
+    def record(self, phase, seconds):
+        self.phases.append((phase, seconds))
+        print(f"[{self.name}] {phase}: {seconds:.2f}s")
+
+    @contextmanager
+    def phase(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def mark_ready(self):
+        self._ready.set()
+        summary = " | ".join(f"{p} {s:.2f}s" for p, s in self.phases)
+        print(f"[{self.name}] READY dalam {time.perf_counter() - self.started:.2f}s ({summary})")
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def run_warmup(self, warmup_fn, background=True):
+        """Jalankan `warmup_fn` sebagai fase "warmup", lalu tandai siap."""
+
+        def run():
+            try:
+                with self.phase("warmup"):
+                    warmup_fn()
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"[{self.name}] Warmup gagal, server tetap belum siap: {self.error}")
+                return
+            self.mark_ready()
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name=f"{self.name}-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def as_dict(self):
+        return {
+            "ready": self.ready,
+            "phases": {p: round(s, 3) for p, s in self.phases},
+            "uptime_s": round(time.perf_counter() - self.started, 3),
+            "error": self.error,
+        }
@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Satu catatan per pemanggilan model (predict_batch / warmup)
+Timing = namedtuple("Timing", ["model", "backend", "batch_size", "seconds"])
+
+_hooks = []
+
+
+def add_timing_hook(hook):
+    """Daftarkan `hook(timing)` yang dipanggil setelah setiap forward pass."""
+    _hooks.append(hook)
+    return hook
+
+
+def remove_timing_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+@contextmanager
+def timed(model, backend, batch_size):
+    start = time.perf_counter()
+    yield
+    timing = Timing(model, backend, batch_size, time.perf_counter() - start)
+    for hook in list(_hooks):
+        try:
+            hook(timing)
+        except Exception as e:
+            print(f"[inference] Timing hook gagal: {e}")
+
+
+class TimingStats:
+    """Hook bawaan: jumlah panggilan, item, rata-rata dan maksimum per model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __call__(self, timing):
+        key = f"{timing.model}/{timing.backend}"
+        with self._lock:
+            s = self._stats.setdefault(key, {"calls": 0, "items": 0, "total_s": 0.0, "max_s": 0.0})
+            s["calls"] += 1
+            s["items"] += timing.batch_size
+            s["total_s"] += timing.seconds
+            s["max_s"] = max(s["max_s"], timing.seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                key: {
+                    "calls": s["calls"],
+                    "items": s["items"],
+                    "avg_ms": round(s["total_s"] / s["calls"] * 1000, 3),
+                    "max_ms": round(s["max_s"] * 1000, 3),
+                }
+                for key, s in self._stats.items()
+            }
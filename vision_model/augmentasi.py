@@ -1,45 +1,243 @@
+"""
+Augmentasi offline dataset (paralel, bisa dilanjutkan)
+======================================================
+Setiap gambar di SUMBER/<kelas>/ dibuat MULTIPLIER variasi acak di
+TUJUAN/<kelas>/<nama>_<ext>_aug<k>.jpg (mis. 0.png -> 0_png_aug1.jpg). Jenis augmentasi sama dengan
+ImageDataGenerator versi lama (rotasi 30°, geser 0.2, shear 0.15°,
+zoom 0.3, flip horizontal, brightness 0.6-1.4, fill 'nearest'), tapi:
+
+- gambar di-decode + resize dulu (decode_pixels, ukuran training) lalu
+  ditransformasi per batch: satu matriks affine per gambar, sampling
+  bilinear untuk seluruh batch sekaligus di numpy;
+- kelas dipecah jadi potongan kecil yang dikerjakan beberapa proses;
+- seed tiap variasi diturunkan dari (seed, path relatif, k), jadi hasil
+  sama di setiap jalan, berapa pun jumlah proses dan urutannya;
+- file yang sudah ada dilewati, jadi proses yang terhenti bisa
+  dijalankan ulang. File ditulis ke .tmp lalu di-rename, sehingga file
+  setengah jadi tidak pernah dianggap selesai.
+
+Jalankan: python augmentasi.py SUMBER TUJUAN [--multiplier 4] [--workers N]
+                                [--seed 42] [--batch 32] [--size 224]
+Contoh  : python augmentasi.py dataset/ayam dataset/ayam_augmented
+"""
+
 import os
+import sys
+import time
+import zlib
+from multiprocessing import Pool
+
 import numpy as np
-from tensorflow.keras.preprocessing.image import ImageDataGenerator, img_to_array, load_img, array_to_img
-
-# === PATH DATASET ===
-base_dir = os.path.join(os.getcwd(), 'dataset','ayam')
-augmented_dir = os.path.join(os.getcwd(), 'dataset','ayam_augmented')
-
-os.makedirs(augmented_dir, exist_ok=True)
-
-# === SETUP AUGMENTASI ===
-datagen = ImageDataGenerator(
-    rotation_range=30,
-    width_shift_range=0.2,
-    height_shift_range=0.2,
-    shear_range=0.15,
-    zoom_range=0.3,
-    horizontal_flip=True,
-    brightness_range=[0.6, 1.4],
-    fill_mode='nearest'
-)
-
-# === LOOP SETIAP KELAS ===
-for class_name in os.listdir(base_dir):
-    class_path = os.path.join(base_dir, class_name)
-    save_path = os.path.join(augmented_dir, class_name)
-    os.makedirs(save_path, exist_ok=True)
-
-    images = [f for f in os.listdir(class_path) if f.lower().endswith(('jpg', 'jpeg', 'png'))]
-
-    print(f"🧩 Augmenting class '{class_name}' ({len(images)} images)...")
-
-    for img_name in images:
-        img_path = os.path.join(class_path, img_name)
-        img = load_img(img_path)
-        x = img_to_array(img)
-        x = np.expand_dims(x, axis=0)
-
-        # Generate 4 variasi baru per gambar (jadi total 5x lipat)
-        aug_iter = datagen.flow(x, batch_size=1, save_to_dir=save_path,
-                                save_prefix='aug', save_format='jpg')
-        for i in range(4):
-            next(aug_iter)
-
-print("✅ Augmentasi selesai! Gambar hasil disimpan di folder 'valid_augmented'")
+from PIL import Image
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference.image_preprocessing import decode_pixels
+
+EXTENSIONS = (".jpg", ".jpeg", ".png")
+MULTIPLIER = 4
+SEED = 42
+BATCH_SIZE = 32
+SIZE = 224
+JPEG_QUALITY = 95
+
+# === SETUP AUGMENTASI (padanan ImageDataGenerator lama) ===
+AUGMENT = {
+    "rotation": 30,          # derajat
+    "shift": 0.2,            # fraksi tinggi/lebar
+    "shear": 0.15,           # derajat, seperti shear_range Keras
+    "zoom": 0.3,
+    "flip": True,
+    "brightness": (0.6, 1.4),
+}
+
+
+def output_path(dst_dir, rel_path, k):
+    # Ekstensi sumber ikut di nama: a/0.jpg dan a/0.png tidak berebut file yang sama
+    stem, ext = os.path.splitext(rel_path)
+    return os.path.join(dst_dir, f"{stem}_{ext[1:]}_aug{k}.jpg")
+
+
+def random_transform(rng, height, width, config=AUGMENT):
+    """
+    Matriks affine 2x2 + offset (baris, kolom) yang memetakan koordinat
+    output (relatif ke pusat) ke koordinat gambar sumber, plus faktor
+    brightness.
+    """
+    theta = np.deg2rad(rng.uniform(-config["rotation"], config["rotation"]))
+    shift = rng.uniform(-config["shift"], config["shift"], size=2) * (height, width)
+    shear = np.deg2rad(rng.uniform(-config["shear"], config["shear"]))
+    zoom = rng.uniform(1 - config["zoom"], 1 + config["zoom"], size=2)
+    flip = -1.0 if config["flip"] and rng.random() < 0.5 else 1.0
+    brightness = rng.uniform(*config["brightness"])
+
+    rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+    shearing = np.array([[1.0, -np.sin(shear)], [0.0, np.cos(shear)]])
+    matrix = rotation @ shearing @ np.diag(zoom) @ np.diag([1.0, flip])
+    return matrix, shift, brightness
+
+
+def apply_batch(images, matrices, offsets, brightness):
+    """
+    images uint8 (B, H, W, 3) -> uint8 (B, H, W, 3). Koordinat sumber di
+    luar gambar di-clamp ke tepi (fill_mode 'nearest').
+    """
+    n, height, width, _ = images.shape
+    center = np.array([(height - 1) / 2, (width - 1) / 2], dtype=np.float32)
+    rows, cols = np.mgrid[0:height, 0:width].astype(np.float32)
+    grid = np.stack([rows - center[0], cols - center[1]])            # (2, H, W)
+
+    # (B, 2, 2) x (2, H*W) -> (B, 2, H*W): koordinat sumber semua gambar sekaligus
+    src = np.matmul(matrices.astype(np.float32), grid.reshape(2, -1))
+    src += (center + offsets.astype(np.float32))[:, :, None]
+    r = np.clip(src[:, 0], 0, height - 1).reshape(n, height, width)
+    c = np.clip(src[:, 1], 0, width - 1).reshape(n, height, width)
+
+    r0 = r.astype(np.intp)  # r, c >= 0: truncate == floor
+    c0 = c.astype(np.intp)
+    wr = (r - r0)[..., None]
+    wc = (c - c0)[..., None]
+
+    # Indeks datar ke (B*H*W, 3): satu np.take per tetangga, baca uint8
+    base = (np.arange(n) * height * width)[:, None, None] + r0 * width
+    i00 = base + c0
+    i01 = base + np.minimum(c0 + 1, width - 1)
+    down = np.where(r0 < height - 1, width, 0)
+    pixels = images.reshape(-1, 3)
+
+    def gather(index):
+        return np.take(pixels, index, axis=0).astype(np.float32)
+
+    top = gather(i00) * (1 - wc) + gather(i01) * wc
+    bottom = gather(i00 + down) * (1 - wc) + gather(i01 + down) * wc
+    out = top + (bottom - top) * wr
+    out *= brightness.astype(np.float32)[:, None, None, None]
+    return np.clip(np.rint(out, out=out), 0, 255, out=out).astype(np.uint8)
+
+
+def file_seed(seed, rel_path, k):
+    # Stabil antar proses & antar jalan (hash() Python diacak per proses)
+    return [seed, zlib.crc32(rel_path.replace(os.sep, "/").encode()), k]
+
+
+def save_jpeg(array, path):
+    tmp_path = path + ".tmp"
+    Image.fromarray(array).save(tmp_path, format="JPEG", quality=JPEG_QUALITY)
+    os.replace(tmp_path, path)
+
+
+def augment_chunk(task):
+    """
+    Dikerjakan di proses worker. task = (src_dir, dst_dir, rel_paths,
+    multiplier, seed, size). Mengembalikan statistik potongan ini.
+    """
+    src_dir, dst_dir, rel_paths, multiplier, seed, size = task
+    start = time.process_time()
+    stats = {"class": rel_paths[0].split(os.sep)[0], "written": 0, "skipped": 0, "failed": []}
+
+    # Hanya gambar yang masih punya variasi belum dibuat yang di-decode
+    todo = []
+    for rel in rel_paths:
+        missing = [k for k in range(1, multiplier + 1) if not os.path.exists(output_path(dst_dir, rel, k))]
+        stats["skipped"] += multiplier - len(missing)
+        if missing:
+            todo.append((rel, missing))
+
+    pixels, jobs = [], []
+    for rel, missing in todo:
+        try:
+            pixels.append(decode_pixels(os.path.join(src_dir, rel), (size, size)))
+        except Exception as e:  # file rusak / bukan gambar
+            stats["failed"].append(f"{rel}: {type(e).__name__}: {e}")
+            continue
+        jobs.extend((len(pixels) - 1, rel, k) for k in missing)
+
+    if jobs:
+        os.makedirs(os.path.join(dst_dir, stats["class"]), exist_ok=True)
+        images = np.stack(pixels)
+        params = [random_transform(np.random.default_rng(file_seed(seed, rel, k)), size, size) for _, rel, k in jobs]
+        out = apply_batch(
+            images[[i for i, _, _ in jobs]],
+            np.stack([m for m, _, _ in params]),
+            np.stack([o for _, o, _ in params]),
+            np.array([b for _, _, b in params]),
+        )
+        for array, (_, rel, k) in zip(out, jobs):
+            path = output_path(dst_dir, rel, k)
+            # Dihitung dari file yang benar-benar dibuat di sini
+            if os.path.exists(path):
+                stats["skipped"] += 1
+                continue
+            save_jpeg(array, path)
+            stats["written"] += 1
+
+    stats["cpu_s"] = time.process_time() - start
+    return stats
+
+
+def plan(src_dir, dst_dir, multiplier, seed, size, batch_size):
+    # Potongan per kelas; satu potongan menghasilkan <= batch_size gambar
+    per_chunk = max(1, batch_size // multiplier)
+    tasks = []
+    for class_name in sorted(os.listdir(src_dir)):
+        class_path = os.path.join(src_dir, class_name)
+        if not os.path.isdir(class_path):
+            continue
+        images = sorted(f for f in os.listdir(class_path) if f.lower().endswith(EXTENSIONS))
+        rel_paths = [os.path.join(class_name, f) for f in images]
+        for i in range(0, len(rel_paths), per_chunk):
+            tasks.append((src_dir, dst_dir, rel_paths[i:i + per_chunk], multiplier, seed, size))
+    return tasks
+
+
+def augment_dataset(src_dir, dst_dir, multiplier=MULTIPLIER, workers=None, seed=SEED, size=SIZE,
+                    batch_size=BATCH_SIZE):
+    workers = workers or os.cpu_count()
+    tasks = plan(src_dir, dst_dir, multiplier, seed, size, batch_size)
+    per_class = {}
+    totals = {"written": 0, "skipped": 0, "cpu_s": 0.0}
+
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        for stats in pool.imap_unordered(augment_chunk, tasks):
+            c = per_class.setdefault(stats["class"], {"written": 0, "skipped": 0})
+            for key in ("written", "skipped"):
+                c[key] += stats[key]
+                totals[key] += stats[key]
+            totals["cpu_s"] += stats["cpu_s"]
+            for failure in stats["failed"]:
+                print(f"❌ Gagal: {failure}")
+    wall_s = time.perf_counter() - start
+
+    for class_name, c in sorted(per_class.items()):
+        print(f"🧩 {class_name}: {c['written']} dibuat, {c['skipped']} sudah ada")
+    written = totals["written"]
+    print(f"\n✅ Augmentasi selesai: {written} gambar di {dst_dir} ({totals['skipped']} dilewati)")
+    if written:
+        print(f"   • {wall_s:.1f} s, {workers} proses: {written / wall_s:.1f} img/s total, "
+              f"{written / wall_s / workers:.1f} img/s per core, "
+              f"{written / totals['cpu_s']:.1f} img/s per detik CPU")
+    return totals
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(flag, default, cast=str):
+        if flag not in args:
+            return default
+        i = args.index(flag)
+        value = args.pop(i + 1)
+        args.pop(i)
+        return cast(value)
+
+    multiplier = option("--multiplier", MULTIPLIER, int)
+    workers = option("--workers", None, int)
+    seed = option("--seed", SEED, int)
+    batch_size = option("--batch", BATCH_SIZE, int)
+    size = option("--size", SIZE, int)
+    if len(args) != 2:
+        sys.exit(__doc__)
+
+    augment_dataset(args[0], args[1], multiplier, workers, seed, size, batch_size)
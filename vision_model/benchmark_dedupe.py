@@ -0,0 +1,73 @@
+"""
+Benchmark deteksi duplikat: loop 6x6 per pasangan vs perkalian matriks
+======================================================================
+Embedding acak ternormalisasi (6 variasi per gambar, dim 2048 seperti
+ResNet50) dengan sebagian gambar dibuat hampir sama dengan gambar lain.
+Membandingkan loop Python coabhapus.py versi lama (dot product per
+pasangan variasi terhadap setiap gambar tersimpan) dengan
+coabhapus.find_duplicates; himpunan duplikat keduanya dicek sama.
+
+Jalankan: python benchmark_dedupe.py [jumlah_gambar ...]
+          (default: 50 200 500; loop lama dilewati di atas 500 gambar)
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from coabhapus import THRESHOLD, find_duplicates
+
+DIM = 2048
+LOOP_LIMIT = 500
+
+
+def synthetic(n, dup_fraction=0.2, seed=42):
+    rng = np.random.default_rng(seed)
+    emb = rng.normal(size=(n, 6, DIM)).astype(np.float32)
+    # Sebagian gambar = gambar sebelumnya + noise kecil
+    for i in rng.choice(np.arange(1, n), size=int(n * dup_fraction), replace=False):
+        emb[i] = emb[rng.integers(0, i)] + rng.normal(scale=0.3, size=(6, DIM))
+    return emb / np.linalg.norm(emb, axis=-1, keepdims=True)
+
+
+def loop_duplicates(embeddings, threshold=THRESHOLD):
+    # Logika lama: bandingkan dengan setiap gambar tersimpan, berhenti di kecocokan pertama
+    kept, duplicates = [], set()
+    for i, feats in enumerate(embeddings):
+        is_dup = False
+        for k in kept:
+            for f1 in feats:
+                for f2 in embeddings[k]:
+                    if float(np.dot(f1, f2)) >= threshold:
+                        is_dup = True
+                        break
+                if is_dup:
+                    break
+            if is_dup:
+                break
+        if is_dup:
+            duplicates.add(i)
+        else:
+            kept.append(i)
+    return duplicates
+
+
+def seconds(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [50, 200, 500]
+    print(f"{'gambar':>8}{'duplikat':>10}{'loop s':>10}{'matmul s':>10}{'x':>8}")
+    for n in sizes:
+        emb = synthetic(n)
+        fast_s, fast = seconds(lambda: find_duplicates(emb))
+        if n <= LOOP_LIMIT:
+            slow_s, slow = seconds(lambda: loop_duplicates(emb))
+            assert slow == set(fast), "hasil berbeda dengan loop lama"
+            print(f"{n:>8}{len(fast):>10}{slow_s:>10.2f}{fast_s:>10.3f}{slow_s / fast_s:>8.0f}")
+        else:
+            print(f"{n:>8}{len(fast):>10}{'-':>10}{fast_s:>10.3f}{'-':>8}")
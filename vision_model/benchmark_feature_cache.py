@@ -0,0 +1,88 @@
+"""
+Benchmark tahap 1: backbone tiap epoch vs head di atas fitur cache
+==================================================================
+Head train.py (BatchNorm-Dense-Dropout-Dense) di atas EfficientNetB0
+beku, data dataset_jadi/train_augmented + valid. Yang diukur:
+
+- full     : waktu satu epoch model.fit model penuh (tf.data, augmentasi)
+- ekstraksi: waktu menghitung fitur pooled sekali (feature_cache.py;
+             cache dikosongkan dulu supaya benar-benar terukur)
+- features : waktu satu epoch head.fit di atas fitur cache
+
+Perkiraan total tahap 1 untuk EPOCHS epoch dicetak untuk kedua mode.
+
+Jalankan: python benchmark_feature_cache.py [jumlah_epoch]
+          (default: 20, sama dengan EPOCHS_STAGE1 di train.py)
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+
+import tensorflow as tf
+from tensorflow.keras.layers import BatchNormalization, Dense, Dropout, GlobalAveragePooling2D
+
+from dataset_pipeline import TRAIN_DIR, VALID_DIR, augmentation, eval_dataset, train_dataset
+from feature_cache import extract_features, head_model, pooled_backbone
+
+AUGMENT = {"rotation": 20, "zoom": 0.2, "shift": 0.1}
+
+
+def build(num_classes):
+    base = tf.keras.applications.EfficientNetB0(include_top=False, weights="imagenet", input_shape=(224, 224, 3))
+    base.trainable = False
+    # Susunan sama dengan train.py: layer datar di model penuh, dipakai bersama head
+    head_layers = [BatchNormalization(), Dense(512, activation="relu"), Dropout(0.4),
+                   Dense(num_classes, activation="softmax")]
+    x = GlobalAveragePooling2D()(base.output)
+    for layer in head_layers:
+        x = layer(x)
+    return base, head_model(base, head_layers), tf.keras.Model(base.input, x)
+
+
+def seconds(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    epochs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    train_data, class_names = train_dataset(TRAIN_DIR, augment=augmentation(**AUGMENT))
+    valid_data, _ = eval_dataset(VALID_DIR, class_names=class_names)
+    base, head, model = build(len(class_names))
+
+    model.compile(optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"])
+    model.fit(train_data.take(1), verbose=0)  # trace dulu
+    full_s = seconds(lambda: model.fit(train_data, validation_data=valid_data, epochs=1, verbose=0))
+
+    cache_dir = tempfile.mkdtemp(prefix="feature_cache_")
+    try:
+        extractor = pooled_backbone(base)
+        features = {}
+
+        def extract():
+            features["train"] = extract_features(extractor, TRAIN_DIR, class_names, cache_dir=cache_dir)
+            features["valid"] = extract_features(extractor, VALID_DIR, class_names, cache_dir=cache_dir)
+
+        extract_s = seconds(extract)
+
+        (x_train, y_train), (x_valid, y_valid) = features["train"], features["valid"]
+        onehot = tf.keras.utils.to_categorical
+        head.compile(optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"])
+        # Trace dulu seperti model penuh, supaya head_s tidak ikut waktu kompilasi graph
+        head.fit(x_train[:32], onehot(y_train[:32], len(class_names)), verbose=0)
+        head_s = seconds(lambda: head.fit(
+            x_train, onehot(y_train, len(class_names)),
+            validation_data=(x_valid, onehot(y_valid, len(class_names))),
+            epochs=1, batch_size=32, verbose=0,
+        ))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{'mode':<12}{'per epoch s':>13}{'sekali s':>10}{f'{epochs} epoch s':>14}")
+    print(f"{'full':<12}{full_s:>13.1f}{'-':>10}{full_s * epochs:>14.1f}")
+    print(f"{'features':<12}{head_s:>13.1f}{extract_s:>10.1f}{extract_s + head_s * epochs:>14.1f}")
+    print(f"\nTahap 1 x{full_s * epochs / (extract_s + head_s * epochs):.1f} lebih cepat dengan fitur cache")
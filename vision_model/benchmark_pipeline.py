@@ -0,0 +1,104 @@
+"""
+Benchmark waktu epoch: ImageDataGenerator vs tf.data (dataset_pipeline.py)
+==========================================================================
+Data yang sama, augmentasi setara (train.py: rotasi 20, zoom 0.2, geser
+0.1, flip), batch 32. Yang diukur per pipeline:
+
+- train : satu epoch penuh (decode + augmentasi) tanpa model
+- valid : epoch 1 dan epoch 2, selalu penuh (tf.data: epoch 2 dari cache)
+- fit   : (opsional, --fit) satu epoch model.fit dengan EfficientNetB0
+          beku + head kecil, untuk melihat apakah model masih menunggu data
+
+Jalankan: python benchmark_pipeline.py [--fit] [--steps N]
+          (default: semua batch; --steps membatasi jumlah batch train)
+"""
+
+import sys
+import time
+
+import tensorflow as tf
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+
+from dataset_pipeline import BATCH_SIZE, IMG_SIZE, TRAIN_DIR, VALID_DIR, augmentation, eval_dataset, train_dataset
+
+
+def generators():
+    train = ImageDataGenerator(
+        rescale=1./255, rotation_range=20, zoom_range=0.2,
+        width_shift_range=0.1, height_shift_range=0.1, horizontal_flip=True,
+    ).flow_from_directory(TRAIN_DIR, target_size=IMG_SIZE, batch_size=BATCH_SIZE, class_mode='categorical', shuffle=True)
+    valid = ImageDataGenerator(rescale=1./255).flow_from_directory(
+        VALID_DIR, target_size=IMG_SIZE, batch_size=BATCH_SIZE, class_mode='categorical', shuffle=False
+    )
+    return train, valid, train.num_classes
+
+
+def tf_datasets():
+    train, class_names = train_dataset(TRAIN_DIR, augment=augmentation(rotation=20, zoom=0.2, shift=0.1))
+    valid, _ = eval_dataset(VALID_DIR, class_names=class_names)
+    return train, valid, len(class_names)
+
+
+def epoch_seconds(data, steps=None):
+    steps = min(steps or len(data), len(data))
+    start = time.perf_counter()
+    if isinstance(data, tf.data.Dataset) and steps == len(data):
+        # Iterasi sampai habis: cache() baru tersimpan di akhir epoch
+        for _ in data:
+            pass
+    else:
+        # Generator Keras tidak berhenti sendiri: batasi ke `steps` batch
+        for i, _ in enumerate(data):
+            if i + 1 >= steps:
+                break
+    return time.perf_counter() - start, steps
+
+
+def small_model(num_classes):
+    base = tf.keras.applications.EfficientNetB0(include_top=False, weights=None, input_shape=IMG_SIZE + (3,))
+    base.trainable = False
+    x = tf.keras.layers.GlobalAveragePooling2D()(base.output)
+    output = tf.keras.layers.Dense(num_classes, activation='softmax')(x)
+    model = tf.keras.Model(base.input, output)
+    model.compile(optimizer='adam', loss='categorical_crossentropy')
+    return model
+
+
+def fit_seconds(data, num_classes, steps=None):
+    model = small_model(num_classes)
+    steps = min(steps or len(data), len(data))
+    model.fit(data, steps_per_epoch=1, epochs=1, verbose=0)  # trace/compile dulu
+    start = time.perf_counter()
+    model.fit(data, steps_per_epoch=steps, epochs=1, verbose=0)
+    return time.perf_counter() - start, steps
+
+
+if __name__ == "__main__":
+    fit = "--fit" in sys.argv
+    steps = int(sys.argv[sys.argv.index("--steps") + 1]) if "--steps" in sys.argv else None
+
+    rows = []
+    for name, build in [("ImageDataGenerator", generators), ("tf.data", tf_datasets)]:
+        train, valid, num_classes = build()
+        train_s, train_steps = epoch_seconds(train, steps)
+        # Valid selalu satu epoch penuh: cache tf.data hanya jadi kalau epoch selesai
+        valid1_s, valid_steps = epoch_seconds(valid)
+        valid2_s, _ = epoch_seconds(valid)
+        row = {
+            "name": name,
+            "train_s": train_s,
+            "img_per_s": train_steps * BATCH_SIZE / train_s,
+            "valid1_s": valid1_s,
+            "valid2_s": valid2_s,
+        }
+        if fit:
+            row["fit_s"], _ = fit_seconds(train, num_classes, steps)
+        rows.append(row)
+        print(f"✅ {name}: {train_steps} batch train, {valid_steps} batch valid")
+
+    print(f"\n{'pipeline':<20}{'train s':>9}{'img/s':>9}{'valid e1 s':>12}{'valid e2 s':>12}" + (f"{'fit s':>9}" if fit else ""))
+    for r in rows:
+        line = f"{r['name']:<20}{r['train_s']:>9.1f}{r['img_per_s']:>9.1f}{r['valid1_s']:>12.1f}{r['valid2_s']:>12.1f}"
+        print(line + (f"{r['fit_s']:>9.1f}" if fit else ""))
+    base, new = rows
+    print(f"\nEpoch train x{base['train_s'] / new['train_s']:.1f}, valid (cache) x{base['valid2_s'] / new['valid2_s']:.1f}")
@@ -0,0 +1,71 @@
+"""
+Benchmark baca dataset: file gambar kecil vs shard (dataset_shards.py)
+=====================================================================
+Satu epoch tanpa model untuk satu split yang sudah di-pack:
+
+- file   : buka + decode + resize setiap gambar (decode_image, batch 32)
+- shard  : slice berurutan dari memmap (urutan evaluasi)
+- acak   : urutan shard diacak, shard dibaca utuh lalu diacak di memori
+           (urutan training)
+
+Cache halaman OS tidak dikosongkan; jalankan dua kali untuk melihat
+angka "dingin" vs "hangat".
+
+Jalankan: python benchmark_shards.py [split] [jumlah_gambar_file]
+          (default: valid, semua gambar)
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from dataset_shards import list_images, open_split
+from inference.image_preprocessing import BatchBuffer
+
+BATCH_SIZE = 32
+
+
+def file_epoch(paths, batch_size=BATCH_SIZE):
+    buffer = BatchBuffer(batch_size)
+    for start in range(0, len(paths), batch_size):
+        buffer.decode(paths[start:start + batch_size])
+
+
+def shard_epoch(split, shuffle):
+    n = 0
+    for x, _ in split.batches(BATCH_SIZE, shuffle=shuffle):
+        n += len(x)
+    return n
+
+
+def seconds(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "valid"
+    split = open_split(name)
+    if split is None:
+        sys.exit(f"Split {name} belum di-pack, jalankan pack_dataset.py dulu")
+
+    paths, labels, _ = list_images(split.source, split.class_names)
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else len(paths)
+    paths = paths[:limit]
+    assert np.array_equal(np.bincount(labels, minlength=len(split.class_names)),
+                          np.bincount(split.labels(), minlength=len(split.class_names))) or split.errors, \
+        "Jumlah per kelas di shard berbeda dengan folder, pack ulang"
+
+    file_s, _ = seconds(lambda: file_epoch(paths))
+    seq_s, n_seq = seconds(lambda: shard_epoch(split, False))
+    rand_s, n_rand = seconds(lambda: shard_epoch(split, True))
+
+    print(f"Split {name}: {len(split)} gambar di {len(split.files)} shard ({split.source})")
+    print(f"{'sumber':<8}{'gambar':>8}{'detik':>9}{'img/s':>10}")
+    rows = [("file", len(paths), file_s), ("shard", n_seq, seq_s), ("acak", n_rand, rand_s)]
+    for label, n, s in rows:
+        print(f"{label:<8}{n:>8}{s:>9.2f}{n / s:>10.0f}")
+    file_rate = len(paths) / file_s
+    print(f"\nShard x{n_seq / seq_s / file_rate:.1f} (berurutan), x{n_rand / rand_s / file_rate:.1f} (acak) lebih cepat")
@@ -0,0 +1,98 @@
+"""
+Laporan akurasi, latensi & memori per engine vision (Keras vs TFLite)
+=====================================================================
+Setiap varian dijalankan di proses terpisah supaya RSS tidak tercampur:
+model dimuat, dataset_jadi/test diprediksi (data & decoder sama dengan
+predict_test.py, metrik dari predict_test.hitung_metrik), lalu latensi
+satu gambar (p50/p99) dan throughput batch diukur. Varian TFLite tidak
+memuat TensorFlow (kecuali tflite_runtime tidak terpasang dan
+interpreter diambil dari tf.lite); kolom tf menunjukkan apakah TF ikut
+dimuat.
+
+Jalankan: python benchmark_tflite.py [engine ...]
+          (default: keras tflite-dynamic tflite-int8; buat file .tflite
+          dulu dengan export_tflite.py)
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ENGINES = ["keras", "tflite-dynamic", "tflite-int8"]
+LATENCY_RUNS = 100
+BATCH = 16
+
+
+def run_variant(engine):
+    os.environ["VISION_ENGINE"] = engine
+    from predict_image import load_vision_model
+    from predict_test import hitung_metrik, test_batches
+
+    start = time.perf_counter()
+    classifier = load_vision_model(engine)
+    load_s = time.perf_counter() - start
+
+    batches, _ = test_batches()
+    pred_labels, true_labels, sample = [], [], None
+    for x, y in batches:
+        if sample is None:
+            sample = x
+        pred_labels.append(classifier.predict_arrays(x).argmax(axis=1))
+        true_labels.append(y)
+    metrik = hitung_metrik(np.concatenate(true_labels), np.concatenate(pred_labels))
+
+    single = sample[:1]
+    classifier.predict_arrays(single)  # pemanasan
+    latencies = []
+    for _ in range(LATENCY_RUNS):
+        t = time.perf_counter()
+        classifier.predict_arrays(single)
+        latencies.append((time.perf_counter() - t) * 1000)
+
+    batch = np.resize(sample, (BATCH,) + sample.shape[1:])
+    classifier.predict_arrays(batch)
+    t = time.perf_counter()
+    for _ in range(5):
+        classifier.predict_arrays(batch)
+    throughput = 5 * BATCH / (time.perf_counter() - t)
+
+    return {
+        "engine": engine,
+        "load_s": round(load_s, 2),
+        **{k: round(v * 100, 2) for k, v in metrik.items()},
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "img_per_s": round(throughput, 1),
+        "rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "tensorflow": "tensorflow" in sys.modules,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--variant":
+        print(json.dumps(run_variant(sys.argv[2])))
+        sys.exit(0)
+
+    engines = sys.argv[1:] or ENGINES
+    rows = []
+    for engine in engines:
+        proc = subprocess.run([sys.executable, __file__, "--variant", engine], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"❌ {engine} gagal:\n{proc.stderr[-2000:]}")
+            continue
+        rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    base = next((r["accuracy"] for r in rows if r["engine"] == "keras"), None)
+    print(f"\n{'engine':<16}{'akurasi':>9}{'Δ':>7}{'f1':>7}{'p50 ms':>9}{'p99 ms':>9}{'img/s':>8}{'RSS MB':>9}{'load s':>8}{'tf':>5}")
+    for r in rows:
+        delta = f"{r['accuracy'] - base:+.2f}" if base is not None else "-"
+        print(
+            f"{r['engine']:<16}{r['accuracy']:>8.2f}%{delta:>7}{r['f1']:>7.2f}{r['p50_ms']:>9.2f}"
+            f"{r['p99_ms']:>9.2f}{r['img_per_s']:>8.1f}{r['rss_mb']:>9.1f}{r['load_s']:>8.2f}"
+            f"{'ya' if r['tensorflow'] else '-':>5}"
+        )
@@ -0,0 +1,69 @@
+"""
+Benchmark format hasil top-k + ambang unknown
+=============================================
+Membandingkan format per gambar (argsort penuh tiap baris, seperti satu
+request /predict_image per gambar) dengan IngredientClassifier.format_batch
+(satu argpartition untuk seluruh batch), pada probabilitas acak berukuran
+batch /predict_images. Hasil keduanya dicek sama.
+
+Jalankan: python benchmark_topk.py [top_k] [jumlah_putaran]
+          (default: top-3, 2000 putaran)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference import IngredientClassifier
+from inference.ingredient import CLASS_NAMES
+
+BATCH_SIZES = [1, 16, 64]
+THRESHOLD = 55.0
+
+
+def format_per_row(classifier, probs, top_k, threshold):
+    results = []
+    for p in probs:
+        idx = np.argsort(-p, kind="stable")[:top_k]
+        conf = [round(float(p[i]) * 100, 2) for i in idx]
+        unknown = conf[0] < threshold
+        results.append({
+            "predicted_label": None if unknown else classifier.class_names[idx[0]],
+            "confidence": conf[0],
+            "index": int(idx[0]),
+            "unknown": unknown,
+            "top_k": [{"label": classifier.class_names[i], "confidence": c} for i, c in zip(idx, conf)],
+        })
+    return results
+
+
+def per_call_us(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+if __name__ == "__main__":
+    top_k = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    classifier = IngredientClassifier(backend=None)
+    rng = np.random.default_rng(42)
+
+    print(f"top-{top_k}, ambang {THRESHOLD}%, {len(CLASS_NAMES)} kelas")
+    print(f"{'batch':>6}{'per baris us':>15}{'batch us':>11}{'us/gambar':>11}")
+    for n in BATCH_SIZES:
+        logits = rng.normal(size=(n, len(CLASS_NAMES))) * 3
+        probs = (np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)).astype(np.float32)
+
+        expected = format_per_row(classifier, probs, top_k, THRESHOLD)
+        assert classifier.format_batch(probs, top_k, THRESHOLD) == expected
+
+        slow = per_call_us(lambda: format_per_row(classifier, probs, top_k, THRESHOLD), rounds)
+        fast = per_call_us(lambda: classifier.format_batch(probs, top_k, THRESHOLD), rounds)
+        print(f"{n:>6}{slow:>15.1f}{fast:>11.1f}{fast / n:>11.2f}")
@@ -0,0 +1,105 @@
+"""
+Benchmark latensi /predict_image: file sementara vs decode di memori
+====================================================================
+Membandingkan endpoint lama (upload disimpan ke temp/<filename>, dibaca
+ulang oleh load_img, lalu dihapus) dengan endpoint sekarang (decode
+langsung dari stream request yang ditampung di RAM). Keduanya dipanggil
+lewat Flask test client dengan multipart yang sama, jadi parsing form ikut
+terukur; pemanggilan model sama persis (predict_food_image). Yang
+dilaporkan: p50 / p99 / rata-rata dalam milidetik.
+
+Jalankan: python benchmark_upload.py [folder_gambar] [jumlah_request]
+          (default: gambar sintetis 4032x3024 ala foto HP, 200 request)
+"""
+
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from flask import Flask, request, jsonify
+from PIL import Image
+
+from predict_image import create_app, predict_food_image
+
+JUMLAH_REQUEST = 200
+WARMUP = 5
+
+
+def legacy_app():
+    # Salinan predict_image_api sebelum decode di memori
+    legacy = Flask("legacy")
+
+    @legacy.route("/predict_image", methods=["POST"])
+    def predict_image_api():
+        file = request.files["file"]
+        img_path = os.path.join("temp", file.filename)
+
+        os.makedirs("temp", exist_ok=True)
+        file.save(img_path)
+
+        result = predict_food_image(img_path)
+
+        os.remove(img_path)
+
+        return jsonify(result)
+
+    return legacy
+
+
+def synthetic_images(n=4, size=(4032, 3024)):
+    # Gradien + noise supaya ukuran JPEG mirip foto HP (beberapa MB)
+    rng = np.random.default_rng(42)
+    w, h = size
+    base = np.linspace(0, 255, w, dtype=np.float32)[None, :, None]
+    images = []
+    for _ in range(n):
+        arr = np.clip(base + rng.normal(0, 40, (h, w, 3)), 0, 255).astype(np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(arr).save(buf, format="JPEG", quality=90)
+        images.append(("foto.jpg", buf.getvalue()))
+    return images
+
+
+def folder_images(folder, limit=20):
+    images = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith((".jpg", ".jpeg", ".png")):
+                with open(os.path.join(root, name), "rb") as f:
+                    images.append((name, f.read()))
+            if len(images) >= limit:
+                return images
+    return images
+
+
+def measure(client, images, n):
+    latencies = []
+    for i in range(WARMUP + n):
+        name, data = images[i % len(images)]
+        start = time.perf_counter()
+        resp = client.post("/predict_image", data={"file": (io.BytesIO(data), name)},
+                           content_type="multipart/form-data")
+        elapsed = (time.perf_counter() - start) * 1000
+        assert resp.status_code == 200, resp.data
+        if i >= WARMUP:
+            latencies.append(elapsed)
+    return np.array(latencies)
+
+
+def report(label, latencies):
+    print(
+        f"{label:<22} p50: {np.percentile(latencies, 50):8.2f} ms | "
+        f"p99: {np.percentile(latencies, 99):8.2f} ms | rata-rata: {latencies.mean():8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    images = folder_images(sys.argv[1]) if len(sys.argv) > 1 else synthetic_images()
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else JUMLAH_REQUEST
+    avg_kb = sum(len(d) for _, d in images) / len(images) / 1024
+    print(f"{len(images)} gambar (rata-rata {avg_kb:.0f} KB), {n} request per varian\n")
+
+    report("Lama (file temp)", measure(legacy_app().test_client(), images, n))
+    report("Baru (di memori)", measure(create_app().test_client(), images, n))
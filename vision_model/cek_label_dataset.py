@@ -1,6 +1,7 @@
 import os
-from collections import Counter
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
+import sys
+
+from dataset_shards import find_split, list_images
 
 # === PATH DATASET ===
 base_dir = os.path.join(os.getcwd(), 'dataset', 'dataset_jadi')
@@ -8,51 +9,50 @@ train_dir = os.path.join(base_dir, 'train_augmented')
 valid_dir = os.path.join(base_dir, 'valid')
 test_dir = os.path.join(base_dir, 'test')
 
-# === DATA GENERATOR ===
-datagen = ImageDataGenerator(rescale=1./255)
-
-train_data = datagen.flow_from_directory(
-    train_dir,
-    target_size=(224, 224),
-    batch_size=32,
-    class_mode='categorical'
-)
-
-valid_data = datagen.flow_from_directory(
-    valid_dir,
-    target_size=(224, 224),
-    batch_size=32,
-    class_mode='categorical'
-)
-
-test_data = datagen.flow_from_directory(
-    test_dir,
-    target_size=(224, 224),
-    batch_size=32,
-    class_mode='categorical'
-)
+# --verify: cocokkan sha256 shard dengan manifest
+VERIFY = "--verify" in sys.argv
+
+
+# === BACA INFO DATASET ===
+# Dari manifest shard (pack_dataset.py) kalau ada; selain itu cukup daftar
+# file per folder, tanpa generator / decode gambar
+def dataset_info(data_dir):
+    split = find_split(data_dir)
+    if split is not None:
+        if VERIFY:
+            bad = split.verify()
+            print(f"{'⚠️ Shard tidak cocok: ' + ', '.join(bad) if bad else '✅ Hash shard cocok'}")
+        if split.errors:
+            print(f"⚠️ {len(split.errors)} gambar gagal di-decode saat packing")
+        return split.class_names, split.class_counts, f"shard {split.shard_dir}"
+
+    _, labels, class_names = list_images(data_dir)
+    counts = {name: 0 for name in class_names}
+    for label in labels:
+        counts[class_names[label]] += 1
+    return class_names, counts, "file gambar"
+
 
 # === CEK LABEL + JUMLAH GAMBAR ===
-def check_dataset_info(data_dir, data_flow, name):
-    print(f"\n🧩 Dataset: {name}")
-    print(f"Total class: {len(data_flow.class_indices)}")
-    print("Class:", list(data_flow.class_indices.keys()))
+def check_dataset_info(data_dir, name):
+    class_names, class_counts, source = dataset_info(data_dir)
+    print(f"\n🧩 Dataset: {name} ({source})")
+    print(f"Total class: {len(class_names)}")
+    print("Class:", class_names)
 
     # Total gambar
-    total_images = data_flow.samples
+    total_images = sum(class_counts.values())
     print(f"Total gambar: {total_images}")
 
     # Jumlah gambar per class
-    class_counts = Counter(data_flow.classes)
-    idx_to_class = {v: k for k, v in data_flow.class_indices.items()}
-
     print("Distribusi gambar per class:")
-    for class_idx, count in class_counts.items():
-        print(f" - {idx_to_class[class_idx]}: {count}")
+    for class_name, count in class_counts.items():
+        if count:
+            print(f" - {class_name}: {count}")
 
     # Cek folder yang tidak terbaca
     actual_folders = sorted(os.listdir(data_dir))
-    read_labels = list(data_flow.class_indices.keys())
+    read_labels = [c for c, n in class_counts.items() if n]
 
     missing_labels = [f for f in actual_folders if f not in read_labels]
     if missing_labels:
@@ -62,10 +62,11 @@ def check_dataset_info(data_dir, data_flow, name):
 
     return total_images
 
+
 # === CEK SEMUA DATASET ===
-train_total = check_dataset_info(train_dir, train_data, "TRAIN")
-valid_total = check_dataset_info(valid_dir, valid_data, "VALIDATION")
-test_total  = check_dataset_info(test_dir, test_data, "TEST")
+train_total = check_dataset_info(train_dir, "TRAIN")
+valid_total = check_dataset_info(valid_dir, "VALIDATION")
+test_total  = check_dataset_info(test_dir, "TEST")
 
 # === PERBANDINGAN DATASET ===
 total_all = train_total + valid_total + test_total
@@ -0,0 +1,91 @@
+"""
+Cek paritas decoder cepat (draft mode) vs load_img Keras
+========================================================
+Setiap gambar di folder uji di-decode dengan kedua jalur, diprediksi
+model yang sama, lalu dibandingkan: kesamaan label top-1, selisih
+confidence, dan waktu decode per gambar.
+
+Jalankan: python cek_parity_decode.py [folder] [maks_gambar]
+          (default: dataset/dataset_jadi/test, semua gambar)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from predict_image import get_classifier
+from inference.image_preprocessing import decode_image, decode_keras
+
+TEST_DIR = "dataset/dataset_jadi/test"
+MIN_AGREEMENT = 99.0  # persen
+
+
+def list_images(folder, limit=None):
+    paths = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith((".jpg", ".jpeg", ".png")):
+                paths.append(os.path.join(root, name))
+    return paths[:limit] if limit else paths
+
+
+DECODERS = {"keras": decode_keras, "fast": decode_image}
+
+
+def compare(classifier, paths):
+    """
+    Decode + prediksi per potongan sebesar kapasitas BufferPool classifier
+    (ukuran batch forward pass), jadi memori tidak tumbuh dengan jumlah
+    gambar. Mengembalikan per decoder: (top-1, confidence, ms/gambar).
+    """
+    top1 = {name: [] for name in DECODERS}
+    conf = {name: [] for name in DECODERS}
+    elapsed = dict.fromkeys(DECODERS, 0.0)
+    with classifier.buffers.borrow() as buffer:
+        for start in range(0, len(paths), classifier.batch_size):
+            chunk = paths[start:start + classifier.batch_size]
+            for name, decode_fn in DECODERS.items():
+                t = time.perf_counter()
+                batch, _, errors = buffer.decode(chunk, decode_fn)
+                elapsed[name] += time.perf_counter() - t
+                assert not errors, errors
+                probs = classifier.predict_arrays(batch)
+                top1[name].append(probs.argmax(axis=1))
+                conf[name].append(probs.max(axis=1))
+    return {
+        name: (np.concatenate(top1[name]), np.concatenate(conf[name]), elapsed[name] * 1000 / len(paths))
+        for name in DECODERS
+    }
+
+
+if __name__ == "__main__":
+    classifier = get_classifier()
+    if classifier is None:
+        sys.exit("❌ Model CNN belum bisa dimuat")
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else TEST_DIR
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    paths = list_images(folder, limit)
+    print(f"📂 {len(paths)} gambar dari {folder}")
+
+    results = compare(classifier, paths)
+    top1_keras, conf_keras, ms_keras = results["keras"]
+    top1_fast, conf_fast, ms_fast = results["fast"]
+
+    agreement = (top1_keras == top1_fast).mean() * 100
+    conf_diff = np.abs(conf_keras - conf_fast) * 100
+
+    print(f"Decode load_img : {ms_keras:8.2f} ms/gambar")
+    print(f"Decode draft    : {ms_fast:8.2f} ms/gambar (x{ms_keras / ms_fast:.1f})")
+    print(f"Top-1 sama      : {agreement:.2f}%")
+    print(f"Selisih confidence: rata-rata {conf_diff.mean():.2f} poin, maks {conf_diff.max():.2f} poin")
+
+    beda = np.flatnonzero(top1_keras != top1_fast)
+    for i in beda[:10]:
+        print(f" - {paths[i]}: {top1_keras[i]} -> {top1_fast[i]}")
+
+    if agreement < MIN_AGREEMENT:
+        sys.exit(f"❌ Kesamaan top-1 di bawah {MIN_AGREEMENT}%")
+    print("✅ Decoder cepat lolos cek paritas")
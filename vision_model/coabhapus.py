@@ -1,111 +1,255 @@
-import os, shutil
+"""
+Hapus gambar duplikat + batasi jumlah gambar per kelas
+======================================================
+Embedding ResNet50 (pooling avg) untuk setiap gambar dan 5 variasinya
+(flip kiri-kanan, flip atas-bawah, rotasi 90° dua arah, rotasi 180°).
+Sebuah gambar dianggap duplikat kalau ada satu pasangan variasi dengan
+gambar yang sudah disimpan (urut nama file) dengan cosine similarity
+>= THRESHOLD.
+
+- embedding dihitung per batch besar (semua variasi sekaligus), bukan
+  satu model.predict per variasi;
+- kemiripan dihitung dengan perkalian matriks embedding ternormalisasi
+  per blok baris (memori terbatas untuk folder besar), bukan loop
+  Python 6x6 per pasangan gambar;
+- embedding di-cache di model/embedding_cache per folder kelas (kunci:
+  nama, ukuran, mtime file), jadi jalan berikutnya hanya menghitung
+  gambar baru; kalau semua sudah di-cache, model tidak dimuat sama sekali.
+
+FOLDER boleh satu split (mis. dataset/dataset_jadi/valid) yang berisi
+folder kelas, atau satu folder kelas (mis. .../valid/jahe). Duplikat dan
+sisa pembatasan dipindah ke <split>_duplicates/<kelas> dan
+<split>_removed/<kelas>, sejajar dengan folder split (bukan di dalamnya)
+supaya tidak ikut terbaca sebagai kelas saat training.
+
+Jalankan: python coabhapus.py FOLDER [--threshold 0.80] [--max 30] [--min 25]
+                              [--batch 32] [--dry-run]
+          (--max 0 = tanpa pembatasan jumlah; --dry-run = hanya laporan)
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+
 import numpy as np
-from tensorflow.keras.applications.resnet50 import ResNet50, preprocess_input
-from tensorflow.keras.preprocessing import image
-from tensorflow.keras.models import Model
-from tqdm import tqdm
-import cv2
-
-# === Folder Dataset ===
-folder = r"C:\xampp\htdocs\resepin_aja\vision_model\dataset\dataset_jadi\valid\jahe"
-dup_folder = os.path.join(folder, "_duplicates")
-removed_folder = os.path.join(folder, "_removed")
-
-os.makedirs(dup_folder, exist_ok=True)
-os.makedirs(removed_folder, exist_ok=True)
-
-# === Load Model ResNet50 ===
-base = ResNet50(weights='imagenet', include_top=False, pooling='avg')
-model = Model(inputs=base.input, outputs=base.output)
-
-# === List Semua Gambar ===
-files = [f for f in os.listdir(folder) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-files.sort()
-
-# === Fungsi embedding (dengan augmentasi ringan) ===
-def get_all_embeddings(img_path):
-    try:
-        img = image.load_img(img_path, target_size=(224, 224))
-        arr = image.img_to_array(img)
-        variants = [arr]
-
-        variants.append(np.fliplr(arr))
-        variants.append(np.flipud(arr))
-        variants.append(cv2.rotate(arr, cv2.ROTATE_90_CLOCKWISE))
-        variants.append(cv2.rotate(arr, cv2.ROTATE_90_COUNTERCLOCKWISE))
-        variants.append(cv2.rotate(arr, cv2.ROTATE_180))
-
-        embeddings = []
-        for v in variants:
-            x = np.expand_dims(v, axis=0)
-            x = preprocess_input(x)
-            feat = model.predict(x, verbose=0)[0]
-            feat = feat / (np.linalg.norm(feat) + 1e-10)
-            embeddings.append(feat)
-
-        return embeddings
-    except Exception as e:
-        print("❌ Gagal:", img_path, e)
-        return []
-
-# === Generate embeddings ===
-embeddings = {}
-for fname in tqdm(files, desc="🔍 Generating embeddings"):
-    path = os.path.join(folder, fname)
-    embeddings[fname] = get_all_embeddings(path)
-
-# === DETEKSI DUPLIKAT ===
-threshold = 0.80
-kept = []
-
-for fname, feats in embeddings.items():
-    is_dup = False
-    for kname in kept:
-        for f1 in feats:
-            for f2 in embeddings[kname]:
-                sim = float(np.dot(f1, f2))
-                if sim >= threshold:
-                    print(f"🗑️ Duplicate: {fname} -> {kname} (sim={sim:.3f})")
-                    shutil.move(os.path.join(folder, fname), os.path.join(dup_folder, fname))
-                    is_dup = True
-                    break
-            if is_dup:
-                break
-        if is_dup:
-            break
-
-    if not is_dup:
-        kept.append(fname)
-
-print("\n✅ Duplicate selesai")
-print(f"Total duplicate: {len(os.listdir(dup_folder))}")
-
-# ========================
-# BATASI JUMLAH DATA
-# ========================
-print("\n📊 Mengatur jumlah dataset (25–30)...")
-
-files_clean = [f for f in os.listdir(folder) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-total = len(files_clean)
-
-print(f"Jumlah setelah hapus duplikat: {total}")
-
-# 🔥 Jika lebih dari 30 → pindahkan ke _removed
-if total > 30:
-    np.random.shuffle(files_clean)
-    to_remove = files_clean[30:]
-
-    for f in to_remove:
-        shutil.move(os.path.join(folder, f), os.path.join(removed_folder, f))
-
-    print(f"🗑️ Dipindahkan {len(to_remove)} gambar ke _removed")
-
-# ⚠️ Jika kurang dari 25
-elif total < 25:
-    print("⚠️ Data kurang dari 25! Sebaiknya tambah dataset.")
-
-# Final
-final_files = [f for f in os.listdir(folder) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-print(f"✅ Jumlah akhir dataset: {len(final_files)} gambar")
-print(f"📁 Folder duplicate: {dup_folder}")
-print(f"📁 Folder removed: {removed_folder}")
\ No newline at end of file
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference.image_preprocessing import decode_pixels
+
+EXTENSIONS = (".jpg", ".jpeg", ".png")
+IMG_SIZE = (224, 224)
+THRESHOLD = 0.80
+MAX_IMAGES = 30
+MIN_IMAGES = 25
+BATCH_SIZE = 32
+# Baris embedding per blok perkalian matriks: blok (BLOCK*6, N*6) float32
+BLOCK = 128
+SEED = 42
+CACHE_DIR = "model/embedding_cache"
+MODEL_NAME = "resnet50_avg"
+
+_model = None
+
+
+def get_model():
+    # Dimuat saat pertama ada gambar yang belum di-cache
+    global _model
+    if _model is None:
+        from tensorflow.keras.applications.resnet50 import ResNet50
+        _model = ResNet50(weights="imagenet", include_top=False, pooling="avg")
+    return _model
+
+
+def variants(pixels):
+    # (H, W, 3) -> (6, H, W, 3): asli, fliplr, flipud, rotasi 90 cw, 90 ccw, 180
+    return np.stack([
+        pixels,
+        pixels[:, ::-1],
+        pixels[::-1],
+        np.rot90(pixels, -1),
+        np.rot90(pixels, 1),
+        np.rot90(pixels, 2),
+    ])
+
+
+def embed_images(paths, batch_size=BATCH_SIZE):
+    """
+    Embedding ternormalisasi (N, 6, dim) float32. Gambar yang gagal dibuka
+    mendapat baris NaN (tidak pernah cocok dengan apa pun).
+    """
+    from tensorflow.keras.applications.resnet50 import preprocess_input
+
+    model = get_model()
+    dim = model.output_shape[-1]
+    out = np.full((len(paths), 6, dim), np.nan, dtype=np.float32)
+    for start in range(0, len(paths), batch_size):
+        rows, batch = [], []
+        for i, path in enumerate(paths[start:start + batch_size], start):
+            try:
+                batch.append(variants(decode_pixels(path, IMG_SIZE)))
+                rows.append(i)
+            except Exception as e:
+                print("❌ Gagal:", path, e)
+        if not batch:
+            continue
+        x = preprocess_input(np.concatenate(batch).astype(np.float32))
+        feats = np.asarray(model.predict_on_batch(x)).reshape(len(batch), 6, dim)
+        out[rows] = feats / (np.linalg.norm(feats, axis=-1, keepdims=True) + 1e-10)
+    return out
+
+
+def cache_path(folder, cache_dir=CACHE_DIR):
+    key = hashlib.sha1(f"{os.path.abspath(folder)}|{MODEL_NAME}|{IMG_SIZE}".encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(os.path.normpath(folder))}_{key}.npz")
+
+
+def folder_embeddings(folder, batch_size=BATCH_SIZE, cache_dir=CACHE_DIR):
+    """
+    (nama file urut, embedding (N, 6, dim)). Hanya gambar yang belum ada di
+    cache (atau berubah ukuran/mtime) yang di-embed.
+    """
+    files = sorted(f for f in os.listdir(folder) if f.lower().endswith(EXTENSIONS))
+    stats = [os.stat(os.path.join(folder, f)) for f in files]
+    stamps = [f"{f}|{st.st_size}|{st.st_mtime_ns}" for f, st in zip(files, stats)]
+
+    cached = {}
+    path = cache_path(folder, cache_dir)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            cached = dict(zip(data["stamps"].tolist(), data["embeddings"]))
+
+    missing = [i for i, s in enumerate(stamps) if s not in cached]
+    if missing:
+        print(f"🔍 Embedding {len(missing)} gambar baru ({len(files) - len(missing)} dari cache)")
+        new = embed_images([os.path.join(folder, files[i]) for i in missing], batch_size)
+        cached.update(zip((stamps[i] for i in missing), new))
+
+    if not files:
+        return files, np.zeros((0, 6, 0), dtype=np.float32)
+    embeddings = np.stack([cached[s] for s in stamps])
+    if missing or len(cached) != len(stamps):
+        # Simpan hanya file yang masih ada (yang sudah dipindah ikut terbuang)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, stamps=np.array(stamps), embeddings=embeddings)
+        os.replace(tmp_path, path)
+    return files, embeddings
+
+
+def find_duplicates(embeddings, threshold=THRESHOLD, block=BLOCK):
+    """
+    Greedy sesuai urutan: gambar i duplikat kalau mirip (maks. dari 6x6
+    pasangan variasi >= threshold) dengan gambar j < i yang disimpan.
+    Mengembalikan {i: (j, sim)} dengan j gambar tersimpan yang paling mirip.
+    """
+    n, v, dim = embeddings.shape
+    flat = np.nan_to_num(embeddings.reshape(n * v, dim), nan=0.0)
+
+    # Kandidat per baris: (j < i, sim) yang lolos ambang, dari blok matmul
+    candidates = [None] * n
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        sims = flat[start * v:stop * v] @ flat[:stop * v].T          # (b*6, stop*6)
+        sims = sims.reshape(stop - start, v, stop, v).max(axis=(1, 3))
+        for i in range(start, stop):
+            j = np.flatnonzero(sims[i - start, :i] >= threshold)
+            if j.size:
+                candidates[i] = (j, sims[i - start, j])
+
+    kept = np.ones(n, dtype=bool)
+    duplicates = {}
+    for i, found in enumerate(candidates):
+        if found is None:
+            continue
+        j, sim = found
+        ok = kept[j]
+        if ok.any():
+            best = np.argmax(np.where(ok, sim, -np.inf))
+            duplicates[i] = (int(j[best]), float(sim[best]))
+            kept[i] = False
+    return duplicates
+
+
+def class_folders(folder):
+    # Folder split -> semua folder kelas; folder kelas -> dirinya sendiri
+    subdirs = sorted(d for d in os.listdir(folder) if os.path.isdir(os.path.join(folder, d)) and not d.startswith("_"))
+    return [os.path.join(folder, d) for d in subdirs] if subdirs else [folder]
+
+
+def move(folder, name, target_dir, dry_run):
+    if not dry_run:
+        os.makedirs(target_dir, exist_ok=True)
+        shutil.move(os.path.join(folder, name), os.path.join(target_dir, name))
+
+
+def clean_class(folder, dup_dir, removed_dir, threshold=THRESHOLD, max_images=MAX_IMAGES,
+                min_images=MIN_IMAGES, batch_size=BATCH_SIZE, dry_run=False):
+    print(f"\n🧩 {folder}")
+    files, embeddings = folder_embeddings(folder, batch_size)
+    duplicates = find_duplicates(embeddings, threshold)
+    for i, (j, sim) in duplicates.items():
+        print(f"🗑️ Duplicate: {files[i]} -> {files[j]} (sim={sim:.3f})")
+        move(folder, files[i], dup_dir, dry_run)
+    print(f"✅ Duplicate: {len(duplicates)} dari {len(files)} gambar")
+
+    # ========================
+    # BATASI JUMLAH DATA
+    # ========================
+    files_clean = [f for i, f in enumerate(files) if i not in duplicates]
+    total = len(files_clean)
+    if max_images and total > max_images:
+        rng = np.random.default_rng(SEED)
+        to_remove = [files_clean[i] for i in rng.permutation(total)[max_images:]]
+        for f in to_remove:
+            move(folder, f, removed_dir, dry_run)
+        print(f"🗑️ Dipindahkan {len(to_remove)} gambar ke {removed_dir}")
+        total = max_images
+    elif total < min_images:
+        print(f"⚠️ Data kurang dari {min_images}! Sebaiknya tambah dataset.")
+    print(f"✅ Jumlah akhir: {total} gambar")
+    return len(duplicates), total
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(flag, default, cast=str):
+        if flag not in args:
+            return default
+        i = args.index(flag)
+        value = args.pop(i + 1)
+        args.pop(i)
+        return cast(value)
+
+    threshold = option("--threshold", THRESHOLD, float)
+    max_images = option("--max", MAX_IMAGES, int)
+    min_images = option("--min", MIN_IMAGES, int)
+    batch_size = option("--batch", BATCH_SIZE, int)
+    dry_run = "--dry-run" in args
+    args = [a for a in args if a != "--dry-run"]
+    if len(args) != 1:
+        sys.exit(__doc__)
+
+    folder = os.path.normpath(args[0])
+    classes = class_folders(folder)
+    # Folder kelas: split-nya adalah parent, jadi hasil tetap di luar split
+    split_dir = os.path.dirname(os.path.abspath(folder)) if classes == [folder] else folder
+    dup_root, removed_root = f"{split_dir}_duplicates", f"{split_dir}_removed"
+
+    total_dup = total_final = 0
+    for class_dir in classes:
+        name = os.path.basename(class_dir)
+        dup, final = clean_class(
+            class_dir, os.path.join(dup_root, name), os.path.join(removed_root, name),
+            threshold, max_images, min_images, batch_size, dry_run,
+        )
+        total_dup += dup
+        total_final += final
+
+    print(f"\n📊 {len(classes)} kelas: {total_dup} duplikat, {total_final} gambar tersisa"
+          + (" (dry run, tidak ada file dipindah)" if dry_run else ""))
+    print(f"📁 Folder duplicate: {dup_root}")
+    print(f"📁 Folder removed: {removed_root}")
@@ -0,0 +1,142 @@
+"""
+Pipeline input tf.data untuk training EfficientNetB0
+====================================================
+Pengganti ImageDataGenerator.flow_from_directory di train.py dan
+train_model.py. Susunan kelas & label sama (subfolder diurutkan nama,
+one-hot), bedanya:
+
+- decode + resize berjalan paralel (map dengan num_parallel_calls),
+  bukan di satu thread Python. Decoder-nya PIL (decode_pixels, sama
+  dengan server), jadi semua format flow_from_directory terbaca,
+  termasuk .bmp/.ppm/.tif yang tidak didukung tf.io.decode_image;
+- augmentasi memakai layer preprocessing Keras yang dijalankan per batch
+  (tervektorisasi, tetap di CPU di dalam pipeline tf.data);
+- gambar valid/test yang sudah di-decode + resize di-cache setelah epoch
+  pertama;
+- prefetch(AUTOTUNE) supaya batch berikutnya disiapkan selagi model
+  memproses batch sekarang.
+
+Kalau folder sudah di-pack dengan pack_dataset.py (dataset_shards.py),
+gambar dibaca dari shard uint8 yang sudah di-resize, bukan di-decode ulang.
+
+Dipakai:
+    from dataset_pipeline import train_dataset, eval_dataset
+    train_ds, class_names = train_dataset("dataset/dataset_jadi/train_augmented")
+    valid_ds, _ = eval_dataset("dataset/dataset_jadi/valid")
+"""
+
+import itertools
+import math
+
+import tensorflow as tf
+
+from dataset_shards import find_split, list_images
+from inference.image_preprocessing import decode_pixels
+
+IMG_SIZE = (224, 224)
+BATCH_SIZE = 32
+SEED = 42
+AUTOTUNE = tf.data.AUTOTUNE
+
+TRAIN_DIR = "dataset/dataset_jadi/train_augmented"
+VALID_DIR = "dataset/dataset_jadi/valid"
+TEST_DIR = "dataset/dataset_jadi/test"
+
+
+def augmentation(rotation=20, zoom=0.2, shift=0.1, seed=SEED):
+    """
+    Padanan augmentasi ImageDataGenerator (rotation_range dalam derajat,
+    zoom_range, width/height_shift_range, horizontal_flip, fill 'nearest').
+    """
+    return tf.keras.Sequential([
+        tf.keras.layers.RandomFlip("horizontal", seed=seed),
+        tf.keras.layers.RandomRotation(rotation / 360, fill_mode="nearest", seed=seed),
+        tf.keras.layers.RandomZoom(zoom, fill_mode="nearest", seed=seed),
+        tf.keras.layers.RandomTranslation(shift, shift, fill_mode="nearest", seed=seed),
+    ], name="augmentasi")
+
+
+def decode(path, img_size=IMG_SIZE):
+    # decode_pixels lewat numpy_function: PIL melepas GIL saat decode/resize,
+    # jadi map paralel tetap jalan bersamaan. Skala 0..1 seperti rescale=1./255
+    image = tf.numpy_function(
+        lambda p: decode_pixels(p.decode(), tuple(img_size)), [path], tf.uint8, stateful=False
+    )
+    image.set_shape((img_size[1], img_size[0], 3))
+    return tf.cast(image, tf.float32) / 255.0
+
+
+def shard_dataset(split, training, batch_size=BATCH_SIZE, augment=None, seed=SEED):
+    """
+    Dataset dari shard (dataset_shards.ShardSplit). Saat training setiap
+    epoch memakai seed berbeda, jadi urutan shard & isi batch berganti.
+    Tidak perlu cache: membaca shard lewat mmap sudah murah.
+    """
+    num_classes = len(split.class_names)
+    epochs = itertools.count()
+    height, width = split.img_size[1], split.img_size[0]
+
+    ds = tf.data.Dataset.from_generator(
+        lambda: split.batches(batch_size, shuffle=training, seed=seed + next(epochs), scale=False),
+        output_signature=(
+            tf.TensorSpec((None, height, width, 3), tf.uint8),
+            tf.TensorSpec((None,), tf.int32),
+        ),
+    )
+    # from_generator tidak tahu jumlah batch; len(ds) dipakai benchmark & progress bar
+    ds = ds.apply(tf.data.experimental.assert_cardinality(math.ceil(len(split) / batch_size)))
+    ds = ds.map(
+        lambda x, y: (tf.cast(x, tf.float32) / 255.0, tf.one_hot(y, num_classes)),
+        num_parallel_calls=AUTOTUNE,
+    )
+    if augment is not None:
+        ds = ds.map(lambda x, y: (augment(x, training=True), y), num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE), split.class_names
+
+
+def build_dataset(folder, training, batch_size=BATCH_SIZE, img_size=IMG_SIZE, augment=None,
+                  cache=False, class_names=None, seed=SEED):
+    """
+    Mengembalikan (dataset, class_names). `cache` True = cache di RAM,
+    string = path file cache di disk (untuk dataset yang tidak muat di RAM).
+    Folder yang sudah di-pack dibaca dari shard (`cache` diabaikan).
+    """
+    # Sumber data selalu dicetak: manifest shard yang ada/hilang mengganti
+    # jalur baca tanpa perubahan kode
+    split = find_split(folder, img_size, class_names)
+    if split is not None:
+        print(f"📦 {folder}: {len(split)} gambar dari shard {split.shard_dir} (decoder: {split.decoder})")
+        return shard_dataset(split, training, batch_size, augment, seed)
+
+    paths, labels, class_names = list_images(folder, class_names)
+    if not paths:
+        raise ValueError(f"Tidak ada gambar di {folder}")
+    print(f"🖼️ {folder}: {len(paths)} gambar dari file (decoder: {decode_pixels.__module__}.decode_pixels)")
+    num_classes = len(class_names)
+
+    ds = tf.data.Dataset.from_tensor_slices((paths, labels))
+    if training:
+        # Acak path (murah), bukan gambar hasil decode
+        ds = ds.shuffle(len(paths), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.map(
+        lambda path, label: (decode(path, img_size), tf.one_hot(label, num_classes)),
+        num_parallel_calls=AUTOTUNE,
+        deterministic=not training,
+    )
+    if cache:
+        ds = ds.cache(cache if isinstance(cache, str) else "")
+    ds = ds.batch(batch_size)
+    if augment is not None:
+        ds = ds.map(lambda x, y: (augment(x, training=True), y), num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(AUTOTUNE), class_names
+
+
+def train_dataset(folder=TRAIN_DIR, batch_size=BATCH_SIZE, augment="default", **kwargs):
+    if augment == "default":
+        augment = augmentation()
+    return build_dataset(folder, True, batch_size, augment=augment, **kwargs)
+
+
+def eval_dataset(folder=VALID_DIR, batch_size=BATCH_SIZE, cache=True, **kwargs):
+    # Valid/test tidak diacak dan tidak diaugmentasi, jadi aman di-cache
+    return build_dataset(folder, False, batch_size, cache=cache, **kwargs)
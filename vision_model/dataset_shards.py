@@ -0,0 +1,204 @@
+"""
+Shard dataset gambar yang sudah di-decode + resize
+==================================================
+pack_dataset.py men-decode setiap gambar di dataset/dataset_jadi SEKALI
+(decoder yang sama dengan server: inference.image_preprocessing.decode_pixels)
+lalu menyimpannya sebagai array uint8 (N, 224, 224, 3) dalam beberapa file
+.npy besar. Training, evaluasi dan statistik dataset cukup membaca
+beberapa shard secara berurutan, tanpa membuka ribuan JPEG kecil.
+
+Isi folder shard (default dataset/shards, env VISION_SHARDS):
+
+    manifest.json            kelas, jumlah per split/kelas, sha256 tiap file
+    train-00000.npy          gambar uint8 (N, H, W, 3)
+    train-00000-labels.npy   indeks kelas int32 (N,)
+    ...
+
+Urutan gambar di dalam split diacak sekali saat packing (seed tetap),
+jadi satu shard berisi campuran kelas dan pengacakan saat training cukup
+di level shard + di dalam shard. manifest.json ditulis paling akhir;
+selama packing berjalan reader tetap memakai file gambar asli.
+
+Shard tidak ikut berubah kalau isi folder gambar berubah: jalankan ulang
+pack_dataset.py setelah menambah/menghapus gambar.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference.image_preprocessing import IMG_SIZE
+
+SHARD_DIR = os.environ.get("VISION_SHARDS", "dataset/shards")
+MANIFEST = "manifest.json"
+VERSION = 1
+SEED = 42
+# Ekstensi yang dibaca flow_from_directory
+EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".ppm", ".tif", ".tiff")
+
+
+def list_images(folder, class_names=None):
+    """
+    Path gambar + indeks label, urutannya sama dengan flow_from_directory
+    (kelas urut nama, file urut nama di dalam tiap kelas).
+    """
+    if class_names is None:
+        class_names = sorted(d for d in os.listdir(folder) if os.path.isdir(os.path.join(folder, d)))
+    paths, labels = [], []
+    for label, name in enumerate(class_names):
+        for root, _, files in sorted(os.walk(os.path.join(folder, name))):
+            for f in sorted(files):
+                if f.lower().endswith(EXTENSIONS):
+                    paths.append(os.path.join(root, f))
+                    labels.append(label)
+    return paths, labels, class_names
+
+
+def sha256_file(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest(shard_dir=SHARD_DIR):
+    # None kalau belum pernah di-pack
+    path = os.path.join(shard_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != VERSION:
+        print(f"⚠️ Versi manifest {path} tidak dikenal, shard diabaikan (jalankan ulang pack_dataset.py)")
+        return None
+    return manifest
+
+
+class ShardSplit:
+    """Satu split (train/valid/test) dari manifest."""
+
+    def __init__(self, manifest, name, shard_dir=SHARD_DIR):
+        info = manifest["splits"][name]
+        self.name = name
+        self.shard_dir = shard_dir
+        self.source = info["source"]
+        self.class_names = list(manifest["class_names"])
+        self.img_size = tuple(manifest["img_size"])
+        self.decoder = manifest.get("decoder", "?")
+        self.count = info["count"]
+        self.class_counts = info["class_counts"]
+        self.errors = info.get("errors", [])
+        self.files = info["shards"]
+
+    def __len__(self):
+        return self.count
+
+    def _path(self, name):
+        return os.path.join(self.shard_dir, name)
+
+    def fingerprint(self):
+        # Berubah kalau isi shard berubah (dipakai kunci cache fitur)
+        h = hashlib.sha1()
+        for shard in self.files:
+            h.update(f"{shard['sha256']['images']}{shard['sha256']['labels']}".encode())
+        return h.hexdigest()[:16]
+
+    def shards(self):
+        # (gambar memmap uint8 read-only, label) per shard, urutan manifest
+        for shard in self.files:
+            images = np.load(self._path(shard["images"]), mmap_mode="r")
+            labels = np.load(self._path(shard["labels"]))
+            yield images, labels
+
+    def labels(self):
+        return np.concatenate([np.load(self._path(s["labels"])) for s in self.files])
+
+    def batches(self, batch_size=32, shuffle=False, seed=SEED, scale=True):
+        """
+        Iterasi (x, y) per batch. x float32 0..1 (scale=True) atau uint8,
+        y indeks kelas int32. Batch boleh melewati batas shard.
+
+        shuffle=False: slice berurutan langsung dari memmap.
+        shuffle=True : urutan shard diacak, lalu tiap shard dibaca utuh
+        (satu baca sekuensial) dan diacak di memori.
+        """
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.files)) if shuffle else range(len(self.files))
+        pending_x, pending_y, pending_n = [], [], 0
+
+        for i in order:
+            shard = self.files[i]
+            images = np.load(self._path(shard["images"]), mmap_mode="r")
+            labels = np.load(self._path(shard["labels"]))
+            if shuffle:
+                perm = rng.permutation(len(labels))
+                images, labels = np.asarray(images)[perm], labels[perm]
+
+            start = 0
+            while start < len(labels):
+                take = min(batch_size - pending_n, len(labels) - start)
+                pending_x.append(images[start:start + take])
+                pending_y.append(labels[start:start + take])
+                pending_n += take
+                start += take
+                if pending_n == batch_size:
+                    yield self._batch(pending_x, pending_y, scale)
+                    pending_x, pending_y, pending_n = [], [], 0
+        if pending_n:
+            yield self._batch(pending_x, pending_y, scale)
+
+    @staticmethod
+    def _batch(xs, ys, scale):
+        x = xs[0] if len(xs) == 1 else np.concatenate(xs)
+        y = ys[0] if len(ys) == 1 else np.concatenate(ys)
+        if scale:
+            x = np.divide(x, np.float32(255.0), dtype=np.float32)
+        else:
+            x = np.ascontiguousarray(x)
+        return x, y
+
+    def verify(self):
+        # Nama file yang hash-nya tidak cocok dengan manifest (atau hilang)
+        bad = []
+        for shard in self.files:
+            for kind in ("images", "labels"):
+                path = self._path(shard[kind])
+                if not os.path.exists(path) or sha256_file(path) != shard["sha256"][kind]:
+                    bad.append(shard[kind])
+        return bad
+
+
+def open_split(name, shard_dir=SHARD_DIR):
+    manifest = load_manifest(shard_dir)
+    if manifest is None or name not in manifest["splits"]:
+        return None
+    return ShardSplit(manifest, name, shard_dir)
+
+
+def find_split(folder, img_size=IMG_SIZE, class_names=None, shard_dir=SHARD_DIR):
+    """
+    Split yang di-pack dari `folder`, atau None kalau tidak ada / tidak
+    cocok (ukuran gambar atau susunan kelas berbeda) sehingga pemanggil
+    kembali membaca file gambar.
+    """
+    manifest = load_manifest(shard_dir)
+    if manifest is None:
+        return None
+    folder = os.path.normpath(os.path.abspath(folder))
+    for name, info in manifest["splits"].items():
+        if os.path.normpath(os.path.abspath(info["source"])) != folder:
+            continue
+        split = ShardSplit(manifest, name, shard_dir)
+        if split.img_size != tuple(img_size):
+            return None
+        if class_names is not None and list(class_names) != split.class_names:
+            return None
+        return split
+    return None
@@ -0,0 +1,81 @@
+"""
+Ekspor EfficientNetB0 (.keras) ke TFLite terkuantisasi
+======================================================
+Dua varian, dipilih di server lewat VISION_ENGINE:
+
+- tflite-dynamic : bobot int8, aktivasi float (tanpa data kalibrasi)
+- tflite-int8    : full integer (bobot + aktivasi int8, input/output uint8),
+                   dikalibrasi dengan sampel gambar dari dataset_jadi/valid
+
+Gambar kalibrasi di-decode dengan inference.image_preprocessing, sama
+persis dengan jalur serving, supaya rentang aktivasi yang diukur cocok.
+
+Jalankan: python export_tflite.py [dynamic|int8|all] [jumlah_kalibrasi]
+          (default: all, 200 gambar)
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import tensorflow as tf
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference.image_preprocessing import decode_image
+from inference.ingredient import MODEL_FILES
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "model")
+MODEL_PATH = os.path.join(MODEL_DIR, MODEL_FILES["keras"])
+CALIB_DIR = "dataset/dataset_jadi/valid"
+JUMLAH_KALIBRASI = 200
+SEED = 42
+
+
+def calibration_paths(folder=CALIB_DIR, n=JUMLAH_KALIBRASI):
+    # Sampel acak tapi tetap (seed) dan merata dari semua kelas
+    paths = []
+    for root, _, files in os.walk(folder):
+        paths += [os.path.join(root, f) for f in sorted(files) if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+    random.Random(SEED).shuffle(paths)
+    return paths[:n]
+
+
+def representative_dataset(paths):
+    def gen():
+        for path in paths:
+            yield [decode_image(path)[np.newaxis]]
+    return gen
+
+
+def convert(model, mode, calib_paths=None):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == "int8":
+        converter.representative_dataset = representative_dataset(calib_paths)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.uint8
+        converter.inference_output_type = tf.uint8
+    return converter.convert()
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "all"
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else JUMLAH_KALIBRASI
+    modes = ["dynamic", "int8"] if mode == "all" else [mode]
+
+    print(f"📦 Memuat model dari: {MODEL_PATH}")
+    model = tf.keras.models.load_model(MODEL_PATH)
+
+    calib = calibration_paths(n=n) if "int8" in modes else None
+    if calib is not None:
+        print(f"🎯 {len(calib)} gambar kalibrasi dari {CALIB_DIR}")
+
+    for m in modes:
+        out_path = os.path.join(MODEL_DIR, MODEL_FILES[f"tflite-{m}"])
+        data = convert(model, m, calib)
+        with open(out_path, "wb") as f:
+            f.write(data)
+        print(f"✅ tflite-{m}: {os.path.abspath(out_path)} ({len(data) / 1e6:.1f} MB)")
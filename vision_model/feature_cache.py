@@ -0,0 +1,129 @@
+"""
+Cache fitur backbone beku untuk training tahap 1
+================================================
+Di tahap 1 EfficientNetB0 dibekukan, jadi keluaran GlobalAveragePooling2D
+untuk satu gambar selalu sama. Fitur itu dihitung SEKALI per dataset
+(dan per varian augmentasi), disimpan sebagai .npy yang dibaca lewat
+mmap, lalu head (BatchNorm/Dense/Dropout) dilatih langsung di atasnya,
+tanpa forward pass backbone di setiap epoch.
+
+- varian 0    : gambar asli (tanpa augmentasi)
+- varian 1..V : satu lintasan augmentasi acak (seed berbeda per varian)
+
+Nama file cache memuat sidik dataset (path, ukuran, mtime), ukuran
+gambar, bobot backbone dan konfigurasi augmentasi; kalau ada yang
+berubah, fitur dihitung ulang.
+
+Dipakai di train.py / train_model.py dengan VISION_STAGE1=features.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from dataset_pipeline import BATCH_SIZE, IMG_SIZE, SEED, augmentation, build_dataset, list_images
+from dataset_shards import find_split
+
+CACHE_DIR = "model/feature_cache"
+# Jumlah varian per gambar train (1 = hanya gambar asli; train_augmented
+# sudah berisi augmentasi offline dari augmentasi.py)
+VARIANTS = int(os.environ.get("VISION_FEATURE_VARIANTS", "1"))
+
+
+def pooled_backbone(base_model):
+    # Backbone + GlobalAveragePooling2D: keluaran yang masuk ke head
+    pooled = tf.keras.layers.GlobalAveragePooling2D()(base_model.output)
+    return tf.keras.Model(base_model.input, pooled, name=f"{base_model.name}_pooled")
+
+
+def cache_key(paths, **config):
+    h = hashlib.sha1()
+    for path in paths:
+        st = os.stat(path)
+        h.update(f"{path}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    h.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:16]
+
+
+def extract_features(extractor, folder, class_names, variant=0, augment_config=None, weights="imagenet",
+                     batch_size=BATCH_SIZE, img_size=IMG_SIZE, cache_dir=CACHE_DIR):
+    """
+    Fitur (N, dim) sebagai memmap read-only + label (N,) untuk `folder`,
+    urutannya sama dengan build_dataset (file gambar: urutan list_images;
+    shard: urutan shard). Dihitung kalau belum ada di cache.
+    """
+    augment_config = augment_config if variant > 0 else None
+    paths, _, _ = list_images(folder, class_names)
+    split = find_split(folder, img_size, class_names)
+    key = cache_key(paths, model=extractor.name, weights=weights, img_size=img_size,
+                    variant=variant, augment=augment_config, shards=split and split.fingerprint())
+    name = os.path.basename(os.path.normpath(folder))
+    path = os.path.join(cache_dir, f"{name}_v{variant}_{key}.npy")
+    labels_path = os.path.join(cache_dir, f"{name}_v{variant}_{key}_labels.npy")
+
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        augment = augmentation(**augment_config, seed=SEED + variant) if augment_config else None
+        ds, _ = build_dataset(folder, False, batch_size, img_size, augment=augment, class_names=class_names,
+                              seed=SEED + variant)
+        dim = extractor.output_shape[-1]
+        count = len(split) if split is not None else len(paths)  # shard melewati gambar rusak
+        tmp_path = path + ".tmp.npy"
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(count, dim))
+        labels = np.empty(count, dtype=np.int64)
+        start = 0
+        for x, y in ds:
+            feats = extractor.predict_on_batch(x)
+            out[start:start + len(feats)] = feats
+            labels[start:start + len(feats)] = np.argmax(y, axis=1)
+            start += len(feats)
+        out.flush()
+        del out
+        np.save(labels_path, labels)
+        os.replace(tmp_path, path)  # cache setengah jadi tidak pernah terbaca
+        print(f"💾 Fitur {name} varian {variant}: {count} gambar -> {path}")
+
+    return np.load(path, mmap_mode="r"), np.load(labels_path)
+
+
+def head_model(base_model, head_layers):
+    # Sequential di atas fitur pooled dari objek layer yang SAMA dengan model
+    # penuh (bobot dipakai bersama); model penuh tetap menyusunnya datar
+    features = tf.keras.Input(shape=(base_model.output_shape[-1],))
+    return tf.keras.Sequential([features] + list(head_layers), name="head")
+
+
+def fit_head_on_features(base_model, head_layers, train_dir, valid_dir, class_names, epochs, optimizer,
+                         callbacks=(), class_weight=None, variants=VARIANTS, augment_config=None,
+                         batch_size=BATCH_SIZE, img_size=IMG_SIZE):
+    """
+    Latih layer head (list layer yang sudah dipakai model penuh setelah
+    GlobalAveragePooling2D) di atas fitur cache. Layer-nya dipakai bersama,
+    jadi setelah fungsi ini selesai model penuh sudah membawa bobot head
+    hasil training.
+    """
+    head = head_model(base_model, head_layers)
+    if augment_config is None:
+        augment_config = {"rotation": 20, "zoom": 0.2, "shift": 0.1}
+    extractor = pooled_backbone(base_model)
+    options = {"batch_size": batch_size, "img_size": img_size}
+
+    train = [extract_features(extractor, train_dir, class_names, v, augment_config, **options) for v in range(variants)]
+    x_train = np.concatenate([f for f, _ in train]) if variants > 1 else train[0][0]
+    y_train = np.concatenate([l for _, l in train])
+    x_valid, y_valid = extract_features(extractor, valid_dir, class_names, **options)
+
+    num_classes = len(class_names)
+    head.compile(optimizer=optimizer, loss="categorical_crossentropy", metrics=["accuracy"])
+    return head.fit(
+        x_train, np.eye(num_classes, dtype=np.float32)[y_train],
+        validation_data=(np.asarray(x_valid), np.eye(num_classes, dtype=np.float32)[y_valid]),
+        epochs=epochs,
+        batch_size=batch_size,
+        shuffle=True,
+        callbacks=list(callbacks),
+        class_weight=class_weight,
+    )
@@ -0,0 +1,158 @@
+"""
+Packer shard dataset (sekali jalan)
+===================================
+Decode + resize semua gambar train/valid/test di dataset/dataset_jadi
+ke shard uint8 .npy + manifest.json (lihat dataset_shards.py). Decode
+berjalan paralel di beberapa proses; gambar yang gagal dibuka dilewati
+dan dicatat di manifest.
+
+Jalankan: python pack_dataset.py [--out DIR] [--shard-size N] [--workers N]
+          (default: dataset/shards, 1024 gambar per shard, semua CPU)
+
+Reader (train.py, predict_test.py, ...) hanya mencari shard di
+VISION_SHARDS (default dataset/shards). Kalau memakai --out DIR lain,
+jalankan training dengan VISION_SHARDS=DIR juga; tanpa itu shard tidak
+ditemukan dan training kembali membaca file gambar (terlihat dari log
+"dari file" di dataset_pipeline.build_dataset).
+"""
+
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from dataset_shards import (
+    IMG_SIZE, MANIFEST, SEED, SHARD_DIR, VERSION, list_images, sha256_file,
+)
+from inference.image_preprocessing import decode_pixels
+
+SHARD_SIZE = 1024
+SPLITS = {
+    "train": "dataset/dataset_jadi/train_augmented",
+    "valid": "dataset/dataset_jadi/valid",
+    "test": "dataset/dataset_jadi/test",
+}
+
+
+def _decode(path):
+    try:
+        return decode_pixels(path, IMG_SIZE), None
+    except Exception as e:  # file rusak / bukan gambar
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _save(path, array):
+    # Tulis ke file sementara lalu rename: shard setengah jadi tidak pernah terbaca
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+    return sha256_file(path)
+
+
+def pack_split(pool, name, folder, class_names, out_dir, shard_size=SHARD_SIZE):
+    paths, labels, _ = list_images(folder, class_names)
+    # Acak sekali supaya tiap shard berisi campuran kelas
+    order = np.random.default_rng(SEED).permutation(len(paths))
+    paths = [paths[i] for i in order]
+    labels = np.asarray(labels, dtype=np.int32)[order]
+
+    shards, errors = [], []
+    class_counts = np.zeros(len(class_names), dtype=np.int64)
+    for start in range(0, len(paths), shard_size):
+        chunk = paths[start:start + shard_size]
+        images = np.empty((len(chunk),) + IMG_SIZE[::-1] + (3,), dtype=np.uint8)
+        keep = np.zeros(len(chunk), dtype=bool)
+        for i, (pixels, error) in enumerate(pool.imap(_decode, chunk, chunksize=16)):
+            if error is None:
+                images[i] = pixels
+                keep[i] = True
+            else:
+                errors.append({"path": chunk[i], "error": error})
+        if not keep.any():
+            continue
+
+        base = f"{name}-{len(shards):05d}"
+        shard_labels = labels[start:start + shard_size][keep]
+        shards.append({
+            "images": f"{base}.npy",
+            "labels": f"{base}-labels.npy",
+            "count": int(keep.sum()),
+            "sha256": {
+                "images": _save(os.path.join(out_dir, f"{base}.npy"), images[keep]),
+                "labels": _save(os.path.join(out_dir, f"{base}-labels.npy"), shard_labels),
+            },
+        })
+        class_counts += np.bincount(shard_labels, minlength=len(class_names))
+        print(f"   • {base}: {shards[-1]['count']} gambar")
+
+    return {
+        "source": folder,
+        "count": int(class_counts.sum()),
+        "class_counts": {c: int(n) for c, n in zip(class_names, class_counts)},
+        "errors": errors,
+        "shards": shards,
+    }
+
+
+def pack(splits=SPLITS, out_dir=SHARD_DIR, shard_size=SHARD_SIZE, workers=None):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    # Manifest lama dibuang dulu: selama packing reader kembali ke file gambar
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    # Susunan kelas dari split pertama (train), dipakai semua split
+    # seperti class_names=class_names di train.py
+    _, _, class_names = list_images(next(iter(splits.values())))
+    manifest = {
+        "version": VERSION,
+        "img_size": list(IMG_SIZE),
+        "dtype": "uint8",
+        "decoder": "inference.image_preprocessing.decode_pixels",
+        "shard_size": shard_size,
+        "seed": SEED,
+        "class_names": class_names,
+        "splits": {},
+    }
+
+    with Pool(workers) as pool:
+        for name, folder in splits.items():
+            if not os.path.isdir(folder):
+                print(f"⚠️ {folder} tidak ada, split {name} dilewati")
+                continue
+            start = time.perf_counter()
+            print(f"📦 {name}: {folder}")
+            info = manifest["splits"][name] = pack_split(pool, name, folder, class_names, out_dir, shard_size)
+            print(f"✅ {name}: {info['count']} gambar, {len(info['shards'])} shard, "
+                  f"{len(info['errors'])} gagal ({time.perf_counter() - start:.1f} s)")
+
+    # Shard sisa packing sebelumnya (mis. dataset mengecil) dihapus
+    used = {s[kind] for info in manifest["splits"].values() for s in info["shards"] for kind in ("images", "labels")}
+    for f in os.listdir(out_dir):
+        if f.endswith(".npy") and f not in used:
+            os.remove(os.path.join(out_dir, f))
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+    print(f"📝 Manifest: {manifest_path}")
+    if os.path.abspath(out_dir) != os.path.abspath(SHARD_DIR):
+        print(f"⚠️ Reader mencari shard di {SHARD_DIR}; set VISION_SHARDS={out_dir} supaya shard ini dipakai")
+    return manifest
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(flag, default, cast=str):
+        return cast(args[args.index(flag) + 1]) if flag in args else default
+
+    pack(
+        out_dir=option("--out", SHARD_DIR),
+        shard_size=option("--shard-size", SHARD_SIZE, int),
+        workers=option("--workers", None, int),
+    )
@@ -1,88 +1,207 @@
+import time
+STARTED = time.perf_counter()
+
+import io
 import os
-import numpy as np
-from flask import Flask, request, jsonify
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing import image
-
-app = Flask(__name__)
-
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "efficientnetb0_final.keras")
-
-try:
-    model = load_model(MODEL_PATH)
-    print("✅ Model CNN berhasil dimuat.")
-except Exception as e:
-    print(f"❌ Gagal memuat model CNN: {e}")
-    model = None
-
-class_names = ['Bawang_bombai', 'alpukat', 'ayam', 'bawang_merah', 'bawang_putih', 
-               'bayam', 'cabai', 'daun_bawang', 'daun_jeruk', 'jagung', 'jahe', 
-               'kacang_hitam', 'keluwak', 'kembang_turi', 'kemiri', 'kentang', 'kunyit', 
-               'lemon', 'lengkuas', 'madu', 'mentega', 'paprika', 'santan', 'serai', 
-               'telur', 'terong', 'timun', 'tomat', 'wortel']
-
-def predict_food_image(img_path):
-    if model is None:
+import sys
+import threading
+from flask import Flask, Request, request, jsonify
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# IngredientClassifier / CLASS_NAMES diimport saat dipakai: modul ini ikut
+# diimport chatbot_server, dan inference.ingredient memuat PIL + numpy decoder
+from inference import StartupTimeline
+
+
+def memory_stream_factory(total_content_length, content_type, filename=None, content_length=None):
+    # Upload selalu ditampung di RAM (default Werkzeug: file temp kalau > 500 KB)
+    return io.BytesIO()
+
+
+class InMemoryRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return memory_stream_factory(total_content_length, content_type, filename, content_length)
+
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "model")
+# Jumlah proses worker (inference/prefork.py)
+WORKERS = int(os.environ.get("VISION_WORKERS", "1"))
+# keras | tflite-dynamic | tflite-int8 (file .tflite dibuat oleh export_tflite.py).
+# Multi-worker default tflite-dynamic tanpa XNNPACK: satu salinan bobot di
+# page cache untuk semua worker. Dengan keras setiap worker memuat model
+# sendiri (memori ~N x satu proses, lihat chatbot/benchmark_memory.py)
+PREFORK = WORKERS > 1
+ENGINE = os.environ.get("VISION_ENGINE", "tflite-dynamic" if PREFORK else "keras").lower()
+TFLITE_THREADS = int(os.environ.get("VISION_TFLITE_THREADS", str(os.cpu_count() or 1)))
+# fast = draft mode JPEG + buffer batch, keras = load_img penuh (pembanding)
+DECODER = os.environ.get("VISION_DECODER", "fast").lower()
+# Ukuran batch maksimum untuk /predict_images
+BATCH_SIZE = int(os.environ.get("VISION_BATCH_SIZE", "16"))
+# Batas total upload per request (Laravel membatasi 5 MB per file)
+MAX_UPLOAD_MB = int(os.environ.get("VISION_MAX_UPLOAD_MB", "64"))
+# 0 = XNNPACK mati: bobot dibaca langsung dari file .tflite yang di-mmap
+# (satu salinan fisik untuk semua worker), dengan latensi lebih tinggi.
+# Default 0 kalau multi-worker, 1 kalau satu proses
+TFLITE_XNNPACK = os.environ.get("VISION_TFLITE_XNNPACK", "0" if PREFORK else "1") == "1"
+# Jumlah alternatif label per gambar dan ambang "unknown" (persen, 0 = tidak
+# pernah ditolak); bisa diganti per request lewat ?top_k=...&threshold=...
+TOP_K = int(os.environ.get("VISION_TOP_K", "3"))
+UNKNOWN_THRESHOLD = float(os.environ.get("VISION_UNKNOWN_THRESHOLD", "0"))
+
+
+def load_vision_model(engine=ENGINE):
+    from inference import IngredientClassifier
+
+    return IngredientClassifier.load(
+        MODEL_DIR, engine, num_threads=TFLITE_THREADS, xnnpack=TFLITE_XNNPACK, decoder=DECODER, batch_size=BATCH_SIZE
+    )
+
+
+# Model dimuat saat pertama dipakai, bukan saat modul diimport, supaya
+# chatbot_server yang mengimport modul ini tidak ikut membayar load CNN
+_classifier = None
+_load_error = None
+_load_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # predict_image.class_names tetap ada tanpa import PIL saat modul dimuat
+    if name == "class_names":
+        from inference.ingredient import CLASS_NAMES
+        return CLASS_NAMES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_classifier():
+    """Classifier CNN (dimuat sekali per proses), None kalau load gagal."""
+    global _classifier, _load_error
+    if _classifier is None and _load_error is None:
+        with _load_lock:
+            if _classifier is None and _load_error is None:
+                try:
+                    _classifier = load_vision_model()
+                    print(f"✅ Model CNN berhasil dimuat. (engine: {ENGINE})")
+                except Exception as e:
+                    _load_error = e
+                    print(f"❌ Gagal memuat model CNN: {e}")
+    return _classifier
+
+
+def prediction_options(values):
+    """top_k & threshold dari query string / field form, default dari env."""
+    from inference.ingredient import CLASS_NAMES
+
+    top_k = values.get("top_k", TOP_K, type=int)
+    threshold = values.get("threshold", UNKNOWN_THRESHOLD, type=float)
+    return {"top_k": min(max(top_k, 1), len(CLASS_NAMES)), "threshold": min(max(threshold, 0.0), 100.0)}
+
+
+def predict_food(source, top_k=TOP_K, threshold=UNKNOWN_THRESHOLD):
+    """Prediksi satu gambar dari bytes, file-like (mis. file.stream) atau path."""
+    classifier = get_classifier()
+    if classifier is None:
         return {"error": "Model belum dimuat dengan benar."}
 
-    img = image.load_img(img_path, target_size=(224, 224))
-    img_array = image.img_to_array(img) / 255.0
-    img_array = np.expand_dims(img_array, axis=0)
+    probs, _, errors = classifier.predict_batch([source])
+    if errors:
+        return {"error": errors[0]}
+
+    return classifier.format(probs[0], top_k, threshold)
 
-    preds = model.predict(img_array)
-    pred_idx = int(np.argmax(preds[0]))
-    confidence = float(np.max(preds[0]))
 
-    return {
-        "predicted_label": class_names[pred_idx],
-        "confidence": round(confidence * 100, 2),
-        "index": pred_idx
-    }
+def predict_food_image(img_path, **options):
+    return predict_food(img_path, **options)
 
-# ✅ Tambahkan endpoint ini!
-@app.route("/predict_image", methods=["POST"])
-def predict_image_api():
-    if "file" not in request.files:
-        return jsonify({"error": "Tidak ada file gambar yang dikirim"}), 400
 
-    file = request.files["file"]
-    img_path = os.path.join("temp", file.filename)
+def warmup():
+    # Semua ukuran batch yang bisa dipakai /predict_images + decoder JPEG
+    classifier = get_classifier()
+    if classifier is None:
+        raise RuntimeError(f"Model CNN belum dimuat: {_load_error}")
+    classifier.warmup()
 
-    os.makedirs("temp", exist_ok=True)
-    file.save(img_path)
 
-    result = predict_food_image(img_path)
+def create_app(timeline=None):
+    app = Flask(__name__)
+    app.request_class = InMemoryRequest
+    app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_MB * 1024 * 1024
 
-    os.remove(img_path)  # hapus file sementara setelah diprediksi
+    # ✅ Tambahkan endpoint ini!
+    @app.route("/predict_image", methods=["POST"])
+    def predict_image_api():
+        if "file" not in request.files:
+            return jsonify({"error": "Tidak ada file gambar yang dikirim"}), 400
 
-    return jsonify(result)
+        # Decode langsung dari stream request, tanpa file sementara
+        result = predict_food(request.files["file"].stream, **prediction_options(request.values))
 
-@app.route("/predict_images", methods=["POST"])
-def predict_multiple_images():
-    if "files[]" not in request.files:
-        return jsonify({"status": "error", "message": "Tidak ada file"}), 400
+        return jsonify(result)
 
-    files = request.files.getlist("files[]")
-    results = []
+    @app.route("/ready", methods=["GET"])
+    def ready():
+        if timeline is None:
+            return jsonify({"ready": get_classifier() is not None})
+        return jsonify(timeline.as_dict()), 200 if timeline.ready else 503
 
-    os.makedirs("temp", exist_ok=True)
+    @app.route("/predict_images", methods=["POST"])
+    def predict_multiple_images():
+        if "files[]" not in request.files:
+            return jsonify({"status": "error", "message": "Tidak ada file"}), 400
+        classifier = get_classifier()
+        if classifier is None:
+            return jsonify({"status": "error", "message": "Model belum dimuat dengan benar."}), 500
 
-    for file in files:
-        path = os.path.join("temp", file.filename)
-        file.save(path)
+        files = request.files.getlist("files[]")
+        results = [{"filename": file.filename} for file in files]
 
-        pred = predict_food_image(path)
-        os.remove(path)
+        # Decode semua file langsung ke buffer batch lalu satu (atau beberapa)
+        # forward pass; file yang gagal dicatat tanpa menggagalkan yang lain.
+        # Top-k & ambang unknown dihitung sekaligus untuk seluruh batch.
+        probs, positions, errors = classifier.predict_batch([f.stream for f in files])
+        for i, message in errors.items():
+            results[i]["error"] = message
+        for i, formatted in zip(positions, classifier.format_batch(probs, **prediction_options(request.values))):
+            results[i].update(formatted)
 
-        if "error" not in pred:
-            results.append(pred)
+        return jsonify({
+            "status": "success",
+            # data: hanya bahan yang dikenali (dipakai App.vue), urutan = urutan upload
+            "data": [r for r in results if "error" not in r and not r["unknown"]],
+            "results": results,
+            "errors": sum("error" in r for r in results),
+            "unknown": sum(r.get("unknown", False) for r in results),
+        })
 
-    return jsonify({
-        "status": "success",
-        "data": results
-    })
+    return app
 
 
 if __name__ == "__main__":
+    timeline = StartupTimeline("vision", started=STARTED)
+    timeline.record("import", time.perf_counter() - STARTED)
+    app = create_app(timeline)
+
+    def start():
+        # Server vision selalu memuat model sebelum listen
+        with timeline.phase("model_load"):
+            get_classifier()
+        # Listen dulu, /ready 503 sampai warmup selesai
+        timeline.run_warmup(warmup)
+
     print("🚀 Flask image server running on port 5000...")
-    app.run(port=5001)
+    if WORKERS > 1:
+        from inference.prefork import serve
+
+        # Runtime Keras/TFLite tidak aman di-fork setelah jalan, jadi model
+        # dimuat di tiap worker. Hanya tflite tanpa XNNPACK yang berbagi
+        # bobot (file .tflite di-mmap, satu salinan di page cache); keras
+        # dan XNNPACK menyalin bobot ke memori privat setiap worker.
+        if ENGINE == "keras" or TFLITE_XNNPACK:
+            print(f"⚠️ {WORKERS} worker dengan engine {ENGINE}"
+                  f"{' + XNNPACK' if TFLITE_XNNPACK and ENGINE != 'keras' else ''}: "
+                  "setiap worker memuat salinan bobot sendiri")
+        serve(app, "127.0.0.1", 5001, WORKERS, post_fork=start, name="vision")
+    else:
+        start()
+        app.run(port=5001)
@@ -1,8 +1,13 @@
-import tensorflow as tf
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
-from tensorflow.keras.models import load_model
 import numpy as np
 import os
+import sys
+
+# Paket inference/ ada di root repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inference import IngredientClassifier
+from inference.image_preprocessing import decode_image
+from dataset_shards import find_split, list_images
 
 from sklearn.metrics import (
     classification_report,
@@ -13,84 +18,113 @@ from sklearn.metrics import (
     f1_score
 )
 
-import seaborn as sns
-import matplotlib.pyplot as plt
 
 # =========================
 # PATH
 # =========================
-MODEL_PATH = "model/efficientnetb0_final.keras"
+MODEL_DIR = "model"
 TEST_DIR = "dataset/dataset_jadi/test"
 
-# =========================
-# LOAD MODEL
-# =========================
-print(f"📦 Memuat model dari: {MODEL_PATH}")
-model = load_model(MODEL_PATH)
 
-# =========================
-# DATA TEST
-# =========================
-test_datagen = ImageDataGenerator(rescale=1./255)
-
-test_data = test_datagen.flow_from_directory(
-    TEST_DIR,
-    target_size=(224, 224),
-    batch_size=32,
-    class_mode='categorical',
-    shuffle=False  # WAJIB untuk evaluasi
-)
-
-# =========================
-# EVALUASI DASAR
-# =========================
-loss, acc = model.evaluate(test_data)
-
-print("\n📊 HASIL EVALUASI TEST SET")
-print(f"   • Akurasi Test : {acc * 100:.2f}%")
-print(f"   • Loss Test    : {loss:.4f}")
-
-# =========================
-# PREDIKSI
-# =========================
-pred = model.predict(test_data)
-pred_labels = np.argmax(pred, axis=1)
-true_labels = test_data.classes
-
-class_names = list(test_data.class_indices.keys())
-
-# =========================
-# METRIK LENGKAP
-# =========================
-accuracy = accuracy_score(true_labels, pred_labels)
-precision = precision_score(true_labels, pred_labels, average='weighted')
-recall = recall_score(true_labels, pred_labels, average='weighted')
-f1 = f1_score(true_labels, pred_labels, average='weighted')
-
-print("\n📊 METRIK EVALUASI MODEL")
-print(f"   • Akurasi  : {accuracy * 100:.2f}%")
-print(f"   • Precision: {precision * 100:.2f}%")
-print(f"   • Recall   : {recall * 100:.2f}%")
-print(f"   • F1-Score : {f1 * 100:.2f}%")
-
-# =========================
-# CLASSIFICATION REPORT
-# =========================
-print("\n📋 Laporan Klasifikasi:")
-print(classification_report(true_labels, pred_labels, target_names=class_names))
-
-# =========================
-# CONFUSION MATRIX
-# =========================
-cm = confusion_matrix(true_labels, pred_labels)
-
-plt.figure(figsize=(12, 10))
-sns.heatmap(cm, annot=False, cmap='Blues',
-            xticklabels=class_names,
-            yticklabels=class_names)
-
-plt.title("Confusion Matrix (Test Set)")
-plt.xlabel("Predicted Label")
-plt.ylabel("True Label")
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+def test_batches(batch_size=32):
+    """
+    (iterator (x float32 0..1, y indeks kelas), class_names) untuk TEST_DIR.
+    Shard hasil pack_dataset.py kalau ada (tanpa decode ulang), selain itu
+    file gambar. Keduanya memakai decode_pixels (draft + bilinear) seperti
+    server, tanpa TensorFlow, jadi engine TFLite bisa dievaluasi tanpa
+    memuat runtime TF.
+    """
+    test_shards = find_split(TEST_DIR)
+    if test_shards is not None:
+        print(f"📦 Test set dari shard: {len(test_shards)} gambar (decoder: {test_shards.decoder})")
+        return test_shards.batches(batch_size=batch_size), test_shards.class_names
+
+    # Urutan sama dengan flow_from_directory(shuffle=False)
+    paths, labels, class_names = list_images(TEST_DIR)
+    print(f"🖼️ Test set dari file: {len(paths)} gambar (decoder: decode_pixels)")
+    batches = (
+        (np.stack([decode_image(p) for p in paths[i:i + batch_size]]), np.asarray(labels[i:i + batch_size]))
+        for i in range(0, len(paths), batch_size)
+    )
+    return batches, class_names
+
+
+def hitung_metrik(true_labels, pred_labels):
+    # Dipakai juga oleh benchmark_tflite.py supaya angka antar varian sebanding
+    return {
+        "accuracy": accuracy_score(true_labels, pred_labels),
+        "precision": precision_score(true_labels, pred_labels, average='weighted'),
+        "recall": recall_score(true_labels, pred_labels, average='weighted'),
+        "f1": f1_score(true_labels, pred_labels, average='weighted'),
+    }
+
+
+if __name__ == "__main__":
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    # =========================
+    # LOAD MODEL
+    # =========================
+    print(f"📦 Memuat model dari: {MODEL_DIR}")
+    classifier = IngredientClassifier.load(MODEL_DIR, "keras")
+
+    # =========================
+    # DATA TEST
+    # =========================
+    batches, class_names = test_batches()
+
+    # =========================
+    # PREDIKSI
+    # =========================
+    preds, labels = [], []
+    for x, y in batches:
+        preds.append(classifier.predict_arrays(x))
+        labels.append(y)
+    pred = np.concatenate(preds)
+    pred_labels = np.argmax(pred, axis=1)
+    true_labels = np.concatenate(labels)
+
+    # =========================
+    # EVALUASI DASAR
+    # =========================
+    # Dihitung dari prediksi di atas (sama dengan model.evaluate, tanpa forward pass kedua)
+    loss = float(-np.mean(np.log(np.clip(pred[np.arange(len(pred)), true_labels], 1e-7, 1.0))))
+    acc = float(np.mean(pred_labels == true_labels))
+
+    print("\n📊 HASIL EVALUASI TEST SET")
+    print(f"   • Akurasi Test : {acc * 100:.2f}%")
+    print(f"   • Loss Test    : {loss:.4f}")
+
+    # =========================
+    # METRIK LENGKAP
+    # =========================
+    metrik = hitung_metrik(true_labels, pred_labels)
+
+    print("\n📊 METRIK EVALUASI MODEL")
+    print(f"   • Akurasi  : {metrik['accuracy'] * 100:.2f}%")
+    print(f"   • Precision: {metrik['precision'] * 100:.2f}%")
+    print(f"   • Recall   : {metrik['recall'] * 100:.2f}%")
+    print(f"   • F1-Score : {metrik['f1'] * 100:.2f}%")
+
+    # =========================
+    # CLASSIFICATION REPORT
+    # =========================
+    print("\n📋 Laporan Klasifikasi:")
+    print(classification_report(true_labels, pred_labels, target_names=class_names))
+
+    # =========================
+    # CONFUSION MATRIX
+    # =========================
+    cm = confusion_matrix(true_labels, pred_labels)
+
+    plt.figure(figsize=(12, 10))
+    sns.heatmap(cm, annot=False, cmap='Blues',
+                xticklabels=class_names,
+                yticklabels=class_names)
+
+    plt.title("Confusion Matrix (Test Set)")
+    plt.xlabel("Predicted Label")
+    plt.ylabel("True Label")
+    plt.tight_layout()
+    plt.show()
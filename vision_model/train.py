@@ -1,5 +1,4 @@
 import tensorflow as tf
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
 from tensorflow.keras.models import Model, load_model
 from tensorflow.keras.layers import Dense, Dropout, GlobalAveragePooling2D, BatchNormalization
 from tensorflow.keras.applications import EfficientNetB0
@@ -7,6 +6,9 @@ from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, ReduceLRO
 from tensorflow.keras.optimizers import Adam
 import os
 
+from dataset_pipeline import augmentation, eval_dataset, train_dataset
+from feature_cache import fit_head_on_features
+
 # === Konfigurasi dasar ===
 IMG_SIZE = (224, 224)
 BATCH_SIZE = 32
@@ -14,6 +16,10 @@ EPOCHS_STAGE1 = 20
 EPOCHS_STAGE2 = 20
 LR_STAGE1 = 1e-4
 LR_STAGE2 = 1e-5
+# full = tahap 1 lewat backbone tiap epoch; features = head dilatih di atas
+# fitur backbone yang di-cache (feature_cache.py), jauh lebih cepat di CPU
+STAGE1_MODE = os.environ.get("VISION_STAGE1", "full").lower()
+AUGMENT = {"rotation": 20, "zoom": 0.2, "shift": 0.1}
 
 # === Path dataset ===
 train_dir = "dataset/dataset_jadi/train_augmented"
@@ -22,32 +28,19 @@ valid_dir = "dataset/dataset_jadi/valid"
 # Pastikan folder model ada
 os.makedirs("model", exist_ok=True)
 
-# === Data Generator ===
-train_datagen = ImageDataGenerator(
-    rescale=1./255,
-    rotation_range=20,
-    zoom_range=0.2,
-    width_shift_range=0.1,
-    height_shift_range=0.1,
-    horizontal_flip=True
-)
-
-valid_datagen = ImageDataGenerator(rescale=1./255)
-
-train_data = train_datagen.flow_from_directory(
+# === Data (tf.data: decode paralel, augmentasi per batch, valid di-cache) ===
+train_data, class_names = train_dataset(
     train_dir,
-    target_size=IMG_SIZE,
     batch_size=BATCH_SIZE,
-    class_mode='categorical',
-    shuffle=True
+    img_size=IMG_SIZE,
+    augment=augmentation(**AUGMENT)
 )
 
-valid_data = valid_datagen.flow_from_directory(
+valid_data, _ = eval_dataset(
     valid_dir,
-    target_size=IMG_SIZE,
     batch_size=BATCH_SIZE,
-    class_mode='categorical',
-    shuffle=False
+    img_size=IMG_SIZE,
+    class_names=class_names
 )
 
 # === Model Base EfficientNetB0 ===
@@ -59,30 +52,26 @@ base_model = EfficientNetB0(
 base_model.trainable = False  # Tahap 1: hanya head layer yang dilatih
 
 # === Head Layer ===
+# Disimpan sebagai list supaya VISION_STAGE1=features bisa melatih layer
+# yang sama di atas fitur pooled; di model penuh tetap datar (struktur
+# file .keras sama dengan sebelumnya)
+head_layers = [
+    BatchNormalization(),
+    Dense(512, activation='relu'),
+    Dropout(0.4),
+    Dense(len(class_names), activation='softmax')
+]
+
 x = base_model.output
 x = GlobalAveragePooling2D()(x)
-x = BatchNormalization()(x)
-x = Dense(512, activation='relu')(x)
-x = Dropout(0.4)(x)
-output = Dense(train_data.num_classes, activation='softmax')(x)
+for layer in head_layers:
+    x = layer(x)
+output = x
 
 model = Model(inputs=base_model.input, outputs=output)
 
-# === Compile Model (Stage 1) ===
-model.compile(
-    optimizer=Adam(learning_rate=LR_STAGE1),
-    loss='categorical_crossentropy',
-    metrics=['accuracy']
-)
-
 # === Callback ===
 callbacks_stage1 = [
-    ModelCheckpoint(
-        "model/best_effnetb0_stage1.keras",
-        monitor='val_accuracy',
-        save_best_only=True,
-        verbose=1
-    ),
     EarlyStopping(
         monitor='val_loss',
         patience=6,
@@ -99,13 +88,38 @@ callbacks_stage1 = [
 ]
 
 # === TRAINING STAGE 1 ===
-print("\n🚀 Training Tahap 1 (Feature Extraction) Dimulai...\n")
-history1 = model.fit(
-    train_data,
-    epochs=EPOCHS_STAGE1,
-    validation_data=valid_data,
-    callbacks=callbacks_stage1
-)
+print(f"\n🚀 Training Tahap 1 (Feature Extraction, mode: {STAGE1_MODE}) Dimulai...\n")
+if STAGE1_MODE == "features":
+    # EarlyStopping mengembalikan bobot head terbaik; model penuh ikut karena layer head dipakai bersama
+    history1 = fit_head_on_features(
+        base_model, head_layers, train_dir, valid_dir, class_names,
+        epochs=EPOCHS_STAGE1,
+        optimizer=Adam(learning_rate=LR_STAGE1),
+        callbacks=callbacks_stage1,
+        augment_config=AUGMENT,
+        batch_size=BATCH_SIZE,
+        img_size=IMG_SIZE
+    )
+    model.save("model/best_effnetb0_stage1.keras")
+else:
+    model.compile(
+        optimizer=Adam(learning_rate=LR_STAGE1),
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    history1 = model.fit(
+        train_data,
+        epochs=EPOCHS_STAGE1,
+        validation_data=valid_data,
+        callbacks=callbacks_stage1 + [
+            ModelCheckpoint(
+                "model/best_effnetb0_stage1.keras",
+                monitor='val_accuracy',
+                save_best_only=True,
+                verbose=1
+            )
+        ]
+    )
 
 # Simpan hasil stage 1
 model.save("model/efficientnetb0_stage1.keras")
@@ -1,5 +1,4 @@
 import tensorflow as tf
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Dense, Dropout, GlobalAveragePooling2D, BatchNormalization, Input
 from tensorflow.keras.optimizers import AdamW
@@ -12,62 +11,43 @@ import os
 import matplotlib.pyplot as plt
 import random
 
+from dataset_pipeline import augmentation, eval_dataset, list_images, train_dataset
+from feature_cache import fit_head_on_features
+
 # === SEED UNTUK REPRODUCIBILITY ===
 SEED = 42
 tf.random.set_seed(SEED)
 np.random.seed(SEED)
 random.seed(SEED)
 
+# full = tahap 1 lewat backbone tiap epoch; features = head dilatih di atas
+# fitur backbone yang di-cache (feature_cache.py), jauh lebih cepat di CPU
+STAGE1_MODE = os.environ.get("VISION_STAGE1", "full").lower()
+AUGMENT = {"rotation": 15, "zoom": 0.15, "shift": 0.1}
+
 # === PATH DATASET ===
 base_dir = os.path.join(os.getcwd(), 'dataset')
 train_dir = os.path.join(base_dir, 'train_augmented')
 valid_dir = os.path.join(base_dir, 'valid')
 test_dir = os.path.join(base_dir, 'test')
 
-# === DATA GENERATOR ===
-train_datagen = ImageDataGenerator(
-    rescale=1./255,
-    rotation_range=15,
-    zoom_range=0.15,
-    horizontal_flip=True,
-    width_shift_range=0.1,
-    height_shift_range=0.1,
-    fill_mode='nearest'
-)
-
-valid_datagen = ImageDataGenerator(rescale=1./255)
-test_datagen = ImageDataGenerator(rescale=1./255)
-
-train_data = train_datagen.flow_from_directory(
+# === DATA (tf.data: decode paralel, augmentasi per batch, valid/test di-cache) ===
+train_data, class_names = train_dataset(
     train_dir,
-    target_size=(224, 224),
     batch_size=32,
-    class_mode='categorical',
-    shuffle=True,
+    augment=augmentation(**AUGMENT, seed=SEED),
     seed=SEED
 )
 
-valid_data = valid_datagen.flow_from_directory(
-    valid_dir,
-    target_size=(224, 224),
-    batch_size=32,
-    class_mode='categorical',
-    shuffle=False
-)
-
-test_data = test_datagen.flow_from_directory(
-    test_dir,
-    target_size=(224, 224),
-    batch_size=32,
-    class_mode='categorical',
-    shuffle=False
-)
+valid_data, _ = eval_dataset(valid_dir, batch_size=32, class_names=class_names)
+test_data, _ = eval_dataset(test_dir, batch_size=32, class_names=class_names)
 
 # === CLASS WEIGHTS (imbalance handling) ===
+_, train_labels, _ = list_images(train_dir, class_names)
 class_weights = compute_class_weight(
     class_weight='balanced',
-    classes=np.unique(train_data.classes),
-    y=train_data.classes
+    classes=np.unique(train_labels),
+    y=train_labels
 )
 class_weights = dict(enumerate(class_weights))
 print("\n📊 Class Weights:", class_weights)
@@ -81,40 +61,60 @@ for layer in base_model.layers:
     layer.trainable = False
 
 # === MODEL HEAD ===
+# List layer: VISION_STAGE1=features melatih layer yang sama di atas fitur
+# pooled, model penuh tetap menyusunnya datar (struktur .keras tidak berubah)
+head_layers = [
+    BatchNormalization(),
+    Dense(512, activation='relu'),
+    Dropout(0.4),
+    Dense(256, activation='relu'),
+    Dropout(0.3),
+    Dense(len(class_names), activation='softmax')
+]
+
 x = base_model.output
 x = GlobalAveragePooling2D()(x)
-x = BatchNormalization()(x)
-x = Dense(512, activation='relu')(x)
-x = Dropout(0.4)(x)
-x = Dense(256, activation='relu')(x)
-x = Dropout(0.3)(x)
-output = Dense(train_data.num_classes, activation='softmax')(x)
+for layer in head_layers:
+    x = layer(x)
+output = x
 
 model = Model(inputs=base_model.input, outputs=output)
 
 # === TRAINING SETUP (Tahap 1) ===
 optimizer = AdamW(learning_rate=3e-4, weight_decay=1e-5)
-model.compile(
-    optimizer=optimizer,
-    loss='categorical_crossentropy',
-    metrics=['accuracy']
-)
 
 os.makedirs("model", exist_ok=True)
 callbacks = [
     EarlyStopping(monitor='val_loss', patience=8, restore_best_weights=True, verbose=1),
-    ModelCheckpoint("model/best_effnet_stage1.keras", monitor="val_accuracy", save_best_only=True, verbose=1),
     ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3, min_lr=1e-6, verbose=1)
 ]
 
-print("\n🚀 Mulai Training Tahap 1 (Feature Extraction)...\n")
-history1 = model.fit(
-    train_data,
-    validation_data=valid_data,
-    epochs=30,
-    callbacks=callbacks,
-    class_weight=class_weights
-)
+print(f"\n🚀 Mulai Training Tahap 1 (Feature Extraction, mode: {STAGE1_MODE})...\n")
+if STAGE1_MODE == "features":
+    history1 = fit_head_on_features(
+        base_model, head_layers, train_dir, valid_dir, class_names,
+        epochs=30,
+        optimizer=optimizer,
+        callbacks=callbacks,
+        class_weight=class_weights,
+        augment_config=AUGMENT
+    )
+    model.save("model/best_effnet_stage1.keras")
+else:
+    model.compile(
+        optimizer=optimizer,
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    history1 = model.fit(
+        train_data,
+        validation_data=valid_data,
+        epochs=30,
+        callbacks=callbacks + [
+            ModelCheckpoint("model/best_effnet_stage1.keras", monitor="val_accuracy", save_best_only=True, verbose=1)
+        ],
+        class_weight=class_weights
+    )
 
 # === FINE-TUNING (Tahap 2) ===
 for layer in base_model.layers[-100:]:
@@ -180,7 +180,7 @@ def predict_image(img_path):
 
     pred = model.predict(img_array)
     class_idx = np.argmax(pred[0])
-    label = list(train_data.class_indices.keys())[class_idx]
+    label = class_names[class_idx]
     conf = np.max(pred[0])
 
     print(f"\n🖼️ {os.path.basename(img_path)} → {label} ({conf:.2f})")